@@ -29,6 +29,7 @@ from . import acl
 from . import amazon
 from . import amqp
 from . import base
+from . import cache
 from . import config
 from . import crypt
 from . import daemon
@@ -50,6 +51,7 @@ from . import meta
 from . import model
 from . import mongodb
 from . import observer
+from . import profiler
 from . import pusherc
 from . import redisdb
 from . import request
@@ -102,6 +104,9 @@ from .base import (
     extra_logging,
     get_app,
     get_adapter,
+    get_query_cache,
+    get_entity_cache,
+    get_profiler,
     get_log,
     get_level,
     get_handlers,
@@ -116,6 +121,7 @@ from .base import (
     start_execution,
     stop_execution,
     setup_models,
+    build_indexes,
     models_c,
     resolve,
     templates_path,
@@ -126,6 +132,14 @@ from .base import (
     onrun,
     _level,
 )
+from .cache import (
+    QueryCache,
+    MemoryCache,
+    RedisCache,
+    EntityCache,
+    MemoryEntityCache,
+    RedisEntityCache,
+)
 from .config import (
     conf,
     conf_prefix,
@@ -165,6 +179,7 @@ from .exceptions import (
     AssertionError,
     NotFoundError,
     ValidationError,
+    BulkError,
     NotImplementedError,
     BaseInternalError,
     ValidationInternalError,
@@ -240,21 +255,28 @@ from .model import (
     Model,
     LocalModel,
     Field,
+    IdentityMap,
     link,
     operation,
     view,
+    index,
     field,
+    identity_map,
+    get_identity,
+    reset_blocks,
     type_d,
     is_unset,
 )
 from .mongodb import MongoMap, MongoEncoder
 from .observer import Observable
+from .profiler import Profiler, profiled
 from .structures import (
     OrderedDict,
     LazyDict,
     LazyValue,
     GeneratorFile,
     LimitedSizeDict,
+    LRUDict,
     lazy_dict,
     lazy,
 )
@@ -37,8 +37,10 @@ import atexit
 import jinja2
 import socket
 import logging
+import hashlib
 import inspect
 import datetime
+import threading
 import functools
 
 import werkzeug.debug
@@ -48,6 +50,7 @@ from . import log
 from . import amqp
 from . import util
 from . import data
+from . import cache
 from . import mail
 from . import info
 from . import route
@@ -60,6 +63,7 @@ from . import session
 from . import redisdb
 from . import mongodb
 from . import pusherc
+from . import profiler
 from . import request
 from . import template
 from . import execution
@@ -113,6 +117,11 @@ ESCAPE_EXTENSIONS = (".xml", ".html", ".xhtml", ".xml.tpl", ".html.tpl", ".xhtml
 for which the autoescape mode will be enabled  by
 default as expected by the end developer """
 
+INDEX_COLLECTION = "_indexes"
+""" The name of the collection where the fingerprints of the
+index specifications of the (already built) collections are
+stored, so that unchanged index sets are not rebuilt """
+
 PLATFORM = "%s %d.%d.%d.%s %s" % (
     sys.subversion[0] if hasattr(sys, "subversion") else "CPython",
     sys.version_info[0],
@@ -356,6 +365,22 @@ def load(
     name = config.conf("NAME", name)
     instance = config.conf("INSTANCE", None)
     force_ssl = config.conf("FORCE_SSL", False, cast=bool)
+    identity_map = config.conf("IDENTITY_MAP", False, cast=bool)
+    increment_block = config.conf("INCREMENT_BLOCK", 0, cast=int)
+    query_cache_s = config.conf("QUERY_CACHE", "memory")
+    query_cache_ttl = config.conf("QUERY_CACHE_TTL", 60, cast=int)
+    query_cache_size = config.conf("QUERY_CACHE_SIZE", 1024, cast=int)
+    entity_cache_s = config.conf("ENTITY_CACHE", None)
+    entity_cache_ttl = config.conf("ENTITY_CACHE_TTL", 300, cast=int)
+    entity_cache_size = config.conf("ENTITY_CACHE_SIZE", 4096, cast=int)
+    entity_cache_pickle = config.conf("ENTITY_CACHE_PICKLE", False, cast=bool)
+    index_mode = config.conf("INDEX_MODE", "sync")
+    index_fingerprint = config.conf("INDEX_FINGERPRINT", True, cast=bool)
+    index_workers = config.conf("INDEX_WORKERS", 4, cast=int)
+    index_drop = config.conf("INDEX_DROP", False, cast=bool)
+    profile = config.conf("PROFILE", False, cast=bool)
+    profile_slow = config.conf("PROFILE_SLOW", 100, cast=float)
+    profile_sample = config.conf("PROFILE_SAMPLE", 0.0, cast=float)
     redis_url = config.conf("REDISTOGO_URL", None)
     mongo_url = config.conf("MONGOHQ_URL", None)
     amqp_url = config.conf("AMQP_URL", None)
@@ -375,6 +400,11 @@ def load(
     amqp_url = config.conf("CLOUDAMQP_URL", amqp_url)
     amqp_url = config.conf("RABBITMQ_URL", amqp_url)
 
+    # defaults the entity cache to the in memory one in case there's no
+    # Redis server configured, as the local (fallback) connection of the
+    # Redis infra-structure is not shared among the processes anyway
+    entity_cache_s = entity_cache_s or ("redis" if redis_url else "memory")
+
     # retrieves the possible base URL configuration value and uses it
     # as the basis for the creation of the static URL values to be used
     # by the Flask infra-structure when using _external parameter
@@ -501,6 +531,25 @@ def load(
     app.request_class = request.Request
     app.locales = locales
     app.safe = safe
+    app.identity_map = identity_map
+    app.increment_block = increment_block
+    app.query_cache = _cache(
+        query_cache_s,
+        "Cache",
+        cache.QueryCache,
+        ttl=query_cache_ttl,
+        size=query_cache_size,
+    )
+    app.entity_cache = _cache(
+        entity_cache_s,
+        "EntityCache",
+        cache.EntityCache,
+        ttl=entity_cache_ttl,
+        size=entity_cache_size,
+        pickled=entity_cache_pickle,
+    )
+    app.profiler = profiler.PROFILER
+    app.profiler.configure(enabled=profile, slow=profile_slow, sample=profile_sample)
     app.debug = debug
     app.use_debugger = debug
     app.use_reloader = reloader
@@ -565,7 +614,13 @@ def load(
     if mongo_database:
         mongodb.database = mongo_database + suffix
     if models:
-        setup_models(models)
+        setup_models(
+            models,
+            index_mode=index_mode,
+            fingerprint=index_fingerprint,
+            workers=index_workers,
+            drop=index_drop,
+        )
     if force_ssl:
         extras.SSLify(app)
 
@@ -604,6 +659,12 @@ def unload():
     if APP.models:
         teardown_models(APP.models)
 
+    profile_path = config.conf("PROFILE_PATH", None)
+    if profile_path and APP.profiler.enabled:
+        APP.profiler.dump(profile_path)
+
+    model.reset_blocks()
+
     APP = None
 
 
@@ -883,6 +944,21 @@ def get_adapter(app=None):
     return APP and APP.adapter
 
 
+def get_query_cache(app=None):
+    app = app or APP
+    return getattr(app, "query_cache", None) if app else None
+
+
+def get_entity_cache(app=None):
+    app = app or APP
+    return getattr(app, "entity_cache", None) if app else None
+
+
+def get_profiler(app=None):
+    app = app or APP
+    return getattr(app, "profiler", None) if app else None
+
+
 def get_log(app=None):
     app = app or APP
     if not app:
@@ -956,6 +1032,8 @@ def before_request():
     flask.request.form_s = util.load_form(flask.request.form)
     flask.request.locale = util.load_locale(APP.locales)
     util.set_locale()
+    if APP.identity_map:
+        flask.g.identity_map = model.IdentityMap()
 
 
 def after_request(response):
@@ -997,10 +1075,177 @@ def stop_execution():
     background_t and background_t.stop()
 
 
-def setup_models(models):
+def setup_models(models, index_mode="sync", fingerprint=True, workers=4, drop=False):
+    # runs the setup of the complete set of models deferring the
+    # building of their indexes, that is then done in batch
     _models_c = models_c(models=models)
-    for model_c in _models_c:
-        model_c.setup()
+    with model.deferred_indexes() as pending:
+        for model_c in _models_c:
+            model_c.setup()
+    build_indexes(
+        pending, mode=index_mode, fingerprint=fingerprint, workers=workers, drop=drop
+    )
+
+
+def build_indexes(models_c, mode="sync", fingerprint=True, workers=4, drop=False):
+    """
+    Builds (syncs) the indexes of the provided model classes, running
+    the index commands of the various collections concurrently.
+
+    In case the fingerprint is enabled the collections whose index
+    specifications have not changed since the last build (for the data
+    source) and whose indexes are all present (eg: not manually dropped)
+    are skipped, not issuing any create or drop index command.
+
+    The index specifications of the models are always declared to the
+    profiler (index advisor), whatever the mode and the fingerprints.
+
+    :type models_c: List
+    :param models_c: The sequence of model classes to build the indexes.
+    :type mode: String
+    :param mode: The index building mode, either `sync` (blocking),
+    `background` (in the execution thread) or `skip` (no building).
+    :type fingerprint: bool
+    :param fingerprint: If the fingerprints of the index specifications
+    should be used to skip the collections that have not changed.
+    :type workers: int
+    :param workers: The maximum number of threads that are going to be
+    used to build the indexes of the collections concurrently.
+    :type drop: bool
+    :param drop: If the indexes present in the data source that are not
+    declared by the models (stale) should be dropped, otherwise they're
+    only reported (logged), never dropped for shared collections.
+    :rtype: List
+    :return: The names of the collections whose indexes were built.
+    """
+
+    # declares the indexes of every model to the profiler so that the
+    # index advisor has them even if their building is skipped
+    for model_c in models_c:
+        model_c.declare_indexes()
+
+    if mode == "skip" or not models_c:
+        return []
+
+    # in case the background mode is requested and the execution thread
+    # is available the building is scheduled there (non blocking)
+    if mode == "background" and execution.background_t:
+        execution.insert_work(
+            build_indexes,
+            args=[models_c],
+            kwargs=dict(fingerprint=fingerprint, workers=workers, drop=drop),
+            description="build_indexes",
+        )
+        return []
+
+    # groups the models by the name of their collection, so that models
+    # that share a collection are built together (and never drop the
+    # indexes of each other)
+    groups = dict()
+    names = []
+    for model_c in models_c:
+        name = model_c._name()
+        if not name in groups:
+            names.append(name)
+        groups.setdefault(name, []).append(model_c)
+
+    # determines the collections whose index specifications have changed
+    # since the last build, the unchanged ones are only checked for the
+    # presence of their indexes (cheap) and skipped if all are present
+    adapter = models_c[0]._adapter()
+    fingerprints = _index_fingerprints(adapter) if fingerprint else dict()
+    pending = []
+    for name in names:
+        digest = _index_digest(groups[name])
+        unchanged = fingerprints.get(name, None) == digest
+        pending.append((name, digest, unchanged))
+
+    built = []
+    errors = []
+    lock = threading.Lock()
+    queue = list(pending)
+
+    def worker():
+        while True:
+            with lock:
+                if not queue:
+                    return
+                name, _digest, unchanged = queue.pop(0)
+            _models_c = groups[name]
+            try:
+                if unchanged and _index_present(_models_c):
+                    continue
+                for model_c in _models_c:
+                    result = model_c.sync_indexes(drop=drop and len(_models_c) == 1)
+                    if result["stale"] and len(_models_c) == 1:
+                        log.warning(
+                            "Stale indexes in '%s': %s"
+                            % (name, ", ".join(result["stale"]))
+                        )
+            except Exception as exception:
+                errors.append(exception)
+            else:
+                built.append(name)
+
+    # builds the indexes of the collections using a set of worker threads
+    # (if supported by the adapter) that consume the pending collections
+    workers = max(min(workers, len(pending)), 1) if adapter.concurrent else 1
+    threads = [threading.Thread(target=worker) for _index in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if fingerprint:
+        _index_fingerprints_s(
+            adapter,
+            [(name, digest) for name, digest, _unchanged in pending if name in built],
+        )
+    if errors:
+        raise errors[0]
+
+    return [name for name, _digest, _unchanged in pending if name in built]
+
+
+def _index_present(models_c):
+    # verifies that every index specified by the provided models (that
+    # share the same collection) is present in the data source, either
+    # by name or by an equivalent definition (eg: manually dropped)
+    information = models_c[0]._collection().index_information()
+    for model_c in models_c:
+        for spec in model_c.index_specs():
+            current = information.get(spec["options"]["name"], None)
+            if current and model_c._index_equal(spec, current):
+                continue
+            if any(
+                model_c._index_equal(spec, _current)
+                for _current in legacy.values(information)
+            ):
+                continue
+            return False
+    return True
+
+
+def _index_fingerprints(adapter):
+    collection = adapter.collection(INDEX_COLLECTION)
+    items = collection.find({})
+    return dict((item["_id"], item.get("fingerprint", None)) for item in items)
+
+
+def _index_fingerprints_s(adapter, fingerprints):
+    collection = adapter.collection(INDEX_COLLECTION)
+    for name, digest in fingerprints:
+        exists = collection.find_one({"_id": name})
+        if exists:
+            collection.update({"_id": name}, {"$set": dict(fingerprint=digest)})
+        else:
+            collection.insert(dict(_id=name, fingerprint=digest))
+
+
+def _index_digest(models_c):
+    fingerprints = sorted(model_c.index_fingerprint() for model_c in models_c)
+    fingerprints_s = legacy.bytes("".join(fingerprints), encoding="utf-8", force=True)
+    return hashlib.sha1(fingerprints_s).hexdigest()
 
 
 def teardown_models(models):
@@ -1126,6 +1371,36 @@ def onrun(function):
     return function
 
 
+def _cache(name, suffix, base_c, *args, **kwargs):
+    """
+    Builds the cache (backend) instance for the provided configured
+    name, (eg: memory, redis) using the provided class name suffix.
+
+    The "none" value (or an empty one) disables the cache, any
+    other unknown value is considered to be a configuration error.
+
+    :type name: String
+    :param name: The name of the cache backend as configured.
+    :type suffix: String
+    :param suffix: The suffix of the name of the cache class for
+    the kind of cache to be built (eg: Cache, EntityCache).
+    :type base_c: Class
+    :param base_c: The (abstract) base class of the kind of cache
+    to be built, that the concrete cache class must extend.
+    :rtype: QueryCache
+    :return: The built cache instance or an invalid value in case
+    the cache is disabled.
+    """
+
+    if not name or name.lower() == "none":
+        return None
+    cache_c = getattr(cache, name.capitalize() + suffix, None)
+    is_valid = isinstance(cache_c, type) and issubclass(cache_c, base_c)
+    if not is_valid or cache_c == base_c:
+        raise exceptions.OperationalError("Invalid cache '%s'" % name)
+    return cache_c(*args, **kwargs)
+
+
 def _level(level):
     """
     Converts the provided logging level value into the best
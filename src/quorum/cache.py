@@ -0,0 +1,542 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Flask Quorum
+# Copyright (c) 2008-2025 Hive Solutions Lda.
+#
+# This file is part of Hive Flask Quorum.
+#
+# Hive Flask Quorum is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Flask Quorum is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Flask Quorum. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2025 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+import json
+import time
+import zlib
+import pickle
+import hashlib
+import threading
+import collections
+
+from . import legacy
+from . import redisdb
+from . import exceptions
+
+try:
+    import bson
+except ImportError:
+    bson = None
+
+
+class QueryCache(object):
+    """
+    The abstract query cache class, defining the interface to
+    be implemented by the concrete query cache backends.
+
+    Each collection has a version counter that is part of the
+    key of the cached entries, bumping the version (on write)
+    makes the previous entries unreachable (self invalidation).
+    """
+
+    ttl = 60
+    """ The default time to live (in seconds) of the entries
+    stored in the cache, when no specific one is provided """
+
+    def __init__(self, ttl=60, *args, **kwargs):
+        self.ttl = ttl
+
+    def get(self, key):
+        raise exceptions.NotImplementedError()
+
+    def set(self, key, value, ttl=None):
+        raise exceptions.NotImplementedError()
+
+    def version(self, name):
+        raise exceptions.NotImplementedError()
+
+    def bump(self, name):
+        raise exceptions.NotImplementedError()
+
+    def clear(self):
+        raise exceptions.NotImplementedError()
+
+    def key(self, name, operation, query):
+        """
+        Builds the key for the cache entry associated with the query
+        with the provided operation, for the collection with the
+        provided name (taking into account its current version).
+
+        :type name: String
+        :param name: The name of the collection for the query.
+        :type operation: String
+        :param operation: The name of the operation (eg: find, count).
+        :type query: Object
+        :param query: The query parameters, including the filter,
+        projection, sort, skip and limit, the non JSON values (eg:
+        object ids, dates) are encoded together with their type.
+        :rtype: String
+        :return: The key to be used for the cache entry.
+        """
+
+        version = self.version(name)
+        query_s = json.dumps(query, sort_keys=True, default=_typed)
+        query_s = legacy.bytes(query_s, encoding="utf-8", force=True)
+        digest = hashlib.sha1(query_s).hexdigest()
+        return "%s:%d:%s:%s" % (name, version, operation, digest)
+
+    def dumps(self, value):
+        return pickle.dumps(value, protocol=2)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+class MemoryCache(QueryCache):
+    """
+    In process (memory) query cache backend using a least
+    recently used (LRU) eviction policy for a fixed size.
+
+    The versions are local to the process meaning that writes
+    performed by other processes are only "seen" once the
+    entries expire (time to live).
+    """
+
+    def __init__(self, ttl=60, size=1024, *args, **kwargs):
+        QueryCache.__init__(self, ttl=ttl)
+        self.size = size
+        self.values = collections.OrderedDict()
+        self.versions = dict()
+        self.lock = threading.RLock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.values.get(key, None)
+            if item == None:
+                return None
+            data, expiration = item
+            if expiration < time.time():
+                del self.values[key]
+                return None
+            self.values.pop(key)
+            self.values[key] = item
+        return self.loads(data)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl == None else ttl
+        item = (self.dumps(value), time.time() + ttl)
+        with self.lock:
+            self.values.pop(key, None)
+            self.values[key] = item
+            while len(self.values) > self.size:
+                self.values.popitem(last=False)
+
+    def version(self, name):
+        return self.versions.get(name, 0)
+
+    def bump(self, name):
+        with self.lock:
+            self.versions[name] = self.versions.get(name, 0) + 1
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+            self.versions.clear()
+
+
+class RedisCache(QueryCache):
+    """
+    Redis based query cache backend, shared among the complete
+    set of processes (and hosts) using the same Redis server,
+    including the versions of the collections.
+
+    The expiration of the entries is delegated to Redis.
+    """
+
+    prefix = "quorum:query"
+    """ The prefix to be used in the complete set of keys
+    that are stored in Redis by the cache backend """
+
+    def get(self, key):
+        connection = redisdb.get_connection()
+        name = self.prefix + ":" + key
+        if isinstance(connection, redisdb.RedisMemory):
+            data = _get_m(connection, name)
+        else:
+            data = connection.get(name)
+        if data == None:
+            return None
+        return self.loads(data)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl == None else ttl
+        connection = redisdb.get_connection()
+        name = self.prefix + ":" + key
+        data = self.dumps(value)
+        if isinstance(connection, redisdb.RedisMemory):
+            connection.set(name, (data, time.time() + ttl))
+        else:
+            connection.set(name, data, ex=ttl)
+
+    def version(self, name):
+        connection = redisdb.get_connection()
+        version = connection.get(self.prefix + ":version:" + name)
+        return int(version) if version else 0
+
+    def bump(self, name):
+        connection = redisdb.get_connection()
+        name = self.prefix + ":version:" + name
+        if isinstance(connection, redisdb.RedisMemory):
+            version = connection.get(name)
+            connection.set(name, int(version) + 1 if version else 1)
+        else:
+            connection.incr(name)
+
+    def clear(self):
+        _clear(self.prefix)
+
+
+class EntityCache(object):
+    """
+    The abstract (second level) entity cache class, defining the
+    interface to be implemented by the concrete entity cache backends.
+
+    The raw documents of the entities are stored keyed by the model
+    and by one of their keys (`_id` or default field), the entries
+    are written through (or removed) on the save of the entities.
+
+    Each model has a version counter that is part of the keys of the
+    entries, bumping the version makes the entries of the model
+    unreachable (eg: for bulk writes with unknown entities).
+
+    The removal of an entry leaves a (short lived) tombstone in its
+    place, so that a concurrent read through of a document retrieved
+    before the write (stale) is not stored, as the read through only
+    stores the entries that are not present (not forced).
+    """
+
+    ttl = 300
+    """ The default time to live (in seconds) of the entries
+    stored in the cache, when no specific one is provided """
+
+    compress = 1024
+    """ The size (in bytes) of the serialized documents above
+    which they're compressed before being stored """
+
+    tombstone = 10
+    """ The time to live (in seconds) of the tombstones of the
+    removed entries, during which no read through is stored """
+
+    pickled = False
+    """ If the documents that are not BSON serializable may be
+    stored using pickle, as loading pickle data from a shared
+    backend is unsafe this is opt-in (not cached otherwise) """
+
+    def __init__(
+        self, ttl=300, compress=1024, tombstone=10, pickled=False, *args, **kwargs
+    ):
+        self.ttl = ttl
+        self.compress = compress
+        self.tombstone = tombstone
+        self.pickled = pickled
+
+    def get_many(self, keys):
+        raise exceptions.NotImplementedError()
+
+    def set_many(self, items, ttl=None, force=True):
+        raise exceptions.NotImplementedError()
+
+    def delete_many(self, keys):
+        raise exceptions.NotImplementedError()
+
+    def version(self, name):
+        raise exceptions.NotImplementedError()
+
+    def bump(self, name):
+        raise exceptions.NotImplementedError()
+
+    def clear(self):
+        raise exceptions.NotImplementedError()
+
+    def keys(self, name, field, values):
+        """
+        Builds the keys for the cache entries of the entities of the
+        model with the provided name identified by the provided values
+        of the key field (taking into account the model version).
+
+        :type name: String
+        :param name: The name of the model (collection) of the entities.
+        :type field: String
+        :param field: The name of the key field (eg: `_id`, `id`).
+        :type values: List
+        :param values: The sequence of values of the key field.
+        :rtype: List
+        :return: The keys to be used for the cache entries.
+        """
+
+        version = self.version(name)
+        return [
+            "%s:%d:%s:%s:%s" % (name, version, field, _kind(value), value)
+            for value in values
+        ]
+
+    def dumps(self, value):
+        # serializes the document using the (compact) BSON encoding
+        # when available, falling back to pickle for non BSON values
+        # (only if allowed, otherwise the document is not cached), the
+        # first byte of the data identifies the encoding used
+        data = None
+        if bson:
+            try:
+                data, marker = bson.encode(value), b"b"
+            except Exception:
+                data = None
+        if data == None and not self.pickled:
+            return None
+        if data == None:
+            data, marker = pickle.dumps(value, protocol=2), b"p"
+
+        # compresses the larger documents, marking the data with the
+        # upper case version of the marker of the encoding
+        if len(data) > self.compress:
+            data, marker = zlib.compress(data), marker.upper()
+        return marker + data
+
+    def loads(self, data):
+        marker, data = data[:1], data[1:]
+        if marker.isupper():
+            data, marker = zlib.decompress(data), marker.lower()
+        if marker == b"b":
+            return bson.decode(data)
+        if not self.pickled:
+            return None
+        return pickle.loads(data)
+
+
+class MemoryEntityCache(EntityCache):
+    """
+    In process (memory) entity cache backend using a least
+    recently used (LRU) eviction policy for a fixed size.
+
+    Only useful for single process deployments (and testing)
+    as the entries are not shared among the processes.
+    """
+
+    def __init__(self, ttl=300, compress=1024, size=4096, *args, **kwargs):
+        EntityCache.__init__(self, ttl=ttl, compress=compress, **kwargs)
+        self.size = size
+        self.values = collections.OrderedDict()
+        self.versions = dict()
+        self.lock = threading.RLock()
+
+    def get_many(self, keys):
+        return [self._get(key) for key in keys]
+
+    def set_many(self, items, ttl=None, force=True):
+        ttl = self.ttl if ttl == None else ttl
+        now = time.time()
+        with self.lock:
+            for key, value in items:
+                data = self.dumps(value)
+                if data == None:
+                    continue
+                item = self.values.get(key, None)
+                if not force and item and item[1] >= now:
+                    continue
+                self.values.pop(key, None)
+                self.values[key] = (data, now + ttl)
+            self._evict()
+
+    def delete_many(self, keys):
+        expiration = time.time() + self.tombstone
+        with self.lock:
+            for key in keys:
+                self.values.pop(key, None)
+                self.values[key] = (None, expiration)
+            self._evict()
+
+    def version(self, name):
+        return self.versions.get(name, 0)
+
+    def bump(self, name):
+        with self.lock:
+            self.versions[name] = self.versions.get(name, 0) + 1
+
+    def clear(self):
+        with self.lock:
+            self.values.clear()
+            self.versions.clear()
+
+    def _get(self, key):
+        with self.lock:
+            item = self.values.get(key, None)
+            if item == None:
+                return None
+            data, expiration = item
+            if expiration < time.time():
+                del self.values[key]
+                return None
+            if data == None:
+                return None
+            self.values.pop(key)
+            self.values[key] = item
+        return self.loads(data)
+
+    def _evict(self):
+        while len(self.values) > self.size:
+            self.values.popitem(last=False)
+
+
+class RedisEntityCache(EntityCache):
+    """
+    Redis based entity cache backend, shared among the complete
+    set of processes (and hosts) using the same Redis server,
+    including the versions of the models.
+
+    The multiple retrieval of entries uses a single `MGET`
+    command and the expiration is delegated to Redis.
+    """
+
+    prefix = "quorum:entity"
+    """ The prefix to be used in the complete set of keys
+    that are stored in Redis by the cache backend """
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        connection = redisdb.get_connection()
+        names = [self.prefix + ":" + key for key in keys]
+        if isinstance(connection, redisdb.RedisMemory):
+            values = [_get_m(connection, name) for name in names]
+        else:
+            values = connection.mget(names)
+        return [self.loads(data) if data else None for data in values]
+
+    def set_many(self, items, ttl=None, force=True):
+        if not items:
+            return
+        ttl = self.ttl if ttl == None else ttl
+        items = [(self.prefix + ":" + key, self.dumps(value)) for key, value in items]
+        items = [(name, data) for name, data in items if not data == None]
+        connection = redisdb.get_connection()
+        if isinstance(connection, redisdb.RedisMemory):
+            expiration = time.time() + ttl
+            for name, data in items:
+                if not force and not _get_m(connection, name) == None:
+                    continue
+                connection.set(name, (data, expiration))
+            return
+        pipeline = connection.pipeline(transaction=False)
+        for name, data in items:
+            pipeline.set(name, data, ex=ttl, nx=not force)
+        pipeline.execute()
+
+    def delete_many(self, keys):
+        # replaces the entries with (empty) tombstones instead of deleting
+        # them, so that no stale read through is stored in the meantime
+        if not keys:
+            return
+        connection = redisdb.get_connection()
+        names = [self.prefix + ":" + key for key in keys]
+        if isinstance(connection, redisdb.RedisMemory):
+            expiration = time.time() + self.tombstone
+            for name in names:
+                connection.set(name, (b"", expiration))
+            return
+        pipeline = connection.pipeline(transaction=False)
+        for name in names:
+            pipeline.set(name, b"", ex=self.tombstone)
+        pipeline.execute()
+
+    def version(self, name):
+        connection = redisdb.get_connection()
+        version = connection.get(self.prefix + ":version:" + name)
+        return int(version) if version else 0
+
+    def bump(self, name):
+        connection = redisdb.get_connection()
+        name = self.prefix + ":version:" + name
+        if isinstance(connection, redisdb.RedisMemory):
+            version = connection.get(name)
+            connection.set(name, int(version) + 1 if version else 1)
+        else:
+            connection.incr(name)
+
+    def clear(self):
+        _clear(self.prefix)
+
+
+def _get_m(connection, name):
+    # the entries of the local (fallback) connection are stored with
+    # their expiration timestamp as there's no native expiration in
+    # it, the expired entries are removed on access
+    item = connection.get(name)
+    if item == None:
+        return None
+    data, expiration = item
+    if expiration < time.time():
+        connection.delete(name)
+        return None
+    return data
+
+
+def _clear(prefix):
+    # removes the complete set of keys of a cache backend (entries and
+    # versions) with the provided prefix, iterating over them with the
+    # (non blocking) scan command and deleting them in batches
+    connection = redisdb.get_connection()
+    pattern = prefix + ":"
+    if isinstance(connection, redisdb.RedisMemory):
+        names = [name for name in connection.values if name.startswith(pattern)]
+        for name in names:
+            connection.delete(name)
+        return
+    names = []
+    for name in connection.scan_iter(match=pattern + "*", count=1000):
+        names.append(name)
+        if len(names) < 1000:
+            continue
+        connection.delete(*names)
+        names = []
+    if names:
+        connection.delete(*names)
+
+
+def _kind(value):
+    # retrieves the name of the kind (type) of the provided key value, so
+    # that values of different types with the same string representation
+    # (eg: integer and string, object id and its hex string) do not share
+    # the same entry, the string and integer types are normalized
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, legacy.STRINGS):
+        return "str"
+    if isinstance(value, legacy.INTEGERS):
+        return "int"
+    return value.__class__.__name__
+
+
+def _typed(value):
+    # encodes the provided (non JSON serializable) value together with
+    # the name of its type, so that values of different types with the
+    # same string representation (eg: object id and its hex string) do
+    # not collide in the resulting key
+    return {"$type": value.__class__.__name__, "$value": legacy.UNICODE(value)}
@@ -29,9 +29,11 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 import os
+import re
 import time
 import struct
 import socket
+import json
 import hashlib
 import binascii
 import threading
@@ -40,11 +42,16 @@ from . import log
 from . import legacy
 from . import config
 from . import mongodb
+from . import profiler
 from . import exceptions
 
 
 class DataAdapter(object):
 
+    concurrent = True
+    """ If the adapter supports concurrent operations from multiple
+    threads, allowing independent queries to run in parallel """
+
     def __init__(self, *args, **kwargs):
         self._inc = 0
         self._machine_bytes = self.__machine_bytes()
@@ -63,6 +70,9 @@ class DataAdapter(object):
     def collection_a(self, name, *args, **kwargs):
         raise exceptions.NotImplementedError()
 
+    def is_async(self):
+        return False
+
     def close(self):
         raise exceptions.NotImplementedError()
 
@@ -133,7 +143,10 @@ class MongoAdapter(DataAdapter):
     def collection_a(self, name, *args, **kwargs):
         db = self.get_db_a()
         collection = db[name]
-        return MongoCollection(self, name, collection)
+        return MongoCollection(self, name, collection, is_async=True)
+
+    def is_async(self):
+        return not mongodb.motor == None
 
     def reset(self):
         return mongodb.reset_connection()
@@ -164,11 +177,16 @@ class MongoAdapter(DataAdapter):
 
 class TinyAdapter(DataAdapter):
 
+    concurrent = False
+    """ The TinyDB storage shares a single file handle and so its
+    operations must not run concurrently from multiple threads """
+
     def __init__(self, *args, **kwargs):
         DataAdapter.__init__(self, *args, **kwargs)
         self.file_path = config.conf("TINY_PATH", "db.json")
         self.storage = config.conf("TINY_STORAGE", "json")
         self.file_path = kwargs.get("file_path", self.file_path)
+        self.indexes = dict()
         self._db = None
 
     def collection(self, name, *args, **kwargs):
@@ -201,6 +219,7 @@ class TinyAdapter(DataAdapter):
         else:
             db.purge_tables()
         db.close()
+        self.indexes.clear()
         self._db = None
         method = getattr(self, "_drop_db_%s" % self.storage)
         method()
@@ -233,6 +252,9 @@ class Collection(object):
     def find(self, *args, **kwargs):
         raise exceptions.NotImplementedError()
 
+    def find_iter(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
     def find_one(self, *args, **kwargs):
         raise exceptions.NotImplementedError()
 
@@ -242,24 +264,60 @@ class Collection(object):
     def insert(self, *args, **kwargs):
         raise exceptions.NotImplementedError()
 
+    def insert_many(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
+    def bulk_write(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
     def update(self, *args, **kwargs):
         raise exceptions.NotImplementedError()
 
+    def update_many(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
     def remove(self, *args, **kwargs):
         raise exceptions.NotImplementedError()
 
     def count(self, *args, **kwargs):
         raise exceptions.NotImplementedError()
 
+    def estimated_count(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
+    def aggregate(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
+    def distinct(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
     def ensure_index(self, *args, **kwargs):
         raise exceptions.NotImplementedError()
 
     def drop_indexes(self, *args, **kwargs):
         raise exceptions.NotImplementedError()
 
+    def create_index(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
+    def drop_index(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
+    def index_information(self, *args, **kwargs):
+        raise exceptions.NotImplementedError()
+
+    def explain(self, filter, sort=None):
+        return None
+
     def object_id(self, *args, **kwargs):
         return self.owner.object_id(*args, **kwargs)
 
+    def declare(self, index):
+        fields = index if isinstance(index, (list, tuple)) else [index]
+        for field in fields:
+            field = field[0] if isinstance(field, (list, tuple)) else field
+            profiler.PROFILER.declare(self.name, field)
+
     def log(self, operation, *args, **kwargs):
         show_queries = config.conf("SHOW_QUERIES", False, cast=bool)
         if not show_queries:
@@ -276,44 +334,95 @@ class Collection(object):
 
 class MongoCollection(Collection):
 
-    def __init__(self, owner, name, base):
+    def __init__(self, owner, name, base, is_async=False):
         Collection.__init__(self, owner, name)
         self._base = base
+        self._async = is_async
 
+    @profiler.profiled
     def find(self, *args, **kwargs):
         self.log("find", *args, **kwargs)
         return self._base.find(*args, **kwargs)
 
+    @profiler.profiled
+    def find_iter(self, *args, **kwargs):
+        self.log("find_iter", *args, **kwargs)
+        return self._base.find(*args, **kwargs)
+
+    @profiler.profiled
     def find_one(self, *args, **kwargs):
         self.log("find_one", *args, **kwargs)
         return self._base.find_one(*args, **kwargs)
 
+    @profiler.profiled
     def find_and_modify(self, *args, **kwargs):
         self.log("find_and_modify", *args, **kwargs)
         return mongodb._store_find_and_modify(self._base, *args, **kwargs)
 
+    @profiler.profiled
     def insert(self, *args, **kwargs):
         self.log("insert", *args, **kwargs)
         return mongodb._store_insert(self._base, *args, **kwargs)
 
+    @profiler.profiled
+    def insert_many(self, *args, **kwargs):
+        self.log("insert_many", *args, **kwargs)
+        return mongodb._store_insert_many(self._base, *args, **kwargs)
+
+    @profiler.profiled
+    def bulk_write(self, *args, **kwargs):
+        self.log("bulk_write", *args, **kwargs)
+        return mongodb._store_bulk_write(self._base, *args, **kwargs)
+
+    @profiler.profiled
     def update(self, *args, **kwargs):
         self.log("update", *args, **kwargs)
         return mongodb._store_update(self._base, *args, **kwargs)
 
+    @profiler.profiled
+    def update_many(self, *args, **kwargs):
+        self.log("update_many", *args, **kwargs)
+        # the result of an async (motor) update is a coroutine that is
+        # returned untouched so that it's awaited by the caller, as its
+        # matched count is not available before the await
+        if self._async:
+            return self._base.update_many(*args, **kwargs)
+        return mongodb._store_update_many(self._base, *args, **kwargs)
+
+    @profiler.profiled
     def remove(self, *args, **kwargs):
         self.log("remove", *args, **kwargs)
         return mongodb._store_remove(self._base, *args, **kwargs)
 
+    @profiler.profiled
     def count(self, *args, **kwargs):
         self.log("count", *args, **kwargs)
         return mongodb._count(self._base, *args, **kwargs)
 
+    @profiler.profiled
     def count_documents(self, *args, **kwargs):
         self.log("count_documents", *args, **kwargs)
         return mongodb._count_documents(self._base, *args, **kwargs)
 
+    @profiler.profiled
+    def estimated_count(self, *args, **kwargs):
+        self.log("estimated_count", *args, **kwargs)
+        return mongodb._estimated_count(self._base, *args, **kwargs)
+
+    @profiler.profiled
+    def aggregate(self, *args, **kwargs):
+        self.log("aggregate", *args, **kwargs)
+        return mongodb._store_aggregate(self._base, *args, **kwargs)
+
+    @profiler.profiled
+    def distinct(self, *args, **kwargs):
+        self.log("distinct", *args, **kwargs)
+        return mongodb._store_distinct(self._base, *args, **kwargs)
+
+    @profiler.profiled
     def ensure_index(self, *args, **kwargs):
         self.log("ensure_index", *args, **kwargs)
+        self.declare(args[0])
         direction = kwargs.pop("direction", True)
 
         is_simple = direction == "simple"
@@ -341,10 +450,36 @@ class MongoCollection(Collection):
         else:
             return mongodb._store_ensure_index_many(self._base, *args, **kwargs)
 
+    @profiler.profiled
     def drop_indexes(self, *args, **kwargs):
         self.log("drop_indexes", *args, **kwargs)
         return self._base.drop_indexes()
 
+    @profiler.profiled
+    def create_index(self, *args, **kwargs):
+        self.log("create_index", *args, **kwargs)
+        return mongodb._store_create_index(self._base, *args, **kwargs)
+
+    @profiler.profiled
+    def drop_index(self, *args, **kwargs):
+        self.log("drop_index", *args, **kwargs)
+        return self._base.drop_index(*args, **kwargs)
+
+    @profiler.profiled
+    def index_information(self, *args, **kwargs):
+        self.log("index_information", *args, **kwargs)
+        return self._base.index_information()
+
+    def explain(self, filter, sort=None):
+        # the explain of an async (motor) cursor is a coroutine that
+        # can't be awaited from the (sync) profiler so it's skipped
+        if self._async:
+            return None
+        cursor = self._base.find(filter)
+        if sort:
+            cursor = cursor.sort(sort)
+        return cursor.explain()
+
 
 class TinyCollection(Collection):
 
@@ -352,21 +487,37 @@ class TinyCollection(Collection):
         Collection.__init__(self, owner, name)
         self._base = base
 
+    @profiler.profiled
     def find(self, *args, **kwargs):
         self.log("find", *args, **kwargs)
         filter = args[0] if len(args) > 0 else dict()
+        fields = args[1] if len(args) > 1 else None
+        condition = self._to_condition(filter)
+        results = self._base.search(condition)
+        return self._to_results(results, kwargs, fields=fields)
+
+    @profiler.profiled
+    def find_iter(self, *args, **kwargs):
+        self.log("find_iter", *args, **kwargs)
+        filter = args[0] if len(args) > 0 else dict()
+        fields = args[1] if len(args) > 1 else None
         condition = self._to_condition(filter)
         results = self._base.search(condition)
-        return self._to_results(results, kwargs)
+        results = self._to_results(results, kwargs, build=False)
+        for result in results:
+            yield self._to_projection(result, fields)
 
+    @profiler.profiled
     def find_one(self, *args, **kwargs):
         self.log("find_one", *args, **kwargs)
         filter = args[0] if len(args) > 0 else dict()
+        fields = args[1] if len(args) > 1 else None
         condition = self._to_condition(filter)
         results = self._base.search(condition)
-        results = self._to_results(results, kwargs)
+        results = self._to_results(results, kwargs, fields=fields)
         return results[0] if results else None
 
+    @profiler.profiled
     def find_and_modify(self, *args, **kwargs):
         self.log("find_and_modify", *args, **kwargs)
         filter = args[0] if len(args) > 0 else dict()
@@ -379,47 +530,153 @@ class TinyCollection(Collection):
             raise exceptions.OperationalError("No object found")
         if not found:
             object = dict(filter)
-        object = self._to_update(modification, object=object)
+        object = self._to_update(modification, object=dict(object))
         if found:
-            self.update(filter, {"$set": object})
+            self._base.update(self._to_replacer(object), condition)
         else:
             self.insert(object)
         return dict(object)
 
+    @profiler.profiled
     def insert(self, *args, **kwargs):
         self.log("insert", *args, **kwargs)
         object = args[0] if len(args) > 0 else dict()
         has_id = "_id" in object
         if not has_id:
             object["_id"] = self._id()
+        self._to_unique(object)
         self._base.insert(object)
         return object
 
+    @profiler.profiled
+    def insert_many(self, *args, **kwargs):
+        documents = args[0] if len(args) > 0 else []
+        operations = [("insert_one", document) for document in documents]
+        return self.bulk_write(operations, **kwargs)
+
+    @profiler.profiled
+    def bulk_write(self, *args, **kwargs):
+        self.log("bulk_write", *args, **kwargs)
+        operations = args[0] if len(args) > 0 else []
+        ordered = kwargs.get("ordered", True)
+        errors = []
+        for index, operation in enumerate(operations):
+            try:
+                if operation[0] == "insert_one":
+                    self.insert(operation[1])
+                else:
+                    self.update(*operation[1:])
+            except Exception as exception:
+                errors.append((index, str(exception)))
+                if ordered:
+                    break
+        if errors:
+            raise exceptions.BulkError(errors)
+
+    @profiler.profiled
     def update(self, *args, **kwargs):
         self.log("update", *args, **kwargs)
         filter = args[0] if len(args) > 0 else dict()
         updater = args[1] if len(args) > 1 else dict()
         condition = self._to_condition(filter)
-        object = updater.get("$set", dict())
-        return self._base.update(object, condition)
+        return self._base.update(self._to_updater(updater, unique=True), condition)
 
+    @profiler.profiled
+    def update_many(self, *args, **kwargs):
+        self.log("update_many", *args, **kwargs)
+        filter = args[0] if len(args) > 0 else dict()
+        updater = args[1] if len(args) > 1 else dict()
+        condition = self._to_condition(filter)
+        result = self._base.update(self._to_updater(updater), condition)
+        return len(result)
+
+    @profiler.profiled
     def remove(self, *args, **kwargs):
         self.log("remove", *args, **kwargs)
         filter = args[0] if len(args) > 0 else dict()
         condition = self._to_condition(filter)
         return self._base.remove(condition)
 
+    @profiler.profiled
     def count(self, *args, **kwargs):
         self.log("count", *args, **kwargs)
         filter = args[0] if len(args) > 0 else dict()
         condition = self._to_condition(filter)
         return self._base.count(condition)
 
+    @profiler.profiled
+    def estimated_count(self, *args, **kwargs):
+        self.log("estimated_count", *args, **kwargs)
+        return len(self._base)
+
+    @profiler.profiled
+    def aggregate(self, *args, **kwargs):
+        self.log("aggregate", *args, **kwargs)
+        pipeline = args[0] if len(args) > 0 else []
+        results = [dict(result) for result in self._base.all()]
+        for stage in pipeline:
+            for operator, value in legacy.iteritems(stage):
+                method = getattr(self, "_aggregate_" + operator[1:], None)
+                if not method:
+                    raise exceptions.OperationalError(
+                        "Aggregation stage '%s' not supported" % operator
+                    )
+                results = method(results, value)
+        return results
+
+    @profiler.profiled
+    def distinct(self, *args, **kwargs):
+        self.log("distinct", *args, **kwargs)
+        key = args[0] if len(args) > 0 else None
+        filter = args[1] if len(args) > 1 else dict()
+        condition = self._to_condition(filter or dict())
+        results = []
+        for result in self._base.search(condition):
+            value = self._to_path(result, key)
+            values = value if isinstance(value, list) else [value]
+            for value in values:
+                if value == None or value in results:
+                    continue
+                results.append(value)
+        return results
+
+    @profiler.profiled
     def ensure_index(self, *args, **kwargs):
         self.log("ensure_index", *args, **kwargs)
+        self.declare(args[0])
 
+    @profiler.profiled
     def drop_indexes(self, *args, **kwargs):
         self.log("drop_indexes", *args, **kwargs)
+        self.owner.indexes.pop(self.name, None)
+
+    @profiler.profiled
+    def create_index(self, *args, **kwargs):
+        self.log("create_index", *args, **kwargs)
+        keys = args[0] if len(args) > 0 else []
+        name = kwargs.pop("name", None) or index_name(keys)
+        kwargs.pop("background", None)
+        indexes = self.owner.indexes.setdefault(self.name, dict())
+        indexes[name] = dict(key=list(keys), **kwargs)
+        return name
+
+    @profiler.profiled
+    def drop_index(self, *args, **kwargs):
+        self.log("drop_index", *args, **kwargs)
+        name = args[0] if len(args) > 0 else None
+        indexes = self.owner.indexes.get(self.name, dict())
+        if not name in indexes:
+            raise exceptions.OperationalError("Index '%s' not found" % name)
+        del indexes[name]
+
+    @profiler.profiled
+    def index_information(self, *args, **kwargs):
+        self.log("index_information", *args, **kwargs)
+        indexes = self.owner.indexes.get(self.name, dict())
+        information = dict(_id_=dict(key=[("_id", 1)]))
+        for name, index in legacy.iteritems(indexes):
+            information[name] = dict(index)
+        return information
 
     def _to_condition(self, filter):
         import tinydb
@@ -427,14 +684,91 @@ class TinyCollection(Collection):
         query = tinydb.Query()
         condition = query._id.exists()
         for name, value in legacy.iteritems(filter):
+            if name == "$or":
+                conditions = [self._to_condition(item) for item in value]
+                _condition = conditions[0]
+                for item in conditions[1:]:
+                    _condition |= item
+                condition &= _condition
+                continue
+            if name == "$and":
+                for item in value:
+                    condition &= self._to_condition(item)
+                continue
+            if name == "$text":
+                condition &= self._to_text(value)
+                continue
             if name.startswith("$"):
                 continue
             query = tinydb.Query()
-            _condition = getattr(query, name).__eq__(value)
-            condition &= _condition
+            field = getattr(query, name)
+            if self._is_operation(value):
+                for operator, target in legacy.iteritems(value):
+                    if operator == "$options":
+                        continue
+                    _condition = self._to_operation(field, operator, target, value)
+                    condition &= _condition
+            else:
+                _condition = field.__eq__(value)
+                condition &= _condition
         return condition
 
-    def _to_results(self, results, kwargs, build=True):
+    def _to_text(self, value):
+        import tinydb
+
+        # emulates the text search, matching the documents that contain
+        # any of the terms as a word of any of their string values
+        terms = set(value.get("$search", "").lower().split())
+
+        def test(document):
+            for item in legacy.itervalues(document):
+                if not legacy.is_string(item):
+                    continue
+                words = re.split(r"\W+", item.lower(), flags=re.UNICODE)
+                if terms.intersection(words):
+                    return True
+            return False
+
+        return tinydb.queries.QueryInstance(test, ("text", tuple(sorted(terms))))
+
+    def _is_operation(self, value):
+        if not isinstance(value, dict):
+            return False
+        if not value:
+            return False
+        for key in value:
+            if not key.startswith("$"):
+                return False
+        return True
+
+    def _to_operation(self, field, operator, target, value):
+        if operator == "$eq":
+            return field.__eq__(target)
+        if operator == "$in":
+            return field.one_of(list(target))
+        if operator == "$nin":
+            return field.test(lambda v: not v in target)
+        if operator == "$all":
+            return field.test(lambda v: all(item in (v or []) for item in target))
+        if operator == "$ne":
+            return field.__ne__(target)
+        if operator == "$gt":
+            return field.test(lambda v: not v == None and v > target)
+        if operator == "$gte":
+            return field.test(lambda v: not v == None and v >= target)
+        if operator == "$lt":
+            return field.test(lambda v: not v == None and v < target)
+        if operator == "$lte":
+            return field.test(lambda v: not v == None and v <= target)
+        if operator == "$exists":
+            return field.exists() if target else ~field.exists()
+        if operator == "$regex":
+            options = value.get("$options", "")
+            flags = re.IGNORECASE if "i" in options else 0
+            return field.search(target, flags=flags)
+        raise exceptions.OperationalError("Operator '%s' not supported" % operator)
+
+    def _to_results(self, results, kwargs, build=True, fields=None):
         sort = kwargs.get("sort", [])
         skip = kwargs.get("skip", 0)
         limit = kwargs.get("limit", None)
@@ -451,16 +785,50 @@ class TinyCollection(Collection):
         if sort:
             results.sort(key=sorter, reverse=reverse)
         if skip or limit:
-            results = results[slice(skip, skip + limit, 1)]
+            results = results[slice(skip, skip + limit if limit else None, 1)]
         if build:
-            results = [dict(result) for result in results]
+            results = [self._to_projection(result, fields) for result in results]
         return results
 
+    def _to_projection(self, result, fields):
+        # in case no projection is defined the complete document is
+        # returned, otherwise the projection is applied either as an
+        # inclusion (sequence or truthy map) or as an exclusion map,
+        # nested paths include the complete top level value
+        if not fields:
+            return dict(result)
+        if not isinstance(fields, dict):
+            fields = dict((name, 1) for name in fields)
+        include = [name for name, value in legacy.iteritems(fields) if value]
+        if include:
+            names = set(name.split(".", 1)[0] for name in include)
+            if fields.get("_id", 1):
+                names.add("_id")
+            return dict(
+                (name, value)
+                for name, value in legacy.iteritems(result)
+                if name in names
+            )
+        return dict(
+            (name, value)
+            for name, value in legacy.iteritems(result)
+            if not name in fields
+        )
+
     def _to_update(self, modification, object=None):
-        object = object or dict()
+        object = object if not object == None else dict()
+        sets = modification.get("$set", {})
+        unsets = modification.get("$unset", {})
         increments = modification.get("$inc", {})
         mins = modification.get("$min", {})
         maxs = modification.get("$max", {})
+        pushes = modification.get("$push", {})
+        pulls = modification.get("$pull", {})
+        adds = modification.get("$addToSet", {})
+        for name, value in legacy.iteritems(sets):
+            self._to_set(object, name, value)
+        for name in unsets:
+            self._to_unset(object, name)
         for name, increment in legacy.iteritems(increments):
             value = object.get(name, 0)
             value += increment
@@ -471,4 +839,253 @@ class TinyCollection(Collection):
         for name, target in legacy.iteritems(maxs):
             value = object.get(name, 0)
             object[name] = max(value, target)
+        for name, target in legacy.iteritems(pushes):
+            value = list(object.get(name, None) or [])
+            value.extend(self._to_each(target))
+            object[name] = value
+        for name, target in legacy.iteritems(adds):
+            value = list(object.get(name, None) or [])
+            for item in self._to_each(target):
+                if item in value:
+                    continue
+                value.append(item)
+            object[name] = value
+        for name, target in legacy.iteritems(pulls):
+            value = list(object.get(name, None) or [])
+            is_in = isinstance(target, dict) and "$in" in target
+            targets = target["$in"] if is_in else [target]
+            object[name] = [item for item in value if not item in targets]
         return object
+
+    def _to_set(self, object, name, value):
+        # sets the value in the (possibly nested) path of the object,
+        # creating the intermediate (sub) documents as required
+        parts = name.split(".")
+        for part in parts[:-1]:
+            if not isinstance(object.get(part, None), dict):
+                object[part] = dict()
+            object = object[part]
+        object[parts[-1]] = value
+
+    def _to_unset(self, object, name):
+        parts = name.split(".")
+        for part in parts[:-1]:
+            object = object.get(part, None)
+            if not isinstance(object, dict):
+                return
+        object.pop(parts[-1], None)
+
+    def _to_each(self, target):
+        if isinstance(target, dict) and "$each" in target:
+            return list(target["$each"])
+        return [target]
+
+    def _to_updater(self, modification, unique=False):
+        def updater(document):
+            if unique:
+                self._to_unique(self._to_update(modification, object=dict(document)))
+            self._to_update(modification, object=document)
+
+        return updater
+
+    def _to_unique(self, object):
+        # emulates the unique indexes (as declared) of the collection,
+        # raising an error in case there's already another document
+        # with the same values for the keys of any of the indexes
+        indexes = self.owner.indexes.get(self.name, dict())
+        for name, index in legacy.iteritems(indexes):
+            if not index.get("unique", False):
+                continue
+            keys = [key for key, _direction in index["key"]]
+            values = [self._to_path(object, key) for key in keys]
+            if index.get("sparse", False) and all(value == None for value in values):
+                continue
+            partial = index.get("partialFilterExpression", None)
+            if partial and not self._to_condition(partial)(object):
+                continue
+            for document in self._base.all():
+                if document.get("_id", None) == object.get("_id", None):
+                    continue
+                if not [self._to_path(document, key) for key in keys] == values:
+                    continue
+                if partial and not self._to_condition(partial)(document):
+                    continue
+                raise exceptions.OperationalError(
+                    "Duplicate key error for index '%s'" % name
+                )
+
+    def _to_replacer(self, object):
+        def replacer(document):
+            document.clear()
+            document.update(object)
+
+        return replacer
+
+    def _to_path(self, document, name):
+        value = document
+        for part in name.split("."):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part, None)
+        return value
+
+    def _to_value(self, document, expression):
+        if isinstance(expression, legacy.STRINGS) and expression.startswith("$"):
+            return self._to_path(document, expression[1:])
+        if isinstance(expression, dict):
+            return dict(
+                (name, self._to_value(document, value))
+                for name, value in legacy.iteritems(expression)
+            )
+        return expression
+
+    def _aggregate_match(self, results, filter):
+        condition = self._to_condition(filter)
+        return [result for result in results if condition(result)]
+
+    def _aggregate_group(self, results, spec):
+        # groups the results by the (serialized) value of the `_id`
+        # expression keeping the order of the first occurrence
+        groups = dict()
+        order = []
+        for result in results:
+            _id = self._to_value(result, spec.get("_id", None))
+            key = json.dumps(_id, sort_keys=True, default=str)
+            if not key in groups:
+                groups[key] = (_id, [])
+                order.append(key)
+            groups[key][1].append(result)
+
+        # runs the accumulators for each of the groups building the
+        # resulting documents with the `_id` and the accumulated values
+        grouped = []
+        for key in order:
+            _id, documents = groups[key]
+            group = dict(_id=_id)
+            for name, accumulator in legacy.iteritems(spec):
+                if name == "_id":
+                    continue
+                for operator, expression in legacy.iteritems(accumulator):
+                    values = [
+                        self._to_value(document, expression) for document in documents
+                    ]
+                    group[name] = self._to_accumulated(operator, values)
+            grouped.append(group)
+        return grouped
+
+    def _to_accumulated(self, operator, values):
+        numbers = [
+            value
+            for value in values
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        ]
+        valid = [value for value in values if not value == None]
+        if operator == "$sum":
+            return sum(numbers)
+        if operator == "$avg":
+            return sum(numbers) / float(len(numbers)) if numbers else None
+        if operator == "$min":
+            return min(valid) if valid else None
+        if operator == "$max":
+            return max(valid) if valid else None
+        if operator == "$first":
+            return values[0] if values else None
+        if operator == "$last":
+            return values[-1] if values else None
+        if operator == "$push":
+            return values
+        if operator == "$addToSet":
+            unique = []
+            for value in values:
+                if value in unique:
+                    continue
+                unique.append(value)
+            return unique
+        raise exceptions.OperationalError(
+            "Aggregation accumulator '%s' not supported" % operator
+        )
+
+    def _aggregate_sort(self, results, sort):
+        # runs a stable sort per field (from the least significant one
+        # to the most significant one) placing the unset values first
+        sort = sort.items() if isinstance(sort, dict) else sort
+        for name, direction in reversed(list(sort)):
+            results = sorted(
+                results,
+                key=lambda result: (
+                    not self._to_path(result, name) == None,
+                    self._to_path(result, name),
+                ),
+                reverse=direction == -1,
+            )
+        return results
+
+    def _aggregate_skip(self, results, skip):
+        return results[skip:]
+
+    def _aggregate_limit(self, results, limit):
+        return results[:limit]
+
+    def _aggregate_count(self, results, name):
+        return [{name: len(results)}]
+
+    def _aggregate_unwind(self, results, spec):
+        path = spec["path"] if isinstance(spec, dict) else spec
+        name = path[1:]
+        unwound = []
+        for result in results:
+            values = self._to_path(result, name)
+            if not isinstance(values, list):
+                if not values == None:
+                    unwound.append(result)
+                continue
+            for value in values:
+                _result = dict(result)
+                _result[name] = value
+                unwound.append(_result)
+        return unwound
+
+    def _aggregate_project(self, results, spec):
+        # determines if the projection is an exclusion one, meaning that
+        # only the exclusions (zero values) are defined, notice that the
+        # `_id` field is special as it may be excluded in an inclusion
+        is_exclusion = all(
+            value in (0, False)
+            for name, value in legacy.iteritems(spec)
+            if not name == "_id"
+        )
+        projected = []
+        for result in results:
+            if is_exclusion:
+                _result = dict(result)
+                for name in spec:
+                    _result.pop(name, None)
+            else:
+                _result = dict()
+                if spec.get("_id", 1) and "_id" in result:
+                    _result["_id"] = result["_id"]
+                for name, value in legacy.iteritems(spec):
+                    if name == "_id":
+                        continue
+                    if value in (1, True):
+                        if name in result:
+                            _result[name] = result[name]
+                    else:
+                        _result[name] = self._to_value(result, value)
+            projected.append(_result)
+        return projected
+
+
+def index_name(keys):
+    """
+    Builds the (default) name of the index for the provided sequence
+    of key and direction tuples, using the same naming strategy as
+    the one used by MongoDB (eg: name_1_age_-1).
+
+    :type keys: List
+    :param keys: The sequence of key and direction tuples.
+    :rtype: String
+    :return: The name of the index for the provided keys.
+    """
+
+    return "_".join("%s_%s" % (key, direction) for key, direction in keys)
@@ -184,6 +184,22 @@ class ValidationError(OperationalError):
         return legacy.u("").join(buffer)
 
 
+class BulkError(OperationalError):
+    """
+    Error raised when one or more of the items of a bulk
+    operation (eg: bulk insert or write) failed, the error
+    contains the index and the error for each failed item.
+    """
+
+    errors = []
+    """ The sequence of tuples associating the index of the
+    item that failed with the error (or message) for it """
+
+    def __init__(self, errors, message="Bulk operation failed"):
+        OperationalError.__init__(self, message, 400)
+        self.errors = errors
+
+
 class NotImplementedError(OperationalError):
     """
     Error to be raised when a certain feature or route is not
@@ -28,24 +28,37 @@ __copyright__ = "Copyright (c) 2008-2025 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import os
 import re
 import copy
+import base64
 import math
 import json
+import hashlib
 import types
 import flask
 import inspect
 import datetime
+import threading
+import contextlib
+import collections
 
 from . import util
+from . import data
 from . import meta
 from . import common
 from . import legacy
 from . import typesf
 from . import observer
+from . import structures
 from . import validation
 from . import exceptions
 
+if legacy.PYTHON_ASYNC:
+    from .model_a import ModelAsync
+else:
+    ModelAsync = object
+
 ITERABLES = tuple(list(legacy.STRINGS) + [dict])
 """ The sequence defining the complete set of valid types
 for direct evaluation, instead of indirect (recursive)
@@ -156,7 +169,19 @@ REVERSE = dict(
 order direction (as a string) with the opposite one
 this may be used to "calculate" the reverse value """
 
-DIRTY_PARAMS = ("map", "rules", "meta", "build", "skip", "limit", "sort", "raise_e")
+DIRTY_PARAMS = (
+    "map",
+    "rules",
+    "meta",
+    "build",
+    "skip",
+    "limit",
+    "sort",
+    "raise_e",
+    "after",
+    "lazy",
+    "view",
+)
 """ The set containing the complete set of parameter names for
 the parameters that are considered to be dirty and that should
 be cleaned from any query operation on the data source, otherwise
@@ -220,10 +245,119 @@ INSENSITIVE = {"likei": True, "llikei": True, "rlikei": True}
 values that define if an insensitive base search should be used
 instead of the "typical" sensitive search """
 
+VIEWS = ("list", "show")
+""" The sequence of the names of the views of the model that
+may be used to derive the projection of a retrieval, each one
+is backed by the `<view>_names()` method of the model """
+
+SEARCH_FIELD = "_search"
+""" The name of the (internal) field that holds the sequence of
+n-grams of the search field, maintained on save for the models
+that use the n-gram search strategy """
+
+SEARCH_SIZES = (1, 16)
+""" The minimum and maximum sizes of the (edge) n-grams that are
+generated for each of the words of the search field, larger words
+are matched by the prefix of the maximum size """
+
+SEARCH_OPERATORS = ("like", "likei")
+""" The sequence of filter operators that are served by the search
+strategy of the model (when applied to its search field) as they
+represent a search for the value anywhere in the field """
+
+EMBED_FIELD = "_embed"
+""" The name of the (internal) field that holds the snapshots of
+the embedded fields of the references of a model, keyed by the
+name of the reference field, maintained on save and fanned out
+on the save of the target entities """
+
+CAST_EXACT = (legacy.UNICODE, int, float, bool, dict)
+""" The set of types for which the cast (builder) operation is
+a no-op in case the value is already of the exact target type,
+allowing such cast to be skipped on hydration """
+
+SERIAL_EXACT = frozenset(
+    list(legacy.STRINGS) + [int, legacy.LONG, float, bool, dict, type(None)]
+)
+""" The set of types for which the serialization (evaluation) of
+a value is a no-op in case the value is of the exact type, so that
+the generic evaluation (reflection based) may be skipped """
+
+INDEX_CODES = (27, 68, 85, 86)
+""" The error codes of the index commands that are the result
+of a concurrent sync of the indexes (eg: by another worker) and
+that are tolerated, index not found and index already exists """
+
+INDEX_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+""" The sequence of index options that are relevant for the
+comparison of index definitions, other options (eg: version
+or namespace) are informational only """
+
+FIND_CACHE = structures.LRUDict(max_size=1024)
+""" The bounded (least recently used) cache of the compiled find
+expression builders, keyed by the model class and the template of
+the expression, so that only the value substitution is performed
+for each of the filter expressions of a request """
+
+CONCURRENT = threading.BoundedSemaphore(8)
+""" The semaphore that bounds the number of threads running
+concurrent operations (eg: the count of a page) at a given
+time, beyond that limit the operations are run inline """
+
+IDENTITY = threading.local()
+""" The thread local storage that holds the identity map
+currently in use for explicit (block based) scopes, this
+takes precedence over the request scoped identity map """
+
+BASE_NAMES = frozenset(("model", "ref", "_events", "_extras", "_snapshot", "_lazy"))
+""" The set of names that are considered to be base (instance)
+attributes of a model, to be set in the instance and not in the
+underlying model map (eg: on attribute assignment) """
+
+Descriptor = collections.namedtuple(
+    "Descriptor",
+    (
+        "name",
+        "index",
+        "type",
+        "builder",
+        "exact",
+        "cast_d",
+        "fill_d",
+        "private",
+        "safe",
+        "immutable",
+        "increment",
+        "eager",
+    ),
+)
+""" The immutable descriptor of a field of a model, compiled once
+per class from its definition and containing the resolved builder,
+the default value factories and the complete set of field flags """
+
+INDEXES = threading.local()
+""" The thread local storage that holds the sequence of models
+whose index building has been deferred, so that the indexes may
+be built in batch (eg: concurrently) after the models setup """
+
+EMBEDS = dict()
+""" The map associating the name of each model with the sequence
+of model class and reference field name tuples that embed fields
+of it, used to fan out the changes on the save of its entities """
+
+BLOCKS = dict()
+""" The map associating the name of each counter with the block
+of sequence values currently reserved by the running process, used
+by the hi-lo allocation of increment values (per process) """
+
+BLOCKS_LOCK = threading.RLock()
+""" The lock that controls the access to the blocks map, ensuring
+that the increment values are handed out in a thread safe way """
+
 BUILDERS.update(BUILDERS_META)
 
 
-class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
+class Model(legacy.with_meta(meta.Ordered, observer.Observable, ModelAsync)):
     """
     Abstract model class from which all the models should
     directly or indirectly inherit. Should provide the
@@ -237,27 +371,95 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
     _extra_methods = []
     """ Special sequence of tuples (names and functions) that is
     used at instance creation time to bind the provided methods
-    to the newly created instance, this is required for the dynamic
-    addition of instance methods to models """
+    to the class of the newly created instance, this is required
+    for the dynamic addition of instance methods to models """
+
+    _events = {}
+    """ The shared (empty) map of instance level events, the
+    instance specific map is only created on the first bind
+    operation, this map should never be changed directly """
+
+    _extras = ()
+    """ The shared (empty) sequence of extra validation methods,
+    the instance specific list is only created when the first
+    extra validation method is added to the instance """
+
+    _snapshot = None
+    """ The snapshot of the stored values of the instance, used
+    for the tracking of changes, only set for tracked instances """
+
+    _lazy = None
+    """ The lazy loader of the deferred (lazy) fields of the instance,
+    shared by the instances retrieved together (batch loading) """
+
+    ref = None
+    """ The reference to the entity that "owns" the instance,
+    by default (and in most situations) there's no owner """
+
+    track_changes = False
+    """ If the changes of the entities of the model should be tracked,
+    keeping a snapshot of the stored values on retrieval and save so
+    that clean entities skip validation and only the changed values
+    are sent to the data source (partial updates), as the snapshot
+    implies a copy of the mutable values its usage is opt-in """
+
+    query_cache = False
+    """ If the results of the read queries (get, find and count)
+    for the model should be cached in the query cache of the app,
+    an integer value sets a specific time to live (in seconds) """
+
+    entity_cache = False
+    """ If the entities of the model should be cached (by key) in the
+    shared (second level) entity cache of the app, used by the key based
+    retrievals, an integer value sets a specific time to live (in seconds),
+    the stale entries of a changed key field are only targeted for tracked
+    entities (otherwise the entries of the model are invalidated) """
+
+    default_view = None
+    """ The name of the view (eg: list) used by default in the find
+    (listing) retrievals of the model when no view is requested, the
+    complete documents are retrieved by default (no view projection),
+    an explicit `view=None` restores them for a view based model """
+
+    search_mode = "regex"
+    """ The strategy used for the search on the search field of the
+    model (`find_s` and like operators), either `regex` (unanchored
+    regex, can't use an index), `prefix` (anchored regex served by an
+    ascending index), `text` (text index) or `ngram` (maintained n-gram
+    array field served by an index), notice that the text and n-gram
+    strategies are case insensitive so the (case sensitive) like operator
+    keeps the regex strategy for them, the n-grams of existing entities
+    should be built with :meth:`rebuild_search` """
+
+    search_name = None
+    """ The name of the field that is searched using the search strategy
+    of the model, defaulting to the default field of the model """
+
+    model_indexes = ()
+    """ The sequence of model level indexes (compound, partial, unique
+    or TTL) declared through :func:`index`, these are synced with the
+    data source together with the field level ones on setup """
 
     def __init__(self, model=None, **kwargs):
+        cls = self.__class__
         fill = kwargs.pop("fill", True)
+        ref = kwargs.pop("ref", None)
         model = model or {}
         if fill:
-            model = self.__class__.fill(model)
-        self.__dict__["_events"] = {}
-        self.__dict__["_extras"] = []
+            model = cls.fill(model)
+
+        # sets the model as the only instance level attribute, the
+        # remaining base attributes (events, extras, etc.) are created
+        # lazily, keeping the instances as compact as possible, notice
+        # that the observable constructor is not called for that reason
         self.__dict__["model"] = model
-        self.__dict__["ref"] = kwargs.pop("ref", None)
+        if not ref == None:
+            self.__dict__["ref"] = ref
+
         for name, value in kwargs.items():
             setattr(self, name, value)
-        for name, method in self.__class__._extra_methods:
-            if legacy.PYTHON_3:
-                bound_method = types.MethodType(method, self)
-            else:
-                bound_method = types.MethodType(method, self, self.__class__)
-            setattr(self, name, bound_method)
-        observer.Observable.__init__(self)
+        if cls._extra_methods:
+            cls._extras_b()
 
     def __str__(self):
         cls = self.__class__
@@ -285,23 +487,29 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
 
     def __getattribute__(self, name):
         try:
-            model = object.__getattribute__(self, "model")
-            if name in model:
-                return model[name]
+            model = _getattribute(self, "model")
         except AttributeError:
-            pass
-        cls = object.__getattribute__(self, "__class__")
-        definition = cls.definition()
-        if name in definition:
+            model = None
+        if model and name in model:
+            return model[name]
+        cls = type(self)
+        schema = cls.__dict__.get("_schema", None)
+        if schema == None:
+            schema = cls.schema()
+        if name in schema:
+            lazy = _getattribute(self, "_lazy")
+            if lazy and lazy.load(self, name):
+                return model[name]
             raise AttributeError("attribute '%s' is not set" % name)
-        return object.__getattribute__(self, name)
+        return _getattribute(self, name)
 
     def __setattr__(self, name, value):
-        is_base = name in self.__dict__
+        _dict = _getattribute(self, "__dict__")
+        is_base = name in _dict or name in BASE_NAMES
         if is_base:
-            self.__dict__[name] = value
+            _dict[name] = value
         else:
-            self.model[name] = value
+            _dict["model"][name] = value
 
     def __delattr__(self, name):
         try:
@@ -332,6 +540,13 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
     def __bool__(self):
         return len(self.model) > 0
 
+    def bind(self, name, method, oneshot=False):
+        # makes sure that the instance has its own map of events
+        # (lazily created) before binding the method to the event
+        if not "_events" in self.__dict__:
+            self.__dict__["_events"] = {}
+        observer.Observable.bind(self, name, method, oneshot=oneshot)
+
     @classmethod
     def new(
         cls,
@@ -487,6 +702,10 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
             limit,
             sort,
             raise_e,
+            identity,
+            cache,
+            lazy,
+            view,
         ) = cls._get_attrs(
             kwargs,
             (
@@ -503,14 +722,38 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
                 ("limit", 0),
                 ("sort", None),
                 ("raise_e", True),
+                ("identity", True),
+                ("cache", True),
+                ("lazy", True),
+                ("view", None),
             ),
         )
 
+        # determines if the identity map (if any) may be used for the
+        # current retrieval, this is only possible for the "default"
+        # instance based retrieval (no projection or map conversion)
+        identity = identity and cls._identity_safe(
+            fields=fields, map=map, rules=rules, meta=meta, build=build, fill=fill
+        )
+        identity_m = get_identity() if identity else None
+
+        # in case there's an identity map in use tries to retrieve the
+        # entity from it (by its key) avoiding the data source access
+        if not identity_m == None:
+            key = cls._identity_key(kwargs)
+            instance = identity_m.get_e(cls, *key) if key else None
+            if instance:
+                if eager_l:
+                    eager = cls._eager_b(eager)
+                if eager:
+                    cls._eager(instance, eager, map=map)
+                return instance
+
         # in case there's a sort field and the safe search mode is enabled
         # we must add sorting by the `_id` field so that the retrieval is
         # considered to be deterministic, otherwise some DB implementations
         # will not respect the same sorting sequence across different calls
-        if sort and (skip or limit):
+        if sort and (skip or limit) and not cls._has_id(sort):
             if not isinstance(sort, list):
                 sort = list(sort)
             sort.append(["_id", 1])
@@ -521,9 +764,25 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
             resolve_a = map
         if eager_l:
             eager = cls._eager_b(eager)
-        fields = cls._sniff(fields, rules=rules)
+        fields, lazy = cls._projection(
+            fields, rules=rules, map=map, lazy=lazy, view=view, eager=eager
+        )
         collection = cls._collection()
-        model = collection.find_one(kwargs, fields, skip=skip, limit=limit, sort=sort)
+        entity_key = cls._entity_key(
+            kwargs, fields=fields, skip=skip, limit=limit, sort=sort, cache=cache
+        )
+        if entity_key:
+            models = cls._entity_get(*entity_key, fields=fields)
+            model = models[0] if models else None
+        else:
+            model = cls._cached(
+                "get",
+                (kwargs, fields, skip, limit, sort),
+                lambda: collection.find_one(
+                    kwargs, fields, skip=skip, limit=limit, sort=sort
+                ),
+                cache=cache,
+            )
         if not model and raise_e:
             is_devel = common.is_devel()
             if is_devel:
@@ -533,16 +792,22 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
             raise exceptions.NotFoundError(message)
         if not model and not raise_e:
             return model
-        cls.types(model)
-        if fill:
-            cls.fill(model, safe=rules)
+        stored = None if map else cls._snapshot_b(model)
+        cls._hydrate(model, fill=fill, safe=rules, lazy=lazy)
         if build:
             cls.build(model, map=map, rules=rules, meta=meta)
         if eager:
             model = cls._eager(model, eager, map=map)
         if resolve_a:
             model = cls._resolve_all(model, resolve=False)
-        return model if map else cls.old(model=model, safe=False)
+        if map:
+            return model
+        instance = cls._instance(model, cast=resolve_a, stored=stored, lazy=lazy)
+        if lazy:
+            LazyLoader.attach(cls, [instance], lazy)
+        if not identity_m == None:
+            identity_m.add(instance)
+        return instance
 
     @classmethod
     def find(cls, *args, **kwargs):
@@ -560,6 +825,11 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
             limit,
             sort,
             raise_e,
+            identity,
+            cache,
+            after,
+            lazy,
+            view,
         ) = cls._get_attrs(
             kwargs,
             (
@@ -576,14 +846,32 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
                 ("limit", 0),
                 ("sort", None),
                 ("raise_e", False),
+                ("identity", True),
+                ("cache", True),
+                ("after", None),
+                ("lazy", True),
+                ("view", cls.default_view),
             ),
         )
 
+        # determines if the resulting entities should be registered in
+        # the identity map (if any) so that they may be re-used by any
+        # further retrieval of the same entities (by key)
+        identity = identity and cls._identity_safe(
+            fields=fields, map=map, rules=rules, meta=meta, build=build, fill=fill
+        )
+        identity_m = get_identity() if identity else None
+
+        # the keyset pagination requires the sort to be complemented with
+        # the `_id` field (same direction) so that it's a total order
+        if after:
+            sort = cls._keyset_s(sort)
+
         # in case there's a sort field and the safe search mode is enabled
         # we must add sorting by the `_id` field so that the search is
         # considered to be deterministic, otherwise some DB implementations
         # will not respect the same sorting sequence across different calls
-        if sort and (skip or limit):
+        if sort and (skip or limit) and not cls._has_id(sort):
             if not isinstance(sort, list):
                 sort = list(sort)
             sort.append(["_id", 1])
@@ -596,9 +884,30 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         cls._find_s(kwargs)
         cls._find_d(kwargs)
 
-        fields = cls._sniff(fields, rules=rules)
+        # in case an after cursor is provided the keyset pagination is
+        # used, resuming the retrieval right after the entity for which
+        # the cursor was built (index friendly, unlike the skip value)
+        if after:
+            cls._keyset_f(kwargs, sort, after)
+
+        fields, lazy = cls._projection(
+            fields, rules=rules, map=map, lazy=lazy, view=view, eager=eager
+        )
         collection = cls._collection()
-        models = collection.find(kwargs, fields, skip=skip, limit=limit, sort=sort)
+        entity_key = cls._entity_key(
+            kwargs, fields=fields, skip=skip, limit=limit, sort=sort, cache=cache
+        )
+        if entity_key:
+            models = cls._entity_get(*entity_key, fields=fields)
+        else:
+            models = cls._cached(
+                "find",
+                (kwargs, fields, skip, limit, sort),
+                lambda: list(
+                    collection.find(kwargs, fields, skip=skip, limit=limit, sort=sort)
+                ),
+                cache=cache,
+            )
         if not models and raise_e:
             is_devel = common.is_devel()
             if is_devel:
@@ -606,49 +915,435 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
             else:
                 message = "%s not found" % cls.__name__
             raise exceptions.NotFoundError(message)
-        models = [cls.types(model) for model in models]
-        if fill:
-            models = [cls.fill(model, safe=rules) for model in models]
-        if build:
-            [cls.build(model, map=map, rules=rules, meta=meta) for model in models]
-        if eager:
-            models = cls._eager(models, eager, map=map)
-        if resolve_a:
-            models = [cls._resolve_all(model, resolve=False) for model in models]
-        models = (
-            models if map else [cls.old(model=model, safe=False) for model in models]
+        models = cls._hydrate_many(
+            models,
+            eager=eager,
+            map=map,
+            rules=rules,
+            meta=meta,
+            build=build,
+            fill=fill,
+            resolve_a=resolve_a,
+            identity_m=identity_m,
+            lazy=lazy,
         )
         return models
 
+    @classmethod
+    def iter(cls, *args, **kwargs):
+        """
+        Iterates over the complete set of entities that match the
+        provided filter, hydrating them lazily in batches of the
+        provided size, so that the memory usage remains flat no
+        matter the size of the underlying collection.
+
+        The eager loading of references (if requested) is performed
+        per batch, meaning that a single query per target model and
+        path level is going to be issued for each of the batches.
+
+        Most of the find related parameters are supported and the
+        generator should be used as a "drop-in" replacement for the
+        find operation whenever large data sets are involved, including
+        the default view of the model (as in find). Notice that unlike
+        find the entities are not registered in the identity map (if
+        any) by default, as that would keep every entity in memory.
+
+        :type batch_size: int
+        :param batch_size: The number of entities that are going to
+        be retrieved and hydrated at a time from the data source.
+        :rtype: Generator
+        :return: The generator that yields the entities (or maps)
+        that match the provided filter, one at a time.
+        """
+
+        (
+            fields,
+            eager,
+            eager_l,
+            map,
+            rules,
+            meta,
+            build,
+            fill,
+            resolve_a,
+            skip,
+            limit,
+            sort,
+            identity,
+            batch_size,
+            lazy,
+            view,
+        ) = cls._get_attrs(
+            kwargs,
+            (
+                ("fields", None),
+                ("eager", None),
+                ("eager_l", False),
+                ("map", False),
+                ("rules", True),
+                ("meta", False),
+                ("build", True),
+                ("fill", True),
+                ("resolve_a", None),
+                ("skip", 0),
+                ("limit", 0),
+                ("sort", None),
+                ("identity", False),
+                ("batch_size", 500),
+                ("lazy", True),
+                ("view", cls.default_view),
+            ),
+        )
+
+        # determines if the resulting entities should be registered in
+        # the identity map (if any, only on explicit request), this is done
+        # once for the complete iteration as the map is considered stable
+        identity = identity and cls._identity_safe(
+            fields=fields, map=map, rules=rules, meta=meta, build=build, fill=fill
+        )
+        identity_m = get_identity() if identity else None
+
+        # ensures deterministic sorting in case there's a sort together
+        # with a skip or limit value (same as in the find operation)
+        if sort and (skip or limit) and not cls._has_id(sort):
+            if not isinstance(sort, list):
+                sort = list(sort)
+            sort.append(["_id", 1])
+
+        if resolve_a == None:
+            resolve_a = map
+        if eager_l:
+            eager = cls._eager_b(eager)
+
+        cls._find_s(kwargs)
+        cls._find_d(kwargs)
+
+        # retrieves the streaming cursor from the collection, which
+        # should only retrieve batch size elements at a time from the
+        # data source, and then starts the batch hydration loop
+        fields, lazy = cls._projection(
+            fields, rules=rules, map=map, lazy=lazy, view=view, eager=eager
+        )
+        collection = cls._collection()
+        cursor = collection.find_iter(
+            kwargs, fields, skip=skip, limit=limit, sort=sort, batch_size=batch_size
+        )
+
+        batch = []
+        for model in cursor:
+            batch.append(model)
+            if len(batch) < batch_size:
+                continue
+            for model in cls._hydrate_many(
+                batch,
+                eager=eager,
+                map=map,
+                rules=rules,
+                meta=meta,
+                build=build,
+                fill=fill,
+                resolve_a=resolve_a,
+                identity_m=identity_m,
+                lazy=lazy,
+            ):
+                yield model
+            batch = []
+
+        # in case there are still some models pending in the
+        # current batch hydrates them and yields the results
+        if not batch:
+            return
+        for model in cls._hydrate_many(
+            batch,
+            eager=eager,
+            map=map,
+            rules=rules,
+            meta=meta,
+            build=build,
+            fill=fill,
+            resolve_a=resolve_a,
+            identity_m=identity_m,
+            lazy=lazy,
+        ):
+            yield model
+
+    @classmethod
+    def find_iter(cls, *args, **kwargs):
+        return cls.iter(*args, **kwargs)
+
     @classmethod
     def count(cls, *args, **kwargs):
+        cache = kwargs.pop("cache", True)
+        ttl = kwargs.pop("ttl", None)
+        estimate = kwargs.pop("estimate", False)
         cls._clean_attrs(kwargs)
 
         cls._find_s(kwargs)
         cls._find_d(kwargs)
 
         collection = cls._collection()
-        if kwargs:
-            if hasattr(collection, "count_documents"):
-                result = collection.count_documents(kwargs)
-            else:
-                result = collection.find(kwargs)
-                result = result.count()
-        else:
-            if hasattr(collection, "count_documents"):
-                result = collection.count_documents()
+
+        # in case there's no filter and an estimate is acceptable the
+        # metadata based count of the collection is used (no scan)
+        if not kwargs and estimate:
+            return collection.estimated_count()
+
+        def _count():
+            if kwargs:
+                if hasattr(collection, "count_documents"):
+                    result = collection.count_documents(kwargs)
+                else:
+                    result = collection.count(kwargs)
             else:
-                result = collection.count()
-        return result
+                if hasattr(collection, "count_documents"):
+                    result = collection.count_documents()
+                else:
+                    result = collection.count()
+            return result
+
+        return cls._cached("count", kwargs, _count, cache=cache, ttl=ttl)
+
+    @classmethod
+    def values(cls, *names, **kwargs):
+        """
+        Retrieves the raw values of the fields with the provided names
+        for the entities that match the provided filter, using a query
+        projection so that only the requested fields are retrieved and
+        without any hydration or instantiation of entities.
+
+        For a single name the values are returned directly, for multiple
+        names a tuple of values is returned per entity.
+
+        :type names: List
+        :param names: The names of the fields to retrieve, may use the
+        dot notation for the retrieval of embedded values.
+        :rtype: List
+        :return: The list of raw values (or tuples of values) in the
+        same order as the underlying query results.
+        """
+
+        skip = kwargs.pop("skip", 0)
+        limit = kwargs.pop("limit", 0)
+        sort = kwargs.pop("sort", None)
+        cache = kwargs.pop("cache", True)
+        cls._clean_attrs(kwargs)
+        cls._find_s(kwargs)
+        cls._find_d(kwargs)
+
+        # ensures a deterministic sort in case there's a sort together
+        # with a skip or limit value (same as in the find operation)
+        if sort and (skip or limit) and not cls._has_id(sort):
+            sort = list(sort)
+            sort.append(["_id", 1])
+
+        # builds the projection for the query so that only the requested
+        # fields are retrieved, notice that the `_id` field is explicitly
+        # excluded (unless requested) allowing covered queries
+        fields = dict((name, 1) for name in names)
+        if not "_id" in fields:
+            fields["_id"] = 0
+
+        collection = cls._collection()
+        models = cls._cached(
+            "values",
+            (kwargs, fields, skip, limit, sort),
+            lambda: list(
+                collection.find(kwargs, fields, skip=skip, limit=limit, sort=sort)
+            ),
+            cache=cache,
+        )
+
+        if len(names) == 1:
+            return [cls._value_p(model, names[0]) for model in models]
+        return [tuple(cls._value_p(model, name) for name in names) for model in models]
+
+    @classmethod
+    def ids(cls, *args, **kwargs):
+        """
+        Retrieves the (raw) identifiers of the entities that match the
+        provided filter, without any hydration of entities.
+
+        :rtype: List
+        :return: The list of `_id` values of the matching entities.
+        """
+
+        return cls.values("_id", *args, **kwargs)
+
+    @classmethod
+    def exists_c(cls, *args, **kwargs):
+        """
+        Determines if there's at least one entity that matches the
+        provided filter, retrieving (at most) a single document with
+        an `_id` only projection (no hydration is performed).
+
+        :rtype: bool
+        :return: If there's at least one entity matching the filter.
+        """
+
+        cache = kwargs.pop("cache", True)
+        cls._clean_attrs(kwargs)
+        cls._find_s(kwargs)
+        cls._find_d(kwargs)
+
+        collection = cls._collection()
+        model = cls._cached(
+            "exists",
+            kwargs,
+            lambda: collection.find_one(kwargs, {"_id": 1}),
+            cache=cache,
+        )
+        return True if model else False
+
+    @classmethod
+    def aggregate(cls, pipeline, *args, **kwargs):
+        """
+        Runs the provided aggregation pipeline on the data source (server
+        side) for the collection of the model, returning the resulting
+        documents as raw maps (no hydration is performed).
+
+        :type pipeline: List
+        :param pipeline: The sequence of aggregation stages to be run
+        (eg: `[{"$match": {...}}, {"$group": {...}}]`).
+        :type cache: bool
+        :param cache: If the query cache may be used for the results.
+        :rtype: List
+        :return: The list of documents resulting from the pipeline.
+        """
+
+        cache = kwargs.pop("cache", True)
+        collection = cls._collection()
+        return cls._cached(
+            "aggregate",
+            pipeline,
+            lambda: collection.aggregate(pipeline, *args, **kwargs),
+            cache=cache,
+        )
+
+    @classmethod
+    def group_count(cls, field, *args, **kwargs):
+        """
+        Counts the number of entities that match the provided filter
+        per each value of the provided field, the grouping is performed
+        on the data source using an aggregation pipeline.
+
+        The filter follows the same semantics as the one of the find
+        operation (including the `find_s` and `find_d` values).
+
+        :type field: String
+        :param field: The name of the field to group the entities by.
+        :rtype: Dictionary
+        :return: The map associating each value of the field with the
+        number of entities that have it, the (unhashable) sequence and
+        map values are converted into tuples to be used as keys.
+        """
+
+        cache = kwargs.pop("cache", True)
+        cls._clean_attrs(kwargs)
+        cls._find_s(kwargs)
+        cls._find_d(kwargs)
+
+        pipeline = [{"$match": kwargs}] if kwargs else []
+        pipeline.append({"$group": {"_id": "$" + field, "count": {"$sum": 1}}})
+        results = cls.aggregate(pipeline, cache=cache)
+        return dict((_hashable(result["_id"]), result["count"]) for result in results)
+
+    @classmethod
+    def distinct(cls, field, *args, **kwargs):
+        """
+        Retrieves the distinct values of the provided field for the
+        entities that match the provided filter, computed on the data
+        source, the filter follows the semantics of the find operation.
+
+        :type field: String
+        :param field: The name of the field to retrieve the values of.
+        :rtype: List
+        :return: The list of distinct (raw) values of the field.
+        """
+
+        cache = kwargs.pop("cache", True)
+        cls._clean_attrs(kwargs)
+        cls._find_s(kwargs)
+        cls._find_d(kwargs)
+
+        collection = cls._collection()
+        return cls._cached(
+            "distinct",
+            (field, kwargs),
+            lambda: collection.distinct(field, kwargs),
+            cache=cache,
+        )
 
     @classmethod
     def paginate(cls, skip=0, limit=1, *args, **kwargs):
+        """
+        Builds the page structure for the provided filter, to be used
+        in the rendering of the pagination of a listing.
+
+        In the keyset mode (enabled by default when an after cursor is
+        provided) the page query itself is performed, resuming right
+        after the entity of the cursor instead of skipping entities,
+        the resulting items are set in the page together with the
+        (opaque) cursor for the next page, running the count of the
+        total number of entities concurrently (when supported).
+
+        The total number of entities is estimated from the collection
+        metadata when there's no filter, the count of filtered queries
+        may be cached for a short period of time (opt-in), avoiding a
+        complete count per page at the cost of (possibly) stale totals.
+
+        :type skip: int
+        :param skip: The number of entities to skip, only used for the
+        positional values of the page in the keyset mode.
+        :type limit: int
+        :param limit: The maximum number of entities per page.
+        :type after: String
+        :param after: The opaque cursor of the last entity of the
+        previous page (as returned in the page), for keyset mode.
+        :type keyset: bool
+        :param keyset: If the keyset mode should be used.
+        :type sort: List
+        :param sort: The sort to be used in the keyset page query.
+        :type count_ttl: int
+        :param count_ttl: The time to live (in seconds) of the cached
+        total number of entities for filtered queries, if not set the
+        count is only cached under the query cache of the model.
+        :rtype: Dictionary
+        :return: The page structure for the current page.
+        """
+
+        after = kwargs.pop("after", None)
+        keyset = kwargs.pop("keyset", not after == None)
+        count_ttl = kwargs.pop("count_ttl", None)
+        concurrent = kwargs.pop("concurrent", True)
+        sort = kwargs.pop("sort", None)
+
+        def _total():
+            return cls.count(*args, estimate=True, ttl=count_ttl, **kwargs)
+
+        # in case the keyset mode is enabled runs the page query (with
+        # one extra entity to determine if there's a next page) and the
+        # count operation at the same time (if concurrency is supported)
+        items, after_n, total = None, None, None
+        if keyset:
+            sort = cls._keyset_s(sort)
+            thread = None
+            if concurrent and cls._adapter().concurrent:
+                thread = cls._concurrent(_total)
+            items = cls.find(
+                *args, limit=limit + 1, sort=sort, after=after, **dict(kwargs)
+            )
+            if len(items) > limit:
+                items = items[:limit]
+                after_n = cls._cursor_b(items[-1], sort)
+            total = thread() if thread else None
+
         # counts the total number of references according to the
         # current filter value and then uses this value together
         # with the skip value to calculate both the number of pages
         # available for the current filter and the current page index
         # (note that the index is one index based)
-        total = cls.count(*args, **kwargs)
+        if total == None:
+            total = _total()
         count = total / float(limit)
         count = math.ceil(count)
         count = int(count)
@@ -727,6 +1422,11 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
             query = "&".join(query)
             return "?" + query if query else query
 
+        # in case the keyset mode is used the items of the page and
+        # the cursor to be used for the next page are set in the page
+        if keyset:
+            page.update(items=items, after=after_n)
+
         # updates the current page structure so that the (query) generation
         # method is exposed in order to modify the current query
         page["query"] = generate
@@ -736,6 +1436,251 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
     def delete_c(cls, *args, **kwargs):
         collection = cls._collection()
         collection.remove(kwargs)
+        cls._bump()
+        cls._entity_bump()
+        identity_m = get_identity()
+        if not identity_m == None:
+            identity_m.clear_m(cls)
+
+    @classmethod
+    def save_many(
+        cls,
+        entities,
+        validate=True,
+        verify=True,
+        ordered=True,
+        pre_validate=True,
+        pre_save=True,
+        pre_create=True,
+        pre_update=True,
+        post_validate=True,
+        post_save=True,
+        post_create=True,
+        post_update=True,
+        raise_e=False,
+    ):
+        """
+        Saves the provided sequence of entities using bulk operations
+        on the data source, avoiding the multiple round-trips that
+        would be required for individual save operations.
+
+        The validation and the pre/post event handlers are still run
+        for each of the entities (loading their pending lazy fields as
+        in the save operation), while the counters for increment
+        fields are allocated in a single operation per field.
+
+        In the ordered mode the processing stops at the first error
+        (validation or write) and the remaining entities are skipped,
+        while in the unordered mode every valid entity is written.
+
+        :type entities: List
+        :param entities: The sequence of entities of the current model
+        that are going to be saved (either created or updated).
+        :type ordered: bool
+        :param ordered: If the bulk operation should be ordered, meaning
+        that it should stop processing on the first error.
+        :type raise_e: bool
+        :param raise_e: If a bulk error should be raised in case any
+        of the entities failed to be saved.
+        :rtype: Dictionary
+        :return: The aggregate result of the operation containing the
+        list of saved entities, the list of errors (with the index, the
+        entity and the error for each failure) and the skipped entities.
+        """
+
+        saved = []
+        errors = []
+        valid = []
+
+        # iterates over the complete set of entities to run the validation
+        # and the pre event handlers for each of them, collecting any
+        # error that occurs (stopping at the first one if ordered)
+        for index, entity in enumerate(entities):
+            is_new = entity.is_new()
+            try:
+                if verify:
+                    entity.assert_is_concrete()
+                if validate:
+                    entity.load_lazy()
+                    entity._validate(
+                        pre_validate=pre_validate, post_validate=post_validate
+                    )
+                if pre_save:
+                    entity.pre_save()
+                if pre_create and is_new:
+                    entity.pre_create()
+                if pre_update and not is_new:
+                    entity.pre_update()
+            except exceptions.OperationalError as exception:
+                errors.append(dict(index=index, entity=entity, error=exception))
+                if ordered:
+                    break
+                continue
+            valid.append((index, entity, is_new))
+
+        # allocates the values for the increment fields of the new entities
+        # in a single counter operation per field, entities with an already
+        # defined value only ensure the minimum value of the counter
+        increments = cls.increments()
+        for name in increments:
+            pending = []
+            for _index, entity, is_new in valid:
+                if not is_new:
+                    continue
+                if name in entity.model:
+                    entity.model[name] = cls._ensure_min(name, entity.model[name])
+                else:
+                    pending.append(entity)
+            if not pending:
+                continue
+            last = cls._increment(name, delta=len(pending))
+            first = last - len(pending) + 1
+            for offset, entity in enumerate(pending):
+                entity.model[name] = first + offset
+
+        # builds the sequence of bulk operations (and the associated models)
+        # filtering the model of each entity as done in the save operation,
+        # note that updates without changes are not sent to the data source
+        operations = []
+        positions = []
+        models = []
+        for position, (_index, entity, is_new) in enumerate(valid):
+            model = entity._filter(
+                increment_a=False, immutables_a=not is_new, normalize=True, lazy=False
+            )
+            models.append(model)
+            if is_new:
+                entity._search_u(model, None)
+                entity._embed_u(model, None)
+                operations.append(("insert_one", model))
+            else:
+                update = entity._update_d(model)
+                entity._search_u(model, update)
+                entity._embed_u(model, update)
+                if not update:
+                    continue
+                operations.append(("update_one", {"_id": model["_id"]}, update))
+            positions.append(position)
+
+        # runs the bulk write operation in the data source, using the
+        # simpler insert many operation in case there are only inserts,
+        # and gathers the indexes of the operations that failed
+        failed = dict()
+        store = valid[0][1]._get_store() if valid else cls._collection()
+        try:
+            if not operations:
+                pass
+            elif all(operation[0] == "insert_one" for operation in operations):
+                store.insert_many(
+                    [operation[1] for operation in operations], ordered=ordered
+                )
+            else:
+                store.bulk_write(operations, ordered=ordered)
+        except exceptions.BulkError as exception:
+            for offset, message in exception.errors:
+                failed[positions[offset]] = message
+        finally:
+            cls._bump()
+
+        # determines the position of the first failed write operation, as
+        # in ordered mode no operation after it is going to be performed
+        first_f = min(failed) if failed else None
+
+        # builds the map associating the position of the entities with
+        # the update documents used for them (for snapshot updates)
+        operations_m = dict(
+            (position, operation[2])
+            for position, operation in zip(positions, operations)
+            if operation[0] == "update_one"
+        )
+
+        # iterates over the valid entities to update them according to the
+        # result of the write operation and to run the post event handlers
+        identity_m = get_identity()
+        for position, (index, entity, is_new) in enumerate(valid):
+            if position in failed:
+                error = exceptions.OperationalError(failed[position])
+                errors.append(dict(index=index, entity=entity, error=error))
+                continue
+            if ordered and not first_f == None and position > first_f:
+                continue
+            stale = []
+            if not is_new and position in operations_m:
+                stale = entity._entity_old(operations_m[position])
+            if is_new:
+                entity.apply(models[position], safe_a=False)
+                entity._snapshot_s(cls._snapshot_b(models[position]))
+                cls._entity_set([models[position]])
+            elif entity.is_tracked():
+                entity._snapshot_u(operations_m.get(position, {}))
+            if not is_new:
+                entity._embed_s(operations_m.get(position, None))
+            if not is_new and position in operations_m:
+                entity._entity_drop(stale)
+            if not identity_m == None:
+                identity_m.add(entity, force=True)
+            if post_save:
+                entity.post_save()
+            if post_create and is_new:
+                entity.post_create()
+            if post_update and not is_new:
+                entity.post_update()
+            saved.append(entity)
+
+        # sorts the errors according to the index of the entities and
+        # determines the ones that have been skipped (neither saved nor
+        # failed), relevant for the ordered mode of operation
+        errors.sort(key=lambda error: error["index"])
+        processed = set(id(entity) for entity in saved)
+        processed.update(id(error["entity"]) for error in errors)
+        skipped = [entity for entity in entities if not id(entity) in processed]
+
+        if errors and raise_e:
+            raise exceptions.BulkError(
+                [(error["index"], error["error"]) for error in errors]
+            )
+
+        return dict(saved=saved, errors=errors, skipped=skipped)
+
+    @classmethod
+    def insert_many(cls, entities, *args, **kwargs):
+        return cls.save_many(entities, *args, **kwargs)
+
+    @classmethod
+    def update_c(cls, filter=None, changes=None, **kwargs):
+        """
+        Updates the complete set of entities that match the provided
+        filter (and keyword based filter) using a single update many
+        operation on the data source with the provided changes.
+
+        In case the changes do not contain any update operator they're
+        considered to be a set of values to be set (`$set`).
+
+        :type filter: Dictionary
+        :param filter: The filter that is going to be used to select
+        the entities to be updated.
+        :type changes: Dictionary
+        :param changes: The update document or the map of values to
+        be set in the selected entities.
+        :rtype: int
+        :return: The number of entities matched by the update.
+        """
+
+        filter = dict(filter or {})
+        filter.update(kwargs)
+        changes = changes or {}
+        is_operation = all(name.startswith("$") for name in changes)
+        if not is_operation:
+            changes = {"$set": changes}
+        changes = cls._search_c(changes)
+        collection = cls._collection()
+        result = collection.update_many(filter, changes)
+        cls._bump()
+        cls._entity_bump()
+        identity_m = get_identity()
+        if not identity_m == None:
+            identity_m.clear_m(cls)
+        return result
 
     @classmethod
     def ordered(cls, filter=dict):
@@ -1095,24 +2040,208 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         return definition[name]
 
     @classmethod
-    def register(cls, lazy=False):
-        if lazy:
-            return
-        cls.setup()
+    def schema(cls):
+        """
+        Retrieves the compiled schema of the current class, a read
+        only map associating the name of each field with its immutable
+        descriptor, built once from the definition of the class.
 
-    @classmethod
-    def unregister(cls, lazy=False):
-        if lazy:
-            return
-        cls.teardown()
+        The descriptors contain the resolved builder (cast) function,
+        the default value factories and the various field flags so that
+        hot paths do not have to resolve them from the definition maps.
 
-    @classmethod
+        :rtype: Dictionary
+        :return: The read only map associating each field name with the
+        descriptor of the field.
+        """
+
+        # in case the schema is already "cached" in the current
+        # class (fast retrieval) returns immediately
+        if "_schema" in cls.__dict__:
+            return cls._schema
+
+        # retrieves the base definition and the ordered list of fields
+        # that is going to be used to determine the index of each field
+        definition = cls.definition()
+        fields = cls.fields()
+
+        # iterates over the complete set of definition names to compile
+        # the descriptor for each of the fields of the model, notice that
+        # the (complete) definition of each field is taken from the extended
+        # definition so that the extra definition overrides are respected
+        schema = dict()
+        for name in definition:
+            _definition = cls.definition_n(name)
+            _type = _definition.get("type", legacy.UNICODE)
+            type_f = _definition.get("type")
+            increment = _definition.get("increment", False)
+
+            # builds the default value factory for the fill operation of
+            # the field, taking into account a possible initial value for
+            # it, notice that the identifier and the increment fields are
+            # never filled (no fill default factory)
+            if name == "_id" or increment:
+                fill_d = None
+            elif "initial" in _definition:
+                initial = _definition["initial"]
+                fill_d = lambda initial=initial: initial
+            else:
+                fill_d = _default_f(type_f)
+
+            schema[name] = Descriptor(
+                name=name,
+                index=fields.index(name) if name in fields else len(fields),
+                type=_type,
+                builder=BUILDERS.get(_type, _type),
+                exact=_type in CAST_EXACT,
+                cast_d=_default_f(_type),
+                fill_d=fill_d,
+                private=_definition.get("private", False),
+                safe=_definition.get("safe", False),
+                immutable=_definition.get("immutable", False),
+                increment=increment,
+                eager=_definition.get("eager", False),
+            )
+
+        # "freezes" the schema (when possible) so that it's read only
+        # and saves it under the class returning it to the caller
+        if hasattr(types, "MappingProxyType"):
+            schema = types.MappingProxyType(schema)
+        cls._schema = schema
+        return schema
+
+    @classmethod
+    def descriptors(cls):
+        # in case the descriptors are already "cached" in the current
+        # class (fast retrieval) returns immediately
+        if "_descriptors" in cls.__dict__:
+            return cls._descriptors
+
+        # retrieves the descriptors from the schema sorting them by the
+        # index of the field (definition order) and then saves them
+        schema = cls.schema()
+        descriptors = sorted(
+            schema.values(), key=lambda descriptor: (descriptor.index, descriptor.name)
+        )
+        cls._descriptors = tuple(descriptors)
+        return cls._descriptors
+
+    @classmethod
+    def _serializer(cls, evaluator="json_v"):
+        """
+        Retrieves the compiled serializers for the current class and
+        the provided evaluator, a map associating each field name with
+        the function that serializes (evaluates) its values.
+
+        The serializers are generated once per class and evaluator from
+        the types of the fields, avoiding the generic (reflection based)
+        evaluation for the most common cases (simple values and values
+        of the exact type of the field).
+
+        :type evaluator: String
+        :param evaluator: The name of the method to be used in the
+        evaluation of the values (eg: `json_v`, `map_v`).
+        :rtype: Dictionary
+        :return: The map associating the field names with the functions
+        that receive the instance and the value and serialize it.
+        """
+
+        # in case the serializers for the evaluator are already "cached"
+        # in the current class (fast retrieval) returns immediately
+        name = "_serializers_%s" % evaluator
+        if name in cls.__dict__:
+            return cls.__dict__[name]
+
+        # builds the serializer for each of the fields of the class
+        # and then stores the map in the class (cache)
+        serializers = dict(
+            (descriptor.name, cls._serializer_b(descriptor, evaluator))
+            for descriptor in cls.descriptors()
+        )
+        setattr(cls, name, serializers)
+        return serializers
+
+    @classmethod
+    def _serializer_b(cls, descriptor, evaluator):
+        # retrieves the evaluator method from the type of the field, that
+        # may be used directly for values of the exact type of the field
+        name = descriptor.name
+        _type = descriptor.type
+        is_class = isinstance(_type, type)
+        method = getattr(_type, evaluator, None) if evaluator and is_class else None
+
+        def serializer(instance, value):
+            _value_t = type(value)
+            if _value_t in SERIAL_EXACT:
+                return value
+            if _value_t == list:
+                return [serializer(instance, item) for item in value]
+            if method and _value_t == _type:
+                return method(value, resolve=False)
+            return instance._evaluate(name, value, evaluator=evaluator)
+
+        return serializer
+
+    @classmethod
+    def _extras_b(cls):
+        """
+        Binds the extra methods to the current class, so that they're
+        available to every instance of it without having to bind them
+        per instance (only binds the ones that are not yet bound).
+        """
+
+        extra_methods = cls._extra_methods
+        if cls.__dict__.get("_extras_n", 0) == len(extra_methods):
+            return
+        for name, method in extra_methods:
+            setattr(cls, name, method)
+        cls._extras_n = len(extra_methods)
+
+    @classmethod
+    def compile(cls):
+        """
+        Compiles (warms up) the complete set of cached structures of
+        the current class, so that the cost of building them is paid
+        at load time instead of on the first request.
+        """
+
+        cls.schema()
+        cls.descriptors()
+        cls.definition_extended()
+        cls.fields()
+        cls.methods()
+        cls.increments()
+        cls.indexes()
+        cls.safes()
+        cls.immutables()
+        cls.eagers()
+        cls.identities()
+        cls.default()
+        cls._hydrator()
+        cls._serializer("json_v")
+        cls._serializer("map_v")
+
+    @classmethod
+    def register(cls, lazy=False):
+        if lazy:
+            return
+        cls.setup()
+
+    @classmethod
+    def unregister(cls, lazy=False):
+        if lazy:
+            return
+        cls.teardown()
+
+    @classmethod
     def setup(cls):
+        cls.compile()
         cls._build_indexes()
+        cls._register_embeds()
 
     @classmethod
     def teardown(cls):
-        pass
+        cls._unregister_embeds()
 
     @classmethod
     def validate(cls):
@@ -1158,6 +2287,35 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
     def list_names(cls):
         return cls.show_names()
 
+    @classmethod
+    def view_names(cls, view, eager=None):
+        """
+        Retrieves the names of the fields that are required by the view
+        with the provided name, derived from the `<view>_names()` method
+        of the model plus the roots of the eager paths.
+
+        :type view: String
+        :param view: The name of the view (eg: list, show).
+        :type eager: List
+        :param eager: The eager paths that should also be covered.
+        :rtype: List
+        :return: The names of the fields required by the view.
+        """
+
+        util.verify(view in VIEWS, message="Invalid view '%s'" % view)
+
+        method = getattr(cls, view + "_names")
+        names = ["_id"] + list(method())
+
+        default = cls.default()
+        if default:
+            names.append(default)
+
+        paths = list(eager or []) + list(cls.eagers())
+        names.extend(path.split(".", 1)[0] for path in paths)
+
+        return list(collections.OrderedDict((name, True) for name in names))
+
     @classmethod
     def extra_names(cls):
         return []
@@ -1193,16 +2351,17 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
 
     @classmethod
     def types(cls, model):
-        definition = cls.definition()
+        schema = cls.schema()
 
         for name, value in legacy.eager(model.items()):
             if name == "_id":
                 continue
             if value == None:
                 continue
-            if not name in definition:
+            descriptor = schema.get(name, None)
+            if descriptor == None:
                 continue
-            model[name] = cls.cast(name, value)
+            model[name] = cls._cast(descriptor, value)
 
         return model
 
@@ -1225,47 +2384,35 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         """
 
         model = model or dict()
-        definition = cls.definition()
-        for name, _definition in definition.items():
-            if name in model:
+        for descriptor in cls.descriptors():
+            if descriptor.fill_d == None:
                 continue
-            if name in ("_id",):
-                continue
-            private = _definition.get("private", False)
-            increment = _definition.get("increment", False)
-            if private and safe:
+            if descriptor.name in model:
                 continue
-            if increment:
+            if descriptor.private and safe:
                 continue
-            if "initial" in _definition:
-                initial = _definition["initial"]
-                model[name] = initial
-            else:
-                _type = _definition.get("type")
-                default = type_d(_type, None)
-                default = _type._default() if hasattr(_type, "_default") else default
-                model[name] = default
+            model[descriptor.name] = descriptor.fill_d()
 
         return model
 
     @classmethod
     def cast(cls, name, value, safe=True):
-        definition = cls.definition()
-        if not name in definition:
+        descriptor = cls.schema().get(name, None)
+        if descriptor == None:
             return value
+        return cls._cast(descriptor, value, safe=safe)
+
+    @classmethod
+    def _cast(cls, descriptor, value, safe=True):
         if value == None:
             return value
-        _definition = cls.definition_n(name)
-        _type = _definition.get("type", legacy.UNICODE)
-        builder = BUILDERS.get(_type, _type)
+        builder = descriptor.builder
         try:
             return builder(value) if builder else value
         except Exception:
             if not safe:
                 raise
-            default = type_d(_type, None)
-            default = _type._default() if hasattr(_type, "_default") else default
-            return default
+            return descriptor.cast_d()
 
     @classmethod
     def to_description(cls, name):
@@ -1437,6 +2584,202 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         cls._indexes = indexes
         return indexes
 
+    @classmethod
+    def index_specs(cls):
+        """
+        Retrieves the complete sequence of index specifications for
+        the model, including both the field level indexes (single field
+        ones) and the model level ones (`model_indexes`).
+
+        A field level index with the default direction creates a single
+        ascending index, as it may be traversed in both directions.
+
+        :rtype: List
+        :return: The sequence of index specifications (keys and options)
+        for the model, unique by index name.
+        """
+
+        if "_index_specs" in cls.__dict__:
+            return cls._index_specs
+
+        # creates the ordered map that will hold the various index
+        # specifications indexed by name, so that repeated declarations
+        # (eg: field and model level) result in a single index
+        specs = collections.OrderedDict()
+
+        # iterates over the field level indexes creating a single field
+        # index for each of the directions of the field
+        for name, direction in cls.indexes():
+            for _direction in cls._index_directions(direction):
+                spec = index((name, _direction))
+                specs[spec["options"]["name"]] = spec
+
+        # adds the index required by the search strategy of the model
+        # (if any) so that the searches may be served by an index
+        spec = cls._search_index()
+        if spec:
+            specs[spec["options"]["name"]] = spec
+
+        # adds the model level indexes (compound, partial, unique, etc.)
+        # to the specifications, overriding the field level ones
+        for spec in cls.model_indexes:
+            specs[spec["options"]["name"]] = spec
+
+        # saves the index specifications under the class and then
+        # returns the sequence to the caller method
+        cls._index_specs = list(specs.values())
+        return cls._index_specs
+
+    @classmethod
+    def index_fingerprint(cls):
+        """
+        Computes the fingerprint (digest) of the index specifications
+        of the model, which changes whenever an index declaration of
+        the model is added, removed or changed.
+
+        :rtype: String
+        :return: The hexadecimal digest of the index specifications.
+        """
+
+        specs = cls.index_specs()
+        specs_s = json.dumps([cls._name(), specs], sort_keys=True, default=str)
+        specs_s = legacy.bytes(specs_s, encoding="utf-8", force=True)
+        return hashlib.sha1(specs_s).hexdigest()
+
+    @classmethod
+    def declare_indexes(cls):
+        """
+        Declares the indexes specified for the model to the profiler
+        (index advisor) without issuing any index command, so that
+        the recorded queries may be checked against them.
+        """
+
+        collection = cls._collection()
+        for spec in cls.index_specs():
+            collection.declare(spec["keys"])
+
+    @classmethod
+    def sync_indexes(cls, drop=False):
+        """
+        Syncs the indexes of the model with the ones currently present
+        in the data source, diffing the index specifications against
+        the index information so that only the new or changed indexes
+        are created and the stale ones reported (or dropped).
+
+        The errors resulting from a concurrent sync of the indexes (eg:
+        by another worker) as index not found or already exists are
+        tolerated, as the resulting state is the expected one.
+
+        :type drop: bool
+        :param drop: If the indexes present in the data source that are
+        not declared in the model (stale) should be dropped, this should
+        be an explicit option as the indexes may be shared by models.
+        :rtype: Dictionary
+        :return: The map with the names of the indexes that have been
+        created and dropped during the sync and of the stale indexes
+        that have been kept (not dropped).
+        """
+
+        collection = cls._collection()
+        information = collection.index_information()
+        specs = cls.index_specs()
+
+        # determines the names of the indexes present in the data source
+        # that match one of the specifications (by name or definition),
+        # and the specifications that still have to be created
+        kept, pending = set(["_id_"]), []
+        for spec in specs:
+            collection.declare(spec["keys"])
+            name = spec["options"]["name"]
+            current = information.get(name, None)
+            if current and cls._index_equal(spec, current):
+                kept.add(name)
+                continue
+            equal = [
+                _name
+                for _name, _current in legacy.iteritems(information)
+                if cls._index_equal(spec, _current)
+            ]
+            if equal:
+                kept.add(equal[0])
+                continue
+            pending.append(spec)
+
+        # drops the indexes that are not going to be kept, meaning that
+        # they're either stale (not declared) or changed (re-created)
+        names = set(spec["options"]["name"] for spec in pending)
+        dropped = [
+            name for name in information if not name in kept and (drop or name in names)
+        ]
+        stale = [
+            name for name in information if not name in kept and not name in dropped
+        ]
+        for name in dropped:
+            cls._index_run(collection.drop_index, name)
+
+        # creates the indexes that are new or that have changed, from
+        # their complete specification (keys and options)
+        created = []
+        for spec in pending:
+            cls._index_run(
+                collection.create_index, spec["keys"], **dict(spec["options"])
+            )
+            created.append(spec["options"]["name"])
+
+        return dict(created=created, dropped=sorted(dropped), stale=sorted(stale))
+
+    @classmethod
+    def redundant_indexes(cls, information=None):
+        """
+        Reports the indexes of the model that are redundant, meaning
+        that their keys are a prefix of the keys of another index (in
+        the same or in the reverse direction) so that they could be
+        dropped without any query benefit loss.
+
+        Indexes with options (unique, sparse, partial or TTL) are never
+        considered redundant as these options carry semantics.
+
+        :type information: Dictionary
+        :param information: The index information map to be used in the
+        analysis, if not provided the one of the data source is used.
+        :rtype: List
+        :return: The sequence of maps describing each redundant index
+        and the index that covers it.
+        """
+
+        if information == None:
+            collection = cls._collection()
+            information = collection.index_information()
+
+        redundant = []
+
+        # sorts the indexes by the number of keys (larger first) so that
+        # the index reported as covering is the most complete one
+        items = sorted(
+            legacy.iteritems(information),
+            key=lambda item: (-len(item[1].get("key", [])), item[0]),
+        )
+
+        for name, current in items:
+            if name == "_id_" or cls._index_options(current):
+                continue
+            keys = [tuple(key) for key in current.get("key", [])]
+            for _name, _current in items:
+                if _name == name or cls._index_partial(_current):
+                    continue
+                _keys = [tuple(key) for key in _current.get("key", [])]
+                if len(keys) > len(_keys):
+                    continue
+                if len(keys) == len(_keys) and name < _name:
+                    continue
+                if not cls._index_prefix(keys, _keys):
+                    continue
+                redundant.append(dict(name=name, keys=keys, covered_by=_name))
+                break
+
+        redundant.sort(key=lambda item: item["name"])
+        return redundant
+
     @classmethod
     def safes(cls):
         # in case the safes are already "cached" in the current
@@ -1525,6 +2868,95 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         cls._eagers = eagers
         return eagers
 
+    @classmethod
+    def lazies(cls):
+        # in case the lazies are already "cached" in the current
+        # class (fast retrieval) returns immediately
+        if "_lazies" in cls.__dict__:
+            return cls._lazies
+
+        # creates the list that will hold the various names that are
+        # meant to be deferred (lazy) on retrieval, only loaded from
+        # the data source on their first access
+        lazies = []
+
+        # retrieves the map containing the definition of the class with
+        # the name of the fields associated with their definition
+        definition = cls.definition()
+
+        # iterate over all the names in the definition to retrieve their
+        # definition and check if their are of type lazy
+        for name in definition:
+            _definition = cls.definition_n(name)
+            is_lazy = _definition.get("lazy", False)
+            if not is_lazy:
+                continue
+            lazies.append(name)
+
+        # saves the lazies list under the class and then
+        # returns the sequence to the caller method
+        cls._lazies = lazies
+        return lazies
+
+    @classmethod
+    def embeds(cls):
+        # in case the embeds are already "cached" in the current
+        # class (fast retrieval) returns immediately
+        if "_embeds" in cls.__dict__:
+            return cls._embeds
+
+        # creates the list that will hold the various names of the
+        # reference fields that embed (snapshot) fields of their target
+        embeds = []
+
+        # retrieves the map containing the definition of the class with
+        # the name of the fields associated with their definition
+        definition = cls.definition()
+
+        # iterate over all the names in the definition to retrieve their
+        # definition and check if their type embeds any field
+        for name in definition:
+            _definition = cls.definition_n(name)
+            _type = _definition.get("type", None)
+            is_reference = isinstance(_type, type) and issubclass(
+                _type, typesf.Reference
+            )
+            if not is_reference or not _type._embed:
+                continue
+            embeds.append(name)
+
+        # saves the embeds list under the class and then
+        # returns the sequence to the caller method
+        cls._embeds = embeds
+        return embeds
+
+    @classmethod
+    def identities(cls):
+        # in case the identities are already "cached" in the current
+        # class (fast retrieval) returns immediately
+        if "_identities" in cls.__dict__:
+            return cls._identities
+
+        # creates the list that will hold the various names that are
+        # meant to uniquely identify an entity of the model, these are
+        # the names that may be used as keys for the identity map
+        identities = ["_id"]
+
+        # extends the identities list with the names that are considered
+        # to be unique by definition (default, increments and unique names)
+        # avoiding any duplicated name in the sequence
+        default = cls.default()
+        names = ([default] if default else []) + cls.increments() + cls.unique_names()
+        for name in names:
+            if name in identities:
+                continue
+            identities.append(name)
+
+        # saves the identities list under the class and then
+        # returns the sequence to the caller method
+        cls._identities = identities
+        return identities
+
     @classmethod
     def default(cls):
         # in case the default are already "cached" in the current
@@ -1693,9 +3125,9 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
             model[key + "_meta"] = value
 
     @classmethod
-    def _sniff(cls, fields, rules=False):
+    def _sniff(cls, fields, rules=False, lazy=()):
         fields = fields or cls.fields()
-        fields = list(fields)
+        fields = [field for field in fields if not field in lazy]
         if not rules:
             return fields
         for field in list(fields):
@@ -1715,6 +3147,83 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
                 break
         return definition.get("meta", base)
 
+    @classmethod
+    def _projection(
+        cls, fields=None, rules=True, map=False, lazy=True, view=None, eager=None
+    ):
+        """
+        Builds the projection (sequence of fields) for a retrieval and
+        the sequence of the fields that are deferred (excluded from the
+        projection) and that are loaded on first access (for instances).
+
+        :type fields: List
+        :param fields: The explicit fields of the retrieval, if set no
+        field is deferred (the projection is the one provided).
+        :type rules: bool
+        :param rules: If the private fields should be excluded.
+        :type map: bool
+        :param map: If the retrieval is a map (not instance) based one.
+        :type lazy: bool
+        :param lazy: If the lazy fields of the model should be deferred.
+        :type view: String
+        :param view: The name of the view (eg: list, show) from which the
+        projection is going to be derived.
+        :type eager: List
+        :param eager: The eager paths of the retrieval, that are always
+        part of the projection of a view.
+        :rtype: Tuple
+        :return: The projection and the sequence of deferred fields.
+        """
+
+        deferred = []
+
+        # the deferred (lazy) fields are only excluded from the default
+        # projection of instance based retrievals, as only instances are
+        # able to load them on first (attribute) access
+        if not fields and lazy and not map:
+            deferred.extend(cls.lazies())
+
+        # in case a view is requested the fields that are not part of the
+        # view are deferred as well (loaded on access for instances)
+        if not fields and view:
+            names = cls.view_names(view, eager=eager)
+            for name in cls.fields():
+                if name in names or name in deferred:
+                    continue
+                deferred.append(name)
+
+        deferred = tuple(deferred)
+        fields = cls._sniff(fields, rules=rules, lazy=deferred)
+
+        # the snapshots of the embedded fields are retrieved together
+        # with the references that use them (avoiding their resolution)
+        embeds = cls.embeds()
+        if embeds and any(name in fields for name in embeds):
+            fields.append(EMBED_FIELD)
+
+        return fields, deferred
+
+    @classmethod
+    def _register_embeds(cls):
+        # registers the current model (and its reference fields) as an
+        # embedder of the target models, so that the changes in them
+        # are fanned out to the snapshots of the current model
+        for name in cls.embeds():
+            _type = cls.definition_n(name)["type"]
+            embedders = EMBEDS.setdefault(_type._target_n(), [])
+            if (cls, name) in embedders:
+                continue
+            embedders.append((cls, name))
+
+    @classmethod
+    def _unregister_embeds(cls):
+        for name in cls.embeds():
+            _type = cls.definition_n(name)["type"]
+            embedders = EMBEDS.get(_type._target_n(), [])
+            if not (cls, name) in embedders:
+                continue
+            embedders.remove((cls, name))
+
     @classmethod
     def _adapter(cls):
         return common.base().get_adapter()
@@ -1771,9 +3280,14 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         Should be able to handle both instance and map associated eager
         loading relations.
 
+        The resolution is performed in batches, meaning that for each
+        level of each name path the complete set of references in the
+        provided models is gathered and resolved using a single query
+        per target model (instead of one query per reference).
+
         :type model: Dictionary
         :param model: The model map to be used as reference for the eager
-        loading of relations.
+        loading of relations, may also be a sequence of model maps.
         :type names: List
         :param names: The list of dot separated name paths to "guide" the
         loading of relations (references).
@@ -1781,33 +3295,111 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         :return: The resulting model with the required relations loaded.
         """
 
-        # verifies if the provided model instance is a sequence and if
-        # that's the case runs the recursive eager loading of names and
-        # returns the resulting sequence to the caller method
+        # normalizes the provided model value into a sequence so that
+        # the batch resolution logic may be used for both single model
+        # and multiple model (sequence) based eager loading
         is_list = isinstance(model, (list, tuple))
-        if is_list:
-            return [cls._eager(_model, names, *args, **kwargs) for _model in model]
+        models = model if is_list else [model]
 
         # iterates over the complete set of names that are meant to be
-        # eager loaded from the model and runs the "resolution" process
-        # for each of them so that they are properly eager loaded
+        # eager loaded from the models and runs the "resolution" process
+        # level by level so that each level is resolved in a batch
         for name in names:
-            _model = model
+            _models = models
             for part in name.split("."):
-                is_sequence = isinstance(_model, (list, tuple))
-                if is_sequence:
-                    _model = [
-                        cls._res(value, part, *args, **kwargs) for value in _model
-                    ]
-                else:
-                    _model = cls._res(_model, part, *args, **kwargs)
-                if not _model:
+                _models = cls._res_many(_models, part, *args, **kwargs)
+                if not _models:
                     break
 
         # returns the resulting model to the caller method, most of the
         # times this model should have not been touched
         return model
 
+    @classmethod
+    def _res_many(cls, models, part, *args, **kwargs):
+        """
+        Resolves a specific part for the complete set of provided models
+        gathering all of the references to be resolved and resolving them
+        in batch (one query per target model).
+
+        The map based resolution strategy is respected, meaning that the
+        owner models will have their references replaced by the resolved
+        maps in case the map keyword argument is set.
+
+        :type models: List
+        :param models: The sequence of models (maps or instances) that
+        are going to have the requested part resolved.
+        :type part: String
+        :param part: The name of the models' part to be resolved.
+        :rtype: List
+        :return: The flat sequence of resolved values for the part, that
+        should be used as the models for the next resolution level.
+        """
+
+        # gathers the values for the requested part together with the
+        # references contained in them (grouped by their target model)
+        values, references = cls._res_gather(models, part)
+
+        # runs the batch based resolution for each of the reference
+        # types, this is considered to be an expensive operation but
+        # much less expensive than the per reference resolution
+        for reference_c, _references in legacy.items(references):
+            reference_c.resolve_many(_references, eager_l=True, *args, **kwargs)
+
+        # builds the sequence of resolved values from the gathered values
+        # that should be used as the models for the next level
+        return cls._res_values(values, part, *args, **kwargs)
+
+    @classmethod
+    def _res_values(cls, values, part, *args, **kwargs):
+        # iterates over the complete set of values to build the sequence
+        # of resolved values (to be used in the next level), note that the
+        # resolution of references at this stage should be a cache hit
+        resolved = []
+        for model, value in values:
+            is_reference = isinstance(value, TYPE_REFERENCES)
+            if is_reference:
+                value = value.resolve(eager_l=True, *args, **kwargs)
+            if kwargs.get("map", False):
+                model[part] = value
+            if isinstance(value, (list, tuple)):
+                resolved.extend(value)
+            else:
+                resolved.append(value)
+
+        # returns the "final" sequence of (possibly resolved) values to the
+        # caller method ready to be used for the next level of resolution
+        return resolved
+
+    @classmethod
+    def _res_gather(cls, models, part):
+        # gathers the complete set of values for the requested part
+        # together with the references contained in them, grouping
+        # these references by their concrete type (target model)
+        values = []
+        references = {}
+        for model in models:
+            if not model:
+                continue
+            if not part in model:
+                continue
+            value = model[part]
+            is_reference = isinstance(value, TYPE_REFERENCES)
+            if not value and not is_reference:
+                continue
+            values.append((model, value))
+            if isinstance(value, typesf.Reference):
+                _references = [value]
+            elif isinstance(value, typesf.References):
+                _references = value.objects
+            else:
+                continue
+            for reference in _references:
+                sequence = references.setdefault(reference.__class__, [])
+                sequence.append(reference)
+
+        return values, references
+
     @classmethod
     def _res(cls, model, part, *args, **kwargs):
         """
@@ -1956,60 +3548,154 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         del kwargs["find_s"]
 
         # retrieves the "name" of the attribute that is considered
-        # to be the default (representation) for the model in case
-        # there's none returns immediately, as it's not possible
-        # to proceed with the filter creation
-        default = find_n or cls.default()
+        # to be the default (representation) for the model, or the
+        # search one, in case there's none returns immediately, as
+        # it's not possible to proceed with the filter creation
+        default = find_n or cls.search_name or cls.default()
         if not default:
             return
 
+        # retrieves the (compiled) builder for the find string template
+        # and uses it to build the find value from the find string, note
+        # that the name of the filter depends on the search strategy
+        mode = cls._search_mode(default)
+        builder = cls._find_b(("s", default, find_t, find_i, mode), cls._find_sb)
+        name, find_v = builder(find_s)
+
+        # in case there's a valid find value to be used sets
+        # the value in the named arguments map to be used by
+        # the underlying find infra-structure, note that the
+        # set is done using a "merge" with the previous values
+        if not find_v == None:
+            cls.filter_merge(name, find_v, kwargs)
+
+    @classmethod
+    def _find_b(cls, key, factory):
+        """
+        Retrieves the compiled builder for the find expression with
+        the provided key (template), creating it with the provided
+        factory in case it's not present in the (bounded) cache.
+
+        :type key: Tuple
+        :param key: The key of the template of the find expression,
+        excluding the value (that is substituted by the builder).
+        :type factory: Function
+        :param factory: The function that creates the builder for
+        the expression, receiving the key components as arguments.
+        :rtype: Function
+        :return: The builder function that receives the (string)
+        value and returns the find value for the expression.
+        """
+
+        _key = (cls,) + key
+        builder = FIND_CACHE.get(_key, None)
+        if builder == None:
+            builder = factory(*key[1:])
+            FIND_CACHE[_key] = builder
+        return builder
+
+    @classmethod
+    def _find_sb(cls, default, find_t, find_i, mode="regex"):
         # constructs the proper right and left parts of the regex
         # that is going to be constructed for the matching of the
-        # value, this is achieved by checking the find type
-        right = "^" if find_t == "right" else ""
-        left = "$" if find_t == "left" else ""
+        # value, this is achieved by checking the find type, note
+        # that the prefix strategy always anchors the regex so that
+        # it may be served by an index
+        right = "^" if find_t == "right" or mode == "prefix" else ""
+        left = "$" if find_t == "left" and not mode == "prefix" else ""
+        options = "i" if find_i else ""
 
         # retrieves the definition for the default attribute and uses
         # it to retrieve it's target data type, defaulting to the
         # string type in case none is defined in the schema
         definition = cls.definition_n(default)
         default_t = definition.get("type", legacy.UNICODE)
+        is_string = default_t in legacy.STRINGS
 
-        try:
-            # in case the target date type for the default field is
-            # string the both sides wildcard regex is used for the
-            # search otherwise the search value to be used is the
-            # exact match of the value (required type conversion)
-            if default_t in legacy.STRINGS:
-                find_v = {
-                    "$regex": right + re.escape(find_s) + left,
-                    "$options": "i" if find_i else "",
-                }
-            else:
-                find_v = default_t(find_s)
-        except Exception:
-            # in case there's an error in the conversion for
-            # the target type value sets the search value as
-            # invalid (not going to be used in filter)
-            find_v = None
+        def builder(find_s):
+            try:
+                # in case the search strategy is based on an index (text
+                # or n-grams) the filter targets that index instead
+                if is_string and mode == "text":
+                    return "$text", {"$search": find_s}
+                if is_string and mode == "ngram":
+                    terms = cls._search_t(find_s, prefix=True)
+                    return SEARCH_FIELD, ({"$all": terms} if terms else None)
+
+                # in case the target date type for the default field is
+                # string the both sides wildcard regex is used for the
+                # search otherwise the search value to be used is the
+                # exact match of the value (required type conversion)
+                if is_string:
+                    return default, {
+                        "$regex": right + re.escape(find_s) + left,
+                        "$options": options,
+                    }
+                return default, default_t(find_s)
+            except Exception:
+                # in case there's an error in the conversion for
+                # the target type value sets the search value as
+                # invalid (not going to be used in filter)
+                return default, None
 
-        # in case there's a valid find value to be used sets
-        # the value in the named arguments map to be used by
-        # the underlying find infra-structure, note that the
-        # set is done using a "merge" with the previous values
-        if not find_v == None:
-            cls.filter_merge(default, find_v, kwargs)
+        return builder
 
     @classmethod
-    def _find_d(cls, kwargs):
-        # in case the find definition is currently not defined in the
-        # named arguments map returns immediately as nothing is
-        # meant to be done on this method
-        if not "find_d" in kwargs:
-            return
-
-        # tries to retrieve the value of the operator that is going
-        # to be used to "join" the multiple find parts (find values)
+    def _find_db(cls, name, operator):
+        # retrieves the definition for the filter attribute and uses
+        # it to retrieve it's target data type that is going to be
+        # used for the proper conversion, note that in case the base
+        # type resolution method exists it's used (recursive resolution)
+        definition = cls.definition_n(name)
+        name_t = definition.get("type", legacy.UNICODE)
+        if hasattr(name_t, "_btype"):
+            name_t = name_t._btype()
+        if name in ("_id",):
+            name_t = lambda value: cls._adapter().object_id(value)
+
+        # determines if the current filter operation should be performed
+        # using a case insensitive based approach to the search, by default
+        # all of the operations are considered to be case sensitive
+        insensitive = INSENSITIVE.get(operator, False)
+
+        # retrieves the method that is going to be used for value mapping
+        # or conversion based on the current operator and then converts
+        # the operator into the domain specific operator
+        value_method = VALUE_METHODS.get(operator, None)
+        operator = OPERATORS.get(operator, operator)
+
+        def builder(value):
+            # in case there's a custom value mapped retrieved uses it to convert
+            # the string based value into the target specific value for the query
+            # otherwise uses the data type for the search field for value conversion
+            if value_method:
+                value = value_method(value, name_t)
+            else:
+                try:
+                    value = name_t(value)
+                except ValueError:
+                    value = None
+
+            # constructs the custom find value using a key and value map value
+            # in case the operator is defined otherwise (operator not defined)
+            # the value is used directly
+            find_v = {operator: value} if operator else value
+            if insensitive:
+                find_v["$options"] = "i"
+            return find_v
+
+        return builder
+
+    @classmethod
+    def _find_d(cls, kwargs):
+        # in case the find definition is currently not defined in the
+        # named arguments map returns immediately as nothing is
+        # meant to be done on this method
+        if not "find_d" in kwargs:
+            return
+
+        # tries to retrieve the value of the operator that is going
+        # to be used to "join" the multiple find parts (find values)
         find_o = kwargs.pop("find_o", None)
 
         # retrieves the find definition into a local variable, then
@@ -2042,48 +3728,421 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
                 result.append(None)
             name, operator, value = result
 
-            # retrieves the definition for the filter attribute and uses
-            # it to retrieve it's target data type that is going to be
-            # used for the proper conversion, note that in case the base
-            # type resolution method exists it's used (recursive resolution)
-            definition = cls.definition_n(name)
-            name_t = definition.get("type", legacy.UNICODE)
-            if hasattr(name_t, "_btype"):
-                name_t = name_t._btype()
-            if name in ("_id",):
-                name_t = cls._adapter().object_id
-
-            # determines if the current filter operation should be performed
-            # using a case insensitive based approach to the search, by default
-            # all of the operations are considered to be case sensitive
-            insensitive = INSENSITIVE.get(operator, False)
-
-            # retrieves the method that is going to be used for value mapping
-            # or conversion based on the current operator and then converts
-            # the operator into the domain specific operator
-            value_method = VALUE_METHODS.get(operator, None)
-            operator = OPERATORS.get(operator, operator)
-
-            # in case there's a custom value mapped retrieved uses it to convert
-            # the string based value into the target specific value for the query
-            # otherwise uses the data type for the search field for value conversion
-            if value_method:
-                value = value_method(value, name_t)
-            else:
-                try:
-                    value = name_t(value)
-                except ValueError:
-                    value = None
+            # in case the filter is a like filter on the search field
+            # of a model with an indexed search strategy the search
+            # builder is used instead (transparent index usage), note
+            # that the case insensitive strategies (text and n-gram)
+            # are only used for the case insensitive like operator
+            mode = cls._search_mode(name)
+            find_i = INSENSITIVE.get(operator, False)
+            is_indexed = mode == "prefix" or (find_i and not mode == "regex")
+            if operator in SEARCH_OPERATORS and is_indexed:
+                key = ("s", name, "both", find_i, mode)
+                builder = cls._find_b(key, cls._find_sb)
+                _name, find_v = builder(value or "")
+                if not find_v == None:
+                    cls.filter_merge(_name, find_v, kwargs, operator=find_o)
+                continue
 
-            # constructs the custom find value using a key and value map value
-            # in case the operator is defined otherwise (operator not defined)
-            # the value is used directly, then merges this find value into the
-            # current set of filters for the provided (keyword) arguments
-            find_v = {operator: value} if operator else value
-            if insensitive:
-                find_v["$options"] = "i"
+            # retrieves the (compiled) builder for the name and operator
+            # template of the filter and uses it to build the find value,
+            # then merges this find value into the current set of filters
+            # for the provided (keyword) arguments
+            builder = cls._find_b(("d", name, operator), cls._find_db)
+            find_v = builder(value)
             cls.filter_merge(name, find_v, kwargs, operator=find_o)
 
+    @classmethod
+    def _search_mode(cls, name):
+        # the search strategy of the model only applies to its search
+        # field, any other field is searched using the regex strategy
+        search_name = cls.search_name or cls.default()
+        if not name == search_name:
+            return "regex"
+        return cls.search_mode
+
+    @classmethod
+    def _search_index(cls):
+        search_name = cls.search_name or cls.default()
+        if not search_name:
+            return None
+        if cls.search_mode == "prefix":
+            return index((search_name, 1))
+        if cls.search_mode == "text":
+            return index((search_name, "text"))
+        if cls.search_mode == "ngram":
+            return index((SEARCH_FIELD, 1))
+        return None
+
+    @classmethod
+    def rebuild_search(cls, missing=False):
+        """
+        Rebuilds (backfills) the search n-grams field of the entities
+        of the model from the value of their search field, required for
+        the entities stored before the n-gram strategy was enabled.
+
+        :type missing: bool
+        :param missing: If only the entities without the search n-grams
+        field should be rebuilt (eg: for an incremental backfill).
+        :rtype: int
+        :return: The number of entities whose n-grams were rebuilt.
+        """
+
+        search_name = cls.search_name or cls.default()
+        if not cls.search_mode == "ngram" or not search_name:
+            return 0
+
+        filter = {SEARCH_FIELD: {"$exists": False}} if missing else {}
+        collection = cls._collection()
+        count = 0
+        for model in collection.find(filter, [search_name]):
+            tokens = cls._search_t(model.get(search_name, None))
+            collection.update({"_id": model["_id"]}, {"$set": {SEARCH_FIELD: tokens}})
+            count += 1
+
+        cls._bump()
+        cls._entity_bump()
+        return count
+
+    @classmethod
+    def _search_c(cls, changes):
+        # adds the maintenance of the search (n-gram) field to the provided
+        # update document in case it sets (or unsets) the search field
+        if not cls.search_mode == "ngram":
+            return changes
+        search_name = cls.search_name or cls.default()
+        sets = changes.get("$set", {})
+        unsets = changes.get("$unset", {})
+        if not search_name in sets and not search_name in unsets:
+            return changes
+        changes = dict(changes)
+        changes["$set"] = dict(sets)
+        changes["$set"][SEARCH_FIELD] = cls._search_t(sets.get(search_name, None))
+        return changes
+
+    @classmethod
+    def _search_t(cls, value, prefix=False):
+        """
+        Generates the (edge) n-grams for the words of the provided
+        value, these are the prefixes (lower cased) of each word with
+        a size within the search sizes range.
+
+        :type value: String
+        :param value: The value to generate the n-grams for.
+        :type prefix: bool
+        :param prefix: If only the largest n-gram of each word should
+        be returned (as used for querying).
+        :rtype: List
+        :return: The sequence of unique n-grams for the value.
+        """
+
+        minimum, maximum = SEARCH_SIZES
+        value = legacy.UNICODE(value or "").lower()
+        words = [word for word in re.split(r"\W+", value, flags=re.UNICODE) if word]
+        tokens = []
+        for word in words:
+            sizes = [min(len(word), maximum)] if prefix else []
+            sizes = sizes or range(minimum, min(len(word), maximum) + 1)
+            for size in sizes:
+                token = word[:size]
+                if token in tokens:
+                    continue
+                tokens.append(token)
+        return tokens
+
+    @classmethod
+    def _hydrator(cls):
+        """
+        Retrieves the compiled hydrator structures for the current
+        class, built once from the schema and then re-used for
+        every hydration (retrieval) of entities of the class.
+
+        The hydrator is composed by a map associating each field name
+        with its cast tuple and by a sequence of default tuples that
+        are used to fill the fields missing from the model.
+
+        :rtype: Tuple
+        :return: The casters map and the defaults sequence, to be
+        used in the single pass hydration of models.
+        """
+
+        # in case the hydrator is already "cached" in the current
+        # class (fast retrieval) returns immediately
+        if "_hydrator_c" in cls.__dict__:
+            return cls._hydrator_c
+
+        # creates both the map of casters and the sequence of defaults
+        # from the descriptors of the fields, notice that the identifier
+        # is neither casted nor filled and that the increment fields are
+        # never filled (populated by the increment operation on save)
+        casters = dict()
+        defaults = []
+        for descriptor in cls.descriptors():
+            if descriptor.name == "_id":
+                continue
+            casters[descriptor.name] = (
+                descriptor.type,
+                descriptor.builder,
+                descriptor.exact,
+                descriptor.cast_d,
+            )
+            if descriptor.fill_d == None:
+                continue
+            defaults.append((descriptor.name, descriptor.private, descriptor.fill_d))
+
+        # saves the hydrator under the class and then returns
+        # the structures to the caller method
+        cls._hydrator_c = (casters, defaults)
+        return cls._hydrator_c
+
+    @classmethod
+    def _hydrate(cls, model, fill=True, safe=False, lazy=(), cast=True):
+        """
+        Runs the single pass hydration of the provided model map,
+        casting its values and filling the missing ones with defaults,
+        equivalent to calling both `types()` and `fill()`.
+
+        :type model: Dictionary
+        :param model: The model map that is going to be hydrated.
+        :type fill: bool
+        :param fill: If the missing values should be filled with
+        the default values for their fields.
+        :type safe: bool
+        :param safe: If the safe mode should be used for the fill
+        operation, meaning that private fields are not filled.
+        :type lazy: Tuple
+        :param lazy: The names of the deferred (lazy) fields, that
+        are not filled as they're loaded on first access.
+        :type cast: bool
+        :param cast: If the values of the model should be casted, if
+        not set only the missing values are filled (already casted).
+        :rtype: Dictionary
+        :return: The same model map, now hydrated.
+        """
+
+        casters, defaults = cls._hydrator()
+
+        for name, value in legacy.eager(model.items()) if cast else ():
+            caster = casters.get(name, None)
+            if caster == None:
+                continue
+            if value == None:
+                continue
+            _type, builder, exact, default = caster
+            if exact and type(value) is _type:
+                continue
+            if not builder:
+                continue
+            try:
+                model[name] = builder(value)
+            except Exception:
+                model[name] = default()
+
+        if fill:
+            for name, private, default in defaults:
+                if name in model:
+                    continue
+                if private and safe:
+                    continue
+                if name in lazy:
+                    continue
+                model[name] = default()
+
+        embedded = model.get(EMBED_FIELD, None) if cast else None
+        if embedded:
+            for name in cls.embeds():
+                value = model.get(name, None)
+                if not isinstance(value, typesf.Reference):
+                    continue
+                if not name in embedded:
+                    continue
+                value.__dict__["_embedded"] = embedded[name]
+
+        return model
+
+    @classmethod
+    def _hydrate_many(
+        cls,
+        models,
+        eager=None,
+        map=False,
+        rules=True,
+        meta=False,
+        build=True,
+        fill=True,
+        resolve_a=False,
+        identity_m=None,
+        lazy=(),
+    ):
+        """
+        Hydrates the provided sequence of raw models (as retrieved
+        from the data source) into entities (or maps), running the
+        build, eager loading and resolution steps over the sequence.
+
+        :type models: List
+        :param models: The sequence of raw models to be hydrated.
+        :rtype: List
+        :return: The list of hydrated entities (or maps).
+        """
+
+        models, stored = cls._hydrate_p(
+            models, map=map, rules=rules, meta=meta, build=build, fill=fill, lazy=lazy
+        )
+        if eager:
+            models = cls._eager(models, eager, map=map)
+        return cls._hydrate_f(
+            models,
+            stored,
+            map=map,
+            resolve_a=resolve_a,
+            identity_m=identity_m,
+            lazy=lazy,
+        )
+
+    @classmethod
+    def _hydrate_p(
+        cls, models, map=False, rules=True, meta=False, build=True, fill=True, lazy=()
+    ):
+        # takes the snapshots of the stored values (for instance based
+        # retrieval) and then hydrates and builds the complete set of
+        # models, the first step of the hydration (before eager loading)
+        stored = None if map else [cls._snapshot_b(model) for model in models]
+        models = [
+            cls._hydrate(model, fill=fill, safe=rules, lazy=lazy) for model in models
+        ]
+        if build:
+            [cls.build(model, map=map, rules=rules, meta=meta) for model in models]
+        return models, stored
+
+    @classmethod
+    def _hydrate_f(
+        cls, models, stored, map=False, resolve_a=False, identity_m=None, lazy=()
+    ):
+        # resolves the references of the models (if requested) and then
+        # creates the instances for them registering them in the identity
+        # map, the final step of the hydration (after eager loading)
+        if resolve_a:
+            models = [cls._resolve_all(model, resolve=False) for model in models]
+        models = (
+            models
+            if map
+            else [
+                cls._instance(model, cast=resolve_a, stored=_stored, lazy=lazy)
+                for model, _stored in zip(models, stored)
+            ]
+        )
+        if lazy and not map:
+            LazyLoader.attach(cls, models, lazy)
+        if not identity_m == None:
+            for model in models:
+                identity_m.add(model)
+        return models
+
+    @classmethod
+    def _instance(cls, model, cast=False, stored=None, lazy=()):
+        """
+        Creates a new (old) instance of the model from the provided
+        hydrated model map, avoiding the multiple fill and cast
+        operations of the `old()` based creation of instances.
+
+        :type model: Dictionary
+        :param model: The hydrated model map to be used as the
+        underlying model of the instance.
+        :type cast: bool
+        :param cast: If the values of the model should be casted
+        again (required in case they've been resolved).
+        :type stored: Dictionary
+        :param stored: The snapshot of the values as stored in the
+        data source, used for the tracking of the changed fields.
+        :type lazy: Tuple
+        :param lazy: The names of the deferred (lazy) fields, that
+        are not going to be filled with their default values.
+        :rtype: Model
+        :return: The newly created instance for the model.
+        """
+
+        # the model has already been hydrated (casted) so only the
+        # remaining default values (eg: private fields) are filled
+        cls._hydrate(model, fill=True, safe=False, lazy=lazy, cast=False)
+        if cast:
+            cls.types(model)
+
+        # creates the instance running the pre apply handlers before
+        # the values are set (as done by the apply operation), the values
+        # set by the handlers are kept unless they're in the model
+        instance = cls(fill=False)
+        instance.pre_apply()
+        for name, value in legacy.iteritems(instance.model):
+            if name in model:
+                continue
+            model[name] = value
+        instance.__dict__["model"] = model
+        if not stored == None:
+            instance._snapshot_s(stored)
+        instance.post_apply()
+        return instance
+
+    @classmethod
+    def _snapshot_b(cls, model):
+        """
+        Creates a snapshot of the provided model as stored in the
+        data source, copying the mutable values (deep copy) so that
+        any further in-place change to them is detected.
+
+        :type model: Dictionary
+        :param model: The model map (as stored) to create the snapshot.
+        :rtype: Dictionary
+        :return: The snapshot of the provided model map, or an invalid
+        value in case the changes of the model are not being tracked.
+        """
+
+        if not cls.track_changes:
+            return None
+        return dict((name, _snapshot_v(value)) for name, value in model.items())
+
+    @classmethod
+    def _identity_safe(
+        cls, fields=None, map=False, rules=True, meta=False, build=True, fill=True
+    ):
+        """
+        Determines if the retrieval described by the provided parameters
+        results in "complete" entity instances, meaning that they may be
+        safely shared through the identity map.
+
+        :rtype: bool
+        :return: If the identity map may be used for the retrieval.
+        """
+
+        if fields or map or meta:
+            return False
+        if not rules or not build or not fill:
+            return False
+        return True
+
+    @classmethod
+    def _identity_key(cls, kwargs):
+        """
+        Retrieves the identity key (name and value tuple) for the
+        provided filter, this is only possible in case the filter
+        is a simple equality over one of the identity names.
+
+        :type kwargs: Dictionary
+        :param kwargs: The filter (keyword arguments) to be used to
+        obtain the identity key.
+        :rtype: Tuple
+        :return: The name and value tuple of the identity key or an
+        invalid value in case the filter is not a simple one.
+        """
+
+        if not len(kwargs) == 1:
+            return None
+        name, value = legacy.items(kwargs)[0]
+        if not name in cls.identities():
+            return None
+        if isinstance(value, (dict, list, tuple)):
+            return None
+        return (name, value)
+
     @classmethod
     def _bases(cls, subclass=None):
         """
@@ -2126,15 +4185,478 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         return ()
 
     @classmethod
-    def _increment(cls, name):
+    def _increment(cls, name, delta=1):
+        # in case the hi-lo block allocation is enabled for the field
+        # the value is retrieved from the block reserved by the process
+        # avoiding a round-trip to the counters collection per value
+        block = cls._block(name) if delta == 1 else 0
+        if block > 1:
+            return cls._increment_b(name, block)
+
         _name = cls._name() + ":" + name
         store = cls._collection(name="counters")
         value = store.find_and_modify(
-            {"_id": _name}, {"$inc": {"seq": 1}}, new=True, upsert=True
+            {"_id": _name}, {"$inc": {"seq": delta}}, new=True, upsert=True
         )
         value = value or store.find_one({"_id": _name})
         return value["seq"]
 
+    @classmethod
+    def _increment_b(cls, name, block):
+        """
+        Retrieves the next increment value for the field with the
+        provided name using the hi-lo block allocation strategy.
+
+        A block of sequence values is reserved for the current process
+        using a single increment operation on the counters collection
+        and the values are then handed out locally (under a lock).
+
+        The blocks are bound to the process that reserved them so that
+        a forked process never re-uses the block of its parent, note that
+        gaps in the sequence occur for the values that are never used.
+
+        :type name: String
+        :param name: The name of the increment field to retrieve the
+        next value for.
+        :type block: int
+        :param block: The number of values to be reserved at a time
+        for the current process.
+        :rtype: int
+        :return: The next increment value for the field.
+        """
+
+        _name = cls._name() + ":" + name
+        pid = os.getpid()
+        with BLOCKS_LOCK:
+            current = BLOCKS.get(_name, None)
+            is_valid = current and current[0] == pid and current[1] <= current[2]
+            if not is_valid:
+                last = cls._increment(name, delta=block)
+                current = [pid, last - block + 1, last]
+                BLOCKS[_name] = current
+            value = current[1]
+            current[1] += 1
+        return value
+
+    @classmethod
+    def _block(cls, name):
+        definition = cls.definition_n(name)
+        block = definition.get("block", None)
+        if not block == None:
+            return block
+        app = common.base().get_app()
+        return getattr(app, "increment_block", 0) if app else 0
+
+    @classmethod
+    def _concurrent(cls, method):
+        """
+        Runs the provided method in a separate thread, returning a
+        function that waits for the method to finish and returns its
+        result (re-raising any exception raised by the method).
+
+        The number of concurrent threads is bounded, in case the limit
+        has been reached the method is run (inline) when joined.
+
+        The method is run under the app context of the caller, and in
+        case there's no app context available it's run (inline) when
+        joined, as the data layer may depend on the app context.
+
+        :type method: Function
+        :param method: The method to be run concurrently.
+        :rtype: Function
+        :return: The function that joins the thread and returns the
+        result of the method.
+        """
+
+        if not flask.has_app_context():
+            return method
+        if not CONCURRENT.acquire(False):
+            return method
+
+        # retrieves the (concrete) app of the current context so that
+        # a new app context may be pushed in the worker thread
+        app = flask.current_app._get_current_object()
+        result = dict()
+
+        def target():
+            try:
+                with app.app_context():
+                    result["value"] = method()
+            except Exception as exception:
+                result["exception"] = exception
+            finally:
+                CONCURRENT.release()
+
+        def join():
+            thread.join()
+            if "exception" in result:
+                raise result["exception"]
+            return result["value"]
+
+        thread = threading.Thread(target=target)
+        thread.daemon = True
+        thread.start()
+        return join
+
+    @classmethod
+    def _value_p(cls, model, name):
+        # retrieves the (raw) value for the provided dot separated
+        # name path from the model, an invalid value is returned in
+        # case any of the parts of the path is not present
+        value = model
+        for part in name.split("."):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part, None)
+        return value
+
+    @classmethod
+    def _has_id(cls, sort):
+        return any(item[0] == "_id" for item in sort)
+
+    @classmethod
+    def _keyset_s(cls, sort):
+        # normalizes the sort into a list of tuples and complements it
+        # with the `_id` field (tie breaker) using the direction of the
+        # last sort field, so that the order of the entities is total
+        sort = [tuple(item) for item in sort] if sort else []
+        if not cls._has_id(sort):
+            direction = sort[-1][1] if sort else 1
+            sort.append(("_id", direction))
+        return sort
+
+    @classmethod
+    def _cursor_b(cls, item, sort):
+        """
+        Builds the opaque (keyset) cursor for the provided entity (or
+        map) from the values of the fields of the provided sort.
+
+        :type item: Model
+        :param item: The entity (or map) to build the cursor for,
+        typically the last entity of a page.
+        :type sort: List
+        :param sort: The (normalized) sort of the page query.
+        :rtype: String
+        :return: The URL safe cursor that may be used to resume the
+        retrieval right after the provided entity.
+        """
+
+        model = item.model if isinstance(item, Model) else item
+        values = []
+        for name, _direction in sort:
+            value = model.get(name, None)
+            if hasattr(value, "ref_v"):
+                value = value.ref_v()
+            values.append(cls._keyset_e(value))
+        data = json.dumps(values)
+        data = legacy.bytes(data, encoding="utf-8", force=True)
+        data = base64.urlsafe_b64encode(data)
+        return legacy.str(data, encoding="utf-8", force=True)
+
+    @classmethod
+    def _keyset_f(cls, kwargs, sort, after):
+        # decodes the values of the sort fields from the provided cursor
+        # making sure that they match the fields of the current sort
+        try:
+            data = legacy.bytes(after, encoding="utf-8", force=True)
+            data = base64.urlsafe_b64decode(data)
+            values = json.loads(legacy.str(data, encoding="utf-8", force=True))
+        except Exception:
+            values = None
+        util.verify(
+            isinstance(values, list) and len(values) == len(sort),
+            message="Invalid after cursor",
+        )
+        try:
+            values = [
+                cls._keyset_v(name, value)
+                for (name, _direction), value in zip(sort, values)
+            ]
+        except Exception:
+            raise exceptions.AssertionError("Invalid after cursor")
+
+        # builds the keyset filter so that only the entities that are
+        # after the cursor (in the sort order) are matched, one clause
+        # per sort field (equal prefix and strict comparison on it),
+        # taking into account that null values are sorted first so that
+        # in descending order the null values come after any other value
+        clauses = []
+        for index, (name, direction) in enumerate(sort):
+            clause = dict((sort[_index][0], values[_index]) for _index in range(index))
+            value = values[index]
+            if value == None and direction == -1:
+                continue
+            if value == None:
+                clause[name] = {"$ne": None}
+                clauses.append(clause)
+                continue
+            operator = "$lt" if direction == -1 else "$gt"
+            clauses.append(dict(clause, **{name: {operator: value}}))
+            if direction == -1:
+                clauses.append(dict(clause, **{name: None}))
+
+        # merges the keyset filter with the current filter, taking into
+        # account that an or filter may be already defined for it
+        if "$or" in kwargs:
+            kwargs["$and"] = kwargs.get("$and", []) + [{"$or": clauses}]
+        else:
+            kwargs["$or"] = clauses
+
+    @classmethod
+    def _keyset_e(cls, value):
+        # encodes the provided sort value so that it may be stored in the
+        # (JSON based) cursor, the dates are encoded as their components
+        # and the other non JSON values (eg: object ids) as strings that
+        # are then restored (decoded) using the definition of the field
+        if value == None or isinstance(
+            value, (bool, float) + legacy.INTEGERS + legacy.STRINGS
+        ):
+            return value
+        if isinstance(value, datetime.datetime):
+            offset = value.utcoffset()
+            if not offset == None:
+                value = (value - offset).replace(tzinfo=None)
+            return {"$date": list(value.timetuple()[:6]) + [value.microsecond]}
+        return {"$value": legacy.UNICODE(value)}
+
+    @classmethod
+    def _keyset_v(cls, name, value):
+        # decodes the provided (cursor) sort value for the field with the
+        # provided name, restoring the values of the non JSON types
+        if isinstance(value, dict) and "$date" in value:
+            return datetime.datetime(*value["$date"])
+        if isinstance(value, dict) and "$value" in value:
+            value = value["$value"]
+            if name == "_id":
+                return cls._adapter().object_id(value)
+            return cls.cast(name, value, safe=False)
+        if name == "_id" and not value == None:
+            return cls._adapter().object_id(value)
+        return value
+
+    @classmethod
+    def _query_cache(cls, force=False):
+        if not cls.query_cache and not force:
+            return None
+        return common.base().get_query_cache()
+
+    @classmethod
+    def _cached(cls, operation, query, method, cache=True, ttl=None):
+        """
+        Runs the provided (read) method using the query cache of
+        the app in case the caching of queries is enabled for the
+        model, the cached results are served while the collection
+        is not written (version bump) and the entries are valid.
+
+        The results are stored as raw (unhydrated) documents, so
+        that each hit produces a fresh copy of them, empty results
+        (None) are never stored in the cache.
+
+        :type operation: String
+        :param operation: The name of the read operation (eg: find).
+        :type query: Object
+        :param query: The complete set of parameters of the query,
+        used to build the key of the cache entry.
+        :type method: Function
+        :param method: The function that runs the (uncached) query.
+        :type cache: bool
+        :param cache: If the cache may be used for the query, allows
+        a call to bypass the cache (eg: for a fresh read).
+        :type ttl: int
+        :param ttl: The specific time to live (in seconds) for the
+        entry, if set the cache is used even if the caching of queries
+        is not enabled for the model (short lived cache).
+        :rtype: Object
+        :return: The (possibly cached) result of the query.
+        """
+
+        query_cache = cls._query_cache(force=ttl) if cache else None
+        if query_cache == None:
+            return method()
+        if not cls.query_cache:
+            cls._query_forced = True
+        if ttl == None:
+            ttl = cls.query_cache
+            ttl = None if ttl is True else ttl
+        key = query_cache.key(cls._name(), operation, query)
+        result = query_cache.get(key)
+        if not result == None:
+            return result
+        result = method()
+        if not result == None:
+            query_cache.set(key, result, ttl=ttl)
+        return result
+
+    @classmethod
+    def _entity_cache(cls):
+        if not cls.entity_cache:
+            return None
+        return common.base().get_entity_cache()
+
+    @classmethod
+    def _entity_names(cls):
+        # the entities are cached by both their identifier and their
+        # default (key) field, the ones used by the key based retrievals
+        default = cls.default()
+        if not default or default == "_id":
+            return ("_id",)
+        return ("_id", default)
+
+    @classmethod
+    def _entity_key(cls, kwargs, fields=None, skip=0, limit=0, sort=None, cache=True):
+        """
+        Retrieves the entity key (name and values tuple) for the
+        provided filter, this is only possible in case the entity
+        cache is enabled for the model and the filter is a simple
+        equality (or `$in`) over one of its key fields.
+
+        :type kwargs: Dictionary
+        :param kwargs: The filter (keyword arguments) to be used to
+        obtain the entity key.
+        :type fields: List
+        :param fields: The projection of the retrieval, that must
+        only contain top level fields.
+        :rtype: Tuple
+        :return: The name and values tuple of the entity key or an
+        invalid value in case the entity cache can't be used.
+        """
+
+        if not cache or skip or limit or sort:
+            return None
+        if not len(kwargs) == 1:
+            return None
+        if fields and any("." in field for field in fields):
+            return None
+        if cls._entity_cache() == None:
+            return None
+        name, value = legacy.items(kwargs)[0]
+        if not name in cls._entity_names():
+            return None
+        if isinstance(value, dict) and legacy.keys(value) == ["$in"]:
+            value = value["$in"]
+            if not isinstance(value, (list, tuple)):
+                return None
+            return (name, list(value))
+        if isinstance(value, (dict, list, tuple)):
+            return None
+        return (name, [value])
+
+    @classmethod
+    def _entity_get(cls, name, values, fields=None):
+        """
+        Retrieves the raw documents of the entities with the provided
+        values for the key field, reading through the entity cache so
+        that only the missing ones are retrieved from the data source
+        (single query), and then stored in the cache.
+
+        The documents are cached complete (no projection) and the
+        projection is applied to the returned (fresh) copies of them.
+
+        :type name: String
+        :param name: The name of the key field of the entities.
+        :type values: List
+        :param values: The values of the key field of the entities.
+        :type fields: List
+        :param fields: The projection to be applied to the documents.
+        :rtype: List
+        :return: The documents of the entities, in the order of the
+        provided values (the missing entities are skipped).
+        """
+
+        # retrieves the cached documents for the complete set of values
+        # using a single (multiple get) operation over the cache
+        entity_cache = cls._entity_cache()
+        keys = entity_cache.keys(cls._name(), name, values)
+        cached = entity_cache.get_many(keys)
+        models = dict(
+            (key, model) for key, model in zip(keys, cached) if not model == None
+        )
+
+        # retrieves the documents that are missing from the cache from
+        # the data source and stores them in the cache (write through)
+        missing = [value for key, value in zip(keys, values) if not key in models]
+        if missing:
+            collection = cls._collection()
+            retrieved = list(collection.find({name: {"$in": missing}}))
+            cls._entity_set(retrieved, force=False)
+            retrieved_k = entity_cache.keys(
+                cls._name(), name, [model[name] for model in retrieved]
+            )
+            models.update(zip(retrieved_k, retrieved))
+
+        # builds the (ordered) sequence of documents for the values, with
+        # the projection applied, skipping the duplicated values
+        result = []
+        visited = set()
+        for key in keys:
+            if key in visited or not key in models:
+                continue
+            visited.add(key)
+            model = models[key]
+            if fields:
+                model = dict(
+                    (_name, value)
+                    for _name, value in legacy.iteritems(model)
+                    if _name == "_id" or _name in fields
+                )
+            result.append(model)
+        return result
+
+    @classmethod
+    def _entity_set(cls, models, force=True):
+        # stores the (complete) documents in the entity cache under the
+        # complete set of key fields (write through), the documents are
+        # serialized by the cache so further changes are not reflected,
+        # the read through (not forced) skips the present entries as they
+        # may be tombstones of a concurrent write (stale documents)
+        entity_cache = cls._entity_cache()
+        if entity_cache == None or not models:
+            return
+        ttl = cls.entity_cache
+        ttl = None if ttl is True else ttl
+        items = []
+        for name in cls._entity_names():
+            _models = [model for model in models if name in model]
+            keys = entity_cache.keys(
+                cls._name(), name, [model[name] for model in _models]
+            )
+            items.extend(zip(keys, _models))
+        entity_cache.set_many(items, ttl=ttl, force=force)
+
+    @classmethod
+    def _entity_delete(cls, models):
+        # removes the entries of the entities from the entity cache, used
+        # for the writes for which the complete document is unknown
+        entity_cache = cls._entity_cache()
+        if entity_cache == None or not models:
+            return
+        keys = []
+        for name in cls._entity_names():
+            values = [model[name] for model in models if not model.get(name) == None]
+            keys.extend(entity_cache.keys(cls._name(), name, values))
+        entity_cache.delete_many(keys)
+
+    @classmethod
+    def _entity_bump(cls):
+        # invalidates the complete set of cached entities of the model
+        # by bumping its version, used for the bulk writes (unknown entities)
+        entity_cache = cls._entity_cache()
+        if entity_cache == None:
+            return
+        entity_cache.bump(cls._name())
+
+    @classmethod
+    def _bump(cls):
+        # invalidates the complete set of cached queries for the
+        # collection of the model by bumping its version, this
+        # should be called after any write to the collection, notice
+        # that the collections with (forced) short lived entries (eg: the
+        # cached counts of the pages) are also bumped
+        query_cache = cls._query_cache(force="_query_forced" in cls.__dict__)
+        if query_cache == None:
+            return
+        query_cache.bump(cls._name())
+
     @classmethod
     def _ensure_min(cls, name, value):
         _name = cls._name() + ":" + name
@@ -2143,14 +4665,81 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
             {"_id": _name}, {"$max": {"seq": value}}, new=True, upsert=True
         )
         value = value or store.find_one({"_id": _name})
+
+        # discards any block reserved by the current process for the
+        # counter as the values in it may now collide with the value
+        # that has just been (explicitly) set for the counter
+        with BLOCKS_LOCK:
+            BLOCKS.pop(_name, None)
+
         return value["seq"]
 
     @classmethod
     def _build_indexes(cls):
-        indexes = cls.indexes()
-        collection = cls._collection()
-        for index, direction in indexes:
-            collection.ensure_index(index, direction=direction)
+        # in case the index building is currently deferred the model
+        # is added to the pending sequence (to be built in batch)
+        pending = getattr(INDEXES, "pending", None)
+        if not pending == None:
+            pending.append(cls)
+            return None
+        return cls.sync_indexes()
+
+    @classmethod
+    def _index_run(cls, method, *args, **kwargs):
+        # runs the provided index command tolerating the errors that
+        # result from a concurrent sync of the indexes, identified by
+        # either their code or their message (non mongo adapters)
+        try:
+            return method(*args, **kwargs)
+        except Exception as exception:
+            code = getattr(exception, "code", None)
+            message = legacy.UNICODE(exception).lower()
+            if code in INDEX_CODES:
+                return None
+            if "not found" in message or "already exists" in message:
+                return None
+            raise
+
+    @classmethod
+    def _index_directions(cls, direction):
+        if direction in (True, "default", "simple"):
+            return (1,)
+        if direction == "all":
+            return (1, -1, "hashed")
+        if isinstance(direction, (list, tuple)):
+            return tuple(direction)
+        return (direction,)
+
+    @classmethod
+    def _index_equal(cls, spec, current):
+        keys = [tuple(key) for key in current.get("key", [])]
+        if not keys == [tuple(key) for key in spec["keys"]]:
+            return False
+        return cls._index_options(current) == cls._index_options(spec["options"])
+
+    @classmethod
+    def _index_options(cls, options):
+        _options = dict()
+        for name in INDEX_OPTIONS:
+            value = options.get(name, None)
+            if value == None or value is False:
+                continue
+            _options[name] = value
+        return _options
+
+    @classmethod
+    def _index_partial(cls, current):
+        return current.get("sparse", False) or "partialFilterExpression" in current
+
+    @classmethod
+    def _index_prefix(cls, keys, _keys):
+        prefix = _keys[: len(keys)]
+        if prefix == keys:
+            return True
+        if not all(isinstance(direction, (int, float)) for _key, direction in keys):
+            return False
+        reverse = [(key, direction * -1) for key, direction in keys]
+        return prefix == reverse
 
     @classmethod
     def _destroy_indexes(cls):
@@ -2254,6 +4843,9 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         return self.model.get(name, default)
 
     def json_v(self, *args, **kwargs):
+        lazy = kwargs.get("lazy", True)
+        if lazy:
+            self.load_lazy()
         return self.model
 
     def map_v(self, *args, **kwargs):
@@ -2371,11 +4963,66 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
 
         cls = self.__class__
         method = getattr(cls, "validate_" + name)
+        if not "_extras" in self.__dict__:
+            self.__dict__["_extras"] = []
         self._extras.append(method)
 
     def is_new(self):
         return not "_id" in self.model
 
+    def is_tracked(self):
+        """
+        Determines if the changes of the current entity are being
+        tracked, meaning that there's a snapshot of the values as
+        stored in the data source (from retrieval or save).
+
+        :rtype: bool
+        :return: If the changes of the entity are being tracked.
+        """
+
+        return not self._snapshot == None
+
+    def is_dirty(self, immutables_a=True):
+        """
+        Determines if the current entity has changed since the last
+        retrieval or save operation, in case the changes are not being
+        tracked the entity is always considered to be dirty.
+
+        :type immutables_a: bool
+        :param immutables_a: If the immutable fields should be ignored
+        in the determination of the changes (as in updates).
+        :rtype: bool
+        :return: If the entity has changed since it was last retrieved
+        from (or saved into) the data source.
+        """
+
+        if self.is_new():
+            return True
+        if not self.is_tracked():
+            return True
+        model = self._filter(
+            increment_a=False, immutables_a=immutables_a, normalize=True, lazy=False
+        )
+        update = self._update_d(model, immutables_a=immutables_a)
+        return True if update else False
+
+    def load_lazy(self, names=None):
+        """
+        Loads the deferred (lazy) fields of the current entity that are
+        still pending, in batch for the complete set of entities that
+        were retrieved together with the current one.
+
+        :type names: List
+        :param names: The names of the deferred fields to be loaded,
+        if not provided all the pending ones are loaded.
+        """
+
+        lazy = self.__dict__.get("_lazy", None)
+        if not lazy:
+            return
+        names = list(lazy.names) if names == None else names
+        lazy.load_many(self, names)
+
     def assert_is_new(self):
         """
         Ensures that the current model instance is a new one meaning
@@ -2423,6 +5070,94 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         before_callbacks=[],
         after_callbacks=[],
     ):
+        # prepares the current instance for the save operation (validation,
+        # event handlers, filtering, etc.) retrieving the model to be stored
+        # and the update document to be used (in case it's an update)
+        model, is_new, update = self._save_p(
+            validate=validate,
+            verify=verify,
+            is_new=is_new,
+            increment_a=increment_a,
+            immutables_a=immutables_a,
+            pre_validate=pre_validate,
+            pre_save=pre_save,
+            pre_create=pre_create,
+            pre_update=pre_update,
+            post_validate=post_validate,
+            before_callbacks=before_callbacks,
+        )
+
+        # retrieves the reference to the store object to be used and
+        # uses it to store the current model data
+        store = self._get_store()
+        if is_new:
+            store.insert(model)
+        elif update:
+            store.update({"_id": model["_id"]}, update)
+            self._embed_s(update)
+
+        # finishes the save operation updating the instance according to
+        # the stored values and running the post event handlers
+        return self._save_f(
+            model,
+            is_new,
+            update,
+            post_save=post_save,
+            post_create=post_create,
+            post_update=post_update,
+            after_callbacks=after_callbacks,
+        )
+
+    def delete(
+        self,
+        verify=True,
+        pre_delete=True,
+        post_delete=True,
+        before_callbacks=[],
+        after_callbacks=[],
+    ):
+        # prepares the current instance for the delete operation, running
+        # the pre event handlers and the before callbacks
+        self._delete_p(
+            verify=verify, pre_delete=pre_delete, before_callbacks=before_callbacks
+        )
+
+        # retrieves the reference to the store object to be able to
+        # execute the removal command for the current model
+        store = self._get_store()
+        store.remove({"_id": self._id})
+
+        # finishes the delete operation, running the after callbacks
+        # and the post event handlers
+        self._delete_f(post_delete=post_delete, after_callbacks=after_callbacks)
+
+    def _save_p(
+        self,
+        validate=True,
+        verify=True,
+        is_new=None,
+        increment_a=None,
+        immutables_a=None,
+        pre_validate=True,
+        pre_save=True,
+        pre_create=True,
+        pre_update=True,
+        post_validate=True,
+        before_callbacks=[],
+    ):
+        """
+        Prepares the current instance for a save operation, running
+        the validation and the pre event handlers and building both
+        the model to be stored and the update document (for updates).
+
+        This is the first (storage agnostic) part of the save process
+        shared by both the sync and the async save operations.
+
+        :rtype: Tuple
+        :return: The model to be stored, if the save is a creation and
+        the update document to be used (only for updates).
+        """
+
         # ensures that the current instance is associated with
         # a concrete model, ready to be persisted in database
         if verify:
@@ -2438,6 +5173,31 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         if immutables_a == None:
             immutables_a = not is_new
 
+        # in case this is an update of an entity with tracked changes and
+        # there are no changes in it, there's no need to validate it again
+        # as the values have not changed since the last retrieval/save,
+        # the filtered model and update document of the check are kept
+        # so that they may be re-used (avoiding a second filter pass)
+        model, update = None, None
+        if validate and not is_new and self.is_tracked():
+            model = self._filter(
+                increment_a=False,
+                immutables_a=immutables_a,
+                normalize=True,
+                lazy=False,
+            )
+            update = self._update_d(model, immutables_a=immutables_a)
+            validate = True if update else False
+
+        # the validation may depend on any of the fields of the entity so
+        # the deferred (lazy) fields that are still pending are loaded,
+        # note that loading them invalidates the model of the changes check
+        if validate:
+            size = len(self.model)
+            self.load_lazy()
+            if not len(self.model) == size:
+                model = None
+
         # runs the validation process in the current model, this
         # should ensure that the model is ready to be saved in the
         # data source, without corruption of it, only run this process
@@ -2461,29 +5221,100 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         # returned value is normalized meaning that for instance if
         # any relation is loaded the reference value is returned instead
         # of the loaded relation values (required for persistence)
-        model = self._filter(
-            increment_a=increment_a, immutables_a=immutables_a, normalize=True
-        )
+        # note that the model of the changes check is re-used in case
+        # no event handler has been able to change the entity since then
+        handlers = []
+        if validate and pre_validate:
+            handlers.append("pre_validate")
+        if validate and post_validate:
+            handlers.append("post_validate")
+        if pre_save:
+            handlers.append("pre_save")
+        if pre_update and not is_new:
+            handlers.append("pre_update")
+        reuse = not model == None and not increment_a
+        if not reuse or self._is_handled(handlers):
+            model = self._filter(
+                increment_a=increment_a,
+                immutables_a=immutables_a,
+                normalize=True,
+                lazy=False,
+            )
+            update = None
 
-        # in case the current model is not new must create a new
-        # model instance and remove the main identifier from it
-        if not is_new:
-            _model = copy.copy(model)
-            del _model["_id"]
+        # in case the current model is not new must build the update
+        # document for it, that contains only the changed values in case
+        # the changes are being tracked for the entity (partial update)
+        if not is_new and update == None:
+            update = self._update_d(model, immutables_a=immutables_a)
+
+        # maintains the search (n-gram) field of the model from the value
+        # of the search field, in case it's required by the search strategy
+        # and the snapshots of the embedded fields of the references
+        self._search_u(model, update)
+        self._embed_u(model, update)
+
+        # calls the complete set of callbacks that should be called
+        # before the concrete data store save operation
+        for callback in before_callbacks:
+            callback(self, model)
+
+        return model, is_new, update
+
+    def _save_f(
+        self,
+        model,
+        is_new,
+        update,
+        post_save=True,
+        post_create=True,
+        post_update=True,
+        after_callbacks=[],
+    ):
+        """
+        Finishes a save operation, after the model has been stored,
+        updating the instance (and its snapshot) with the stored values
+        and running the post event handlers.
+
+        :type model: Dictionary
+        :param model: The model that has been stored.
+        :type is_new: bool
+        :param is_new: If the save operation was a creation.
+        :type update: Dictionary
+        :param update: The update document that has been used.
+        :rtype: Model
+        :return: The current instance (for chaining operations).
+        """
 
-        # calls the complete set of callbacks that should be called
-        # before the concrete data store save operation
-        for callback in before_callbacks:
-            callback(self, model)
+        # gathers the previous (stored) values of the key fields changed
+        # by the update, before the snapshot is updated, as their entries
+        # in the entity cache become stale
+        stale = self._entity_old(update) if update and not is_new else []
 
-        # retrieves the reference to the store object to be used and
-        # uses it to store the current model data
-        store = self._get_store()
+        # updates the instance according to the operation that has been
+        # performed in the data source, so that the snapshot of the stored
+        # values remains consistent with the data source
         if is_new:
-            store.insert(model)
             self.apply(model, safe_a=False)
-        else:
-            store.update({"_id": model["_id"]}, {"$set": _model})
+            self._snapshot_s(self.__class__._snapshot_b(model))
+        elif update:
+            self._snapshot_u(update)
+        if is_new or update:
+            self.__class__._bump()
+
+        # writes the stored document through the entity cache (creation)
+        # or removes the stale entries (update), as the complete document
+        # is not known for partial updates
+        if is_new:
+            self.__class__._entity_set([model])
+        elif update:
+            self._entity_drop(stale)
+
+        # updates the identity map (if any) so that the current instance
+        # becomes the one associated with the entity keys (write through)
+        identity_m = get_identity()
+        if not identity_m == None:
+            identity_m.add(self, force=True)
 
         # calls the complete set of callbacks that should be called
         # after the concrete data store save operation
@@ -2503,14 +5334,7 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         # operation, this may be used for chaining operations
         return self
 
-    def delete(
-        self,
-        verify=True,
-        pre_delete=True,
-        post_delete=True,
-        before_callbacks=[],
-        after_callbacks=[],
-    ):
+    def _delete_p(self, verify=True, pre_delete=True, before_callbacks=[]):
         # ensures that the current instance is associated with
         # a concrete model, ready to be persisted in database
         if verify:
@@ -2526,10 +5350,18 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         for callback in before_callbacks:
             callback(self)
 
-        # retrieves the reference to the store object to be able to
-        # execute the removal command for the current model
-        store = self._get_store()
-        store.remove({"_id": self._id})
+    def _delete_f(self, post_delete=True, after_callbacks=[]):
+        # invalidates the cached queries for the class of the instance
+        # as the underlying collection has been changed, removing the
+        # entity from the entity cache as well
+        self.__class__._bump()
+        self.__class__._entity_delete([self.model])
+
+        # removes the current instance from the identity map (if any)
+        # so that it's no longer returned by any further retrieval
+        identity_m = get_identity()
+        if not identity_m == None:
+            identity_m.remove(self)
 
         # calls the underlying delete handler that may be used to extend
         # the default delete functionality
@@ -2564,32 +5396,188 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         return self
 
     def advance(self, name, delta=1):
+        return self.inc(name, delta=delta)
+
+    def atomic(self, changes):
+        """
+        Runs an atomic update operation on the data source for the
+        current entity using the provided changes (update document)
+        and updates the affected fields of the entity with the values
+        that result from the operation (no read-modify-write cycle).
+
+        :type changes: Dictionary
+        :param changes: The update document (eg: `{"$inc": {"age": 1}}`)
+        to be atomically applied to the entity in the data source.
+        :rtype: Dictionary
+        :return: The resulting document (as stored) after the atomic
+        operation has been applied to the entity.
+        """
+
+        # ensures that the current instance is associated with
+        # a persisted entity, as that's required for atomic operations
+        if self.is_new():
+            raise exceptions.OperationalError("Can't update a new model entity")
+
+        # runs the atomic update operation in the data source retrieving
+        # the resulting document for the entity in the same round-trip
         store = self._get_store()
+        stale = self._entity_old(changes, current=True)
         value = store.find_and_modify(
-            {"_id": self._id}, {"$inc": {name: delta}}, new=True
+            {"_id": self._id}, self.__class__._search_c(changes), new=True
         )
         value = value or store.find_one({"_id": self._id})
-        _value = value[name]
-        setattr(self, name, _value)
-        return _value
+        self.__class__._bump()
+        self._entity_drop(stale, current=False)
+        self.__class__._entity_set([value] if value else [])
+
+        # gathers the (top level) names of the fields affected by the
+        # operation and updates them in the entity with the casted values
+        # and in the snapshot of the stored values (for changes tracking)
+        cls = self.__class__
+        names = set()
+        for fields in changes.values():
+            names.update(name.split(".", 1)[0] for name in fields)
+        sets, unsets = dict(), dict()
+        for name in names:
+            if name in value:
+                self.model[name] = cls.cast(name, value[name])
+                sets[name] = value[name]
+            else:
+                self.model.pop(name, None)
+                unsets[name] = ""
+        if self.is_tracked():
+            self._snapshot_u({"$set": sets, "$unset": unsets})
+
+        # updates the identity map (if any) so that the current instance
+        # is the one associated with the entity keys (write through)
+        identity_m = get_identity()
+        if not identity_m == None:
+            identity_m.add(self, force=True)
+
+        return value
+
+    def inc(self, name, delta=1):
+        value = self.atomic({"$inc": {name: delta}})
+        return value[name]
+
+    def push(self, name, value):
+        self.atomic({"$push": {name: value}})
+        return self.model[name]
+
+    def pull(self, name, value):
+        self.atomic({"$pull": {name: value}})
+        return self.model[name]
+
+    def add_to_set(self, name, value):
+        self.atomic({"$addToSet": {name: value}})
+        return self.model[name]
+
+    def set_value(self, name, value):
+        self.atomic({"$set": {name: value}})
+        return self.model[name]
 
     def reload(self, *args, **kwargs):
         is_new = self.is_new()
         if is_new:
             exceptions.OperationalError("Can't reload a new model entity")
         cls = self.__class__
-        return cls.get(_id=self._id, *args, **kwargs)
+        kwargs["identity"] = False
+        kwargs["cache"] = False
+        entity = cls.get(_id=self._id, *args, **kwargs)
+        identity_m = get_identity()
+        if not identity_m == None and isinstance(entity, Model):
+            identity_m.add(entity, force=True)
+        return entity
 
     def exists(self):
         is_new = self.is_new()
         if is_new:
             return False
-        entity = self.get(_id=self._id, raise_e=False)
-        return True if entity else False
+        cls = self.__class__
+        return cls.exists_c(_id=self._id)
+
+    @classmethod
+    def map_many(
+        cls,
+        models,
+        increment_a=False,
+        resolve=False,
+        all=False,
+        evaluator="map_v",
+        lazy=True,
+    ):
+        """
+        Serializes the provided sequence of entities into maps (the
+        same as calling `map()` on each of them) in a single pass, with
+        the compiled serializers retrieved once per class.
+
+        :type models: List
+        :param models: The sequence of entities to be serialized.
+        :type evaluator: String
+        :param evaluator: The name of the method to be used in the
+        evaluation (serialization) of the values (eg: `json_v`).
+        :type lazy: bool
+        :param lazy: If the deferred (lazy) fields that are still pending
+        should be loaded (in batch) before the serialization, if unset
+        they are excluded from the resulting maps.
+        :rtype: List
+        :return: The list of maps resulting from the serialization.
+        """
+
+        # in case any of the "complex" options is requested the generic
+        # (per entity) serialization process is used instead
+        if increment_a or resolve or all:
+            return [
+                model.map(
+                    increment_a=increment_a,
+                    resolve=resolve,
+                    all=all,
+                    evaluator=evaluator,
+                    lazy=lazy,
+                )
+                for model in models
+            ]
+
+        # loads the pending deferred fields of the entities, as the loader
+        # is shared by the entities retrieved together only the first load
+        # (for each group) triggers a query to the data source
+        if lazy:
+            for model in models:
+                model.load_lazy()
+
+        # iterates over the complete set of entities serializing their
+        # values using the compiled serializers for their class
+        result = []
+        serializers_m = dict()
+        for model in models:
+            _cls = model.__class__
+            serializers = serializers_m.get(_cls, None)
+            if serializers == None:
+                serializers = _cls._serializer(evaluator)
+                serializers_m[_cls] = serializers
+            _model = dict()
+            for name, value in legacy.iteritems(model.model):
+                serializer = serializers.get(name, None)
+                if serializer == None:
+                    continue
+                _model[name] = serializer(model, value)
+            result.append(_model)
+        return result
 
-    def map(self, increment_a=False, resolve=False, all=False, evaluator="map_v"):
+    def map(
+        self,
+        increment_a=False,
+        resolve=False,
+        all=False,
+        evaluator="map_v",
+        lazy=True,
+    ):
         model = self._filter(
-            increment_a=increment_a, resolve=resolve, all=all, evaluator=evaluator
+            increment_a=increment_a,
+            resolve=resolve,
+            all=all,
+            evaluator=evaluator,
+            lazy=lazy,
         )
         return model
 
@@ -2644,6 +5632,299 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
     def _get_store(self):
         return self.__class__._collection()
 
+    def _update_d(self, model, immutables_a=True):
+        """
+        Builds the update document for the provided (filtered) model
+        taking into account the snapshot of the stored values, so that
+        only the changed fields are set and the removed ones unset.
+
+        In case the changes are not being tracked for the entity the
+        update document sets the complete set of values of the model.
+
+        :type model: Dictionary
+        :param model: The filtered model for the entity to build the
+        update document from.
+        :type immutables_a: bool
+        :param immutables_a: If the immutable fields are being ignored
+        (not to be unset) for the current update operation.
+        :rtype: Dictionary
+        :return: The update document, or an invalid value in case
+        there's nothing to be changed in the data source.
+        """
+
+        # in case there's no snapshot of the stored values, the
+        # complete model (except identifier) is set (as before)
+        if self._snapshot == None:
+            _model = copy.copy(model)
+            del _model["_id"]
+            return {"$set": _model}
+
+        cls = self.__class__
+        definition = cls.definition()
+        immutables = cls.immutables()
+        stored, filled = self._snapshot
+
+        # iterates over the complete set of values in the model to
+        # determine the ones that have changed, note that the values
+        # that have been filled on retrieval are only considered to be
+        # changed in case they've been replaced or mutated
+        sets = dict()
+        for name, value in legacy.iteritems(model):
+            if name == "_id":
+                continue
+            if name in stored:
+                if stored[name] == value:
+                    continue
+            elif name in filled:
+                _value, _copy = filled[name]
+                current = self.model.get(name, None)
+                if current is _value and (_copy == None or current == _copy):
+                    continue
+            sets[name] = value
+
+        # determines the fields that have been removed from the model,
+        # (present in the stored values but not in the model)
+        unsets = dict()
+        for name in stored:
+            if name == "_id":
+                continue
+            if name in model:
+                continue
+            if not name in definition:
+                continue
+            if immutables_a and name in immutables:
+                continue
+            unsets[name] = ""
+
+        update = dict()
+        if sets:
+            update["$set"] = sets
+        if unsets:
+            update["$unset"] = unsets
+        return update
+
+    def _search_u(self, model, update):
+        # in case the search strategy of the model is not the n-gram one
+        # there's no search field to be maintained, returns immediately
+        cls = self.__class__
+        if not cls.search_mode == "ngram":
+            return
+
+        # verifies that the search field is present in the model and, for
+        # updates, that it has changed (otherwise the n-grams are kept)
+        search_name = cls.search_name or cls.default()
+        if not search_name in model:
+            return
+        sets = update.get("$set", {}) if update else None
+        if not update == None and not search_name in (sets or {}):
+            return
+
+        # generates the n-grams for the value of the search field and sets
+        # them in both the model and the update document (if any)
+        tokens = cls._search_t(model[search_name])
+        model[SEARCH_FIELD] = tokens
+        if update:
+            update["$set"][SEARCH_FIELD] = tokens
+
+    def _embed_u(self, model, update):
+        # in case the model has no references with embedded fields
+        # there are no snapshots to be maintained, returns immediately
+        cls = self.__class__
+        embeds = cls.embeds()
+        if not embeds:
+            return
+
+        # determines the reference fields that have changed (for updates)
+        # as only their snapshots are rebuilt, the other ones are kept
+        sets = update.get("$set", {}) if update else dict()
+        unsets = update.get("$unset", {}) if update else dict()
+        embedded = dict(self.model.get(EMBED_FIELD, None) or {})
+        changed = update == None
+        for name in embeds:
+            is_changed = name in sets or name in unsets
+            if not update == None and not is_changed and name in embedded:
+                continue
+            value = self.model.get(name, None)
+            if value and not isinstance(value, typesf.Reference):
+                value = cls.definition_n(name)["type"](value)
+            is_reference = isinstance(value, typesf.Reference)
+            snapshot = value.snapshot() if is_reference and value else None
+            if is_reference:
+                value.__dict__["_embedded"] = snapshot
+            if name in embedded and embedded[name] == snapshot:
+                continue
+            embedded[name] = snapshot
+            changed = True
+
+        # sets the (new) snapshots in both the model to be stored and
+        # the current instance and in the update document (if any)
+        if not changed:
+            return
+        model[EMBED_FIELD] = embedded
+        self.model[EMBED_FIELD] = embedded
+        if update == None:
+            return
+        update["$set"] = update.get("$set", {})
+        update["$set"][EMBED_FIELD] = embedded
+
+    def _embed_o(self, update):
+        """
+        Builds the sequence of (fan out) operations that update the
+        snapshots of the embedded fields of the current entity in the
+        entities that reference it, according to the provided update.
+
+        :type update: Dictionary
+        :param update: The update document that has been applied to
+        the current entity in the data source.
+        :rtype: List
+        :return: The sequence of tuples with the model class, the filter
+        and the update document for each of the referencing models.
+        """
+
+        cls = self.__class__
+        embedders = EMBEDS.get(cls.__name__, None)
+        if not embedders or not update:
+            return []
+
+        sets = update.get("$set", {})
+        unsets = update.get("$unset", {})
+        operations = []
+
+        for model_c, name in embedders:
+            _type = model_c.definition_n(name)["type"]
+            prefix = "%s.%s." % (EMBED_FIELD, name)
+            _sets = dict(
+                (prefix + _name, sets[_name]) for _name in _type._embed if _name in sets
+            )
+            _unsets = dict(
+                (prefix + _name, "") for _name in _type._embed if _name in unsets
+            )
+            if not _sets and not _unsets:
+                continue
+            value = self.model.get(_type._name, None)
+            if value == None:
+                continue
+            _update = dict()
+            if _sets:
+                _update["$set"] = _sets
+            if _unsets:
+                _update["$unset"] = _unsets
+            operations.append((model_c, {name: value}, _update))
+
+        return operations
+
+    def _embed_s(self, update):
+        # runs the fan out of the changes in the embedded fields of the
+        # current entity to the referencing entities (single query each)
+        for model_c, filter, _update in self._embed_o(update):
+            collection = model_c._collection()
+            collection.update_many(filter, _update)
+            model_c._bump()
+            model_c._entity_bump()
+
+    def _entity_old(self, changes, current=False):
+        """
+        Retrieves the (partial) models with the previous values of the
+        key fields of the entity changed by the provided update document,
+        as the entries of the entity cache under them become stale.
+
+        :type changes: Dictionary
+        :param changes: The update document to be applied to the entity.
+        :type current: bool
+        :param current: If the current values of the entity may be used
+        as the previous ones (not yet changed) for untracked entities.
+        :rtype: List
+        :return: The models with the previous values of the changed key
+        fields, or an invalid value in case they are unknown.
+        """
+
+        cls = self.__class__
+        if cls._entity_cache() == None:
+            return []
+        names = set()
+        for fields in changes.values():
+            names.update(name.split(".", 1)[0] for name in fields)
+        names = [
+            name for name in cls._entity_names() if name in names and not name == "_id"
+        ]
+        if not names:
+            return []
+        if self._snapshot:
+            stored = self._snapshot[0]
+        elif current:
+            stored = self.model
+        else:
+            return None
+        old = dict(
+            (name, stored[name]) for name in names if not stored.get(name) == None
+        )
+        return [old] if old else []
+
+    def _entity_drop(self, stale, current=True):
+        # removes the entries of the entity from the entity cache, both the
+        # ones under the previous (stale) values of the key fields and the
+        # current ones, in case the previous values are unknown the complete
+        # set of entries of the model is invalidated (version bump)
+        cls = self.__class__
+        if stale == None:
+            cls._entity_bump()
+            return
+        models = [self.model] + stale if current else stale
+        cls._entity_delete(models)
+
+    def _snapshot_s(self, stored):
+        # in case there's no snapshot of the stored values (changes
+        # not tracked for the model) there's nothing to be done
+        if stored == None:
+            return
+
+        # determines the values that have been filled (with default
+        # values) as they're not present in the stored values, keeping
+        # a reference and a copy of them (for changes detection)
+        cls = self.__class__
+        definition = cls.definition()
+        filled = dict()
+        for name, value in legacy.iteritems(self.model):
+            if name in stored:
+                continue
+            if not name in definition:
+                continue
+            is_mutable = isinstance(value, (dict, list))
+            filled[name] = (value, copy.deepcopy(value) if is_mutable else None)
+        self.__dict__["_snapshot"] = (stored, filled)
+
+    def _is_handled(self, names):
+        # determines if any of the event handlers with the provided names
+        # is able to change the entity, meaning that either the handler
+        # method is overridden or there are (instance or global) events
+        # registered for it
+        cls = self.__class__
+        for name in names:
+            method = getattr(cls, name)
+            base = getattr(Model, name)
+            if not getattr(method, "__func__", method) == getattr(
+                base, "__func__", base
+            ):
+                return True
+            if self._events.get(name, None):
+                return True
+            if cls._events_g.get(cls.name_f(name), None):
+                return True
+        return False
+
+    def _snapshot_u(self, update):
+        # updates the snapshot with the changes that have just been
+        # applied to the data source, making them the stored values
+        # (only in case the changes are being tracked for the entity)
+        if self._snapshot == None:
+            return
+        stored, filled = self._snapshot
+        for name, value in legacy.iteritems(update.get("$set", {})):
+            stored[name] = _snapshot_v(value)
+            filled.pop(name, None)
+        for name in update.get("$unset", {}):
+            stored.pop(name, None)
+
     def _delete(self):
         pass
 
@@ -2693,7 +5974,8 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
 
         # empties the extras list so that the methods that have been
         # set there are not going to be used in any further validation
-        del self._extras[:]
+        if self._extras:
+            del self._extras[:]
 
         # in case the errors map is not empty or invalid there are
         # errors and they should be encapsulated around a validation
@@ -2714,6 +5996,7 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         resolve=False,
         all=False,
         evaluator="json_v",
+        lazy=True,
     ):
         # creates the model that will hold the "filtered" model
         # with all the items that conform with the class specification
@@ -2723,20 +6006,21 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         # to be able to retrieve the correct definition methods
         cls = self.__class__
 
-        # retrieves the (schema) definition for the current model
-        # to be "filtered" it's going to be used to retrieve the
-        # various definitions for the model fields
-        definition = cls.definition()
+        # loads the deferred (lazy) fields that are still pending so that
+        # they are part of the filtered model, unless their exclusion is
+        # explicitly requested (eg: for the changes check of a save)
+        if lazy:
+            self.load_lazy()
+
+        # retrieves the compiled schema for the current model to be
+        # "filtered" it's going to be used to retrieve the various
+        # descriptors (definitions) for the model fields
+        definition = cls.schema()
 
         # retrieves the complete list of fields that are meant to be
         # automatically incremented for every save operation
         increments = cls.increments()
 
-        # gather the set of elements that are considered immutables and
-        # that are not meant to be changed if the current operation to
-        # apply the filter is not a new operation (update operation)
-        immutables = cls.immutables()
-
         # iterates over all the increment fields and increments their
         # fields so that a new value is set on the model, note that if
         # the increment apply is unset the increment operation is ignored
@@ -2749,14 +6033,16 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
                 model[name] = cls._increment(name)
 
         # iterates over all the model items to filter the ones
-        # that are not valid for the current class context
+        # that are not valid for the current class context, using
+        # the compiled serializer of each field for the evaluation
+        serializers = cls._serializer(evaluator)
         for name, value in legacy.eager(self.model.items()):
-            if not name in definition:
+            serializer = serializers.get(name, None)
+            if serializer == None:
                 continue
-            if immutables_a and name in immutables:
+            if immutables_a and definition[name].immutable:
                 continue
-            value = self._evaluate(name, value, evaluator=evaluator)
-            model[name] = value
+            model[name] = serializer(self, value)
 
         # in case the normalize flag is set must iterate over all
         # items to try to normalize the values by calling the reference
@@ -2764,6 +6050,8 @@ class Model(legacy.with_meta(meta.Ordered, observer.Observable)):
         # the normal value that would prevent normalization
         if normalize:
             for name, value in legacy.eager(self.model.items()):
+                if type(value) in SERIAL_EXACT:
+                    continue
                 if not name in definition:
                     continue
                 if not hasattr(value, "ref_v"):
@@ -2886,6 +6174,124 @@ class LocalModel(Model):
         return False
 
 
+class LazyLoader(object):
+    """
+    Loader of the deferred (lazy) fields of a group of entities that
+    have been retrieved together, so that a deferred field is loaded
+    for the complete group with a single (targeted projection) query
+    on the first access to the field in any of the entities.
+    """
+
+    def __init__(self, cls, entities, names):
+        self.cls = cls
+        self.entities = entities
+        self.names = set(names)
+
+    @classmethod
+    def attach(cls, model_c, entities, names):
+        """
+        Attaches a new loader to the provided entities, in case any of
+        the deferred fields is pending (not retrieved) in them.
+
+        :type model_c: Class
+        :param model_c: The model class of the entities.
+        :type entities: List
+        :param entities: The entities that have been retrieved together.
+        :type names: Tuple
+        :param names: The names of the deferred (lazy) fields.
+        """
+
+        pending = [
+            entity
+            for entity in entities
+            if any(not name in entity.model for name in names)
+        ]
+        if not pending:
+            return
+        loader = cls(model_c, pending, names)
+        for entity in pending:
+            entity._lazy = loader
+
+    def load(self, entity, name):
+        """
+        Loads the deferred field with the provided name for the complete
+        group of entities, using a single query by identifier.
+
+        :type entity: Model
+        :param entity: The entity for which the field has been accessed.
+        :type name: String
+        :param name: The name of the deferred field to be loaded.
+        :rtype: bool
+        :return: If the field is now set in the provided entity.
+        """
+
+        return self.load_many(entity, (name,))
+
+    def load_many(self, entity, names):
+        """
+        Loads the deferred fields with the provided names for the complete
+        group of entities, using a single query by identifier for all of
+        the fields (as used before a serialization).
+
+        :type entity: Model
+        :param entity: The entity for which the fields are requested.
+        :type names: List
+        :param names: The names of the deferred fields to be loaded.
+        :rtype: bool
+        :return: If all the fields are now set in the provided entity.
+        """
+
+        names = [name for name in names if name in self.names]
+        if not names:
+            return False
+        self.names.difference_update(names)
+
+        entities = [
+            _entity
+            for _entity in self.entities
+            if "_id" in _entity.model
+            and any(not name in _entity.model for name in names)
+        ]
+        identifiers = [_entity.model["_id"] for _entity in entities]
+        if identifiers:
+            collection = self.cls._collection()
+            items = collection.find({"_id": {"$in": identifiers}}, names)
+            items = dict((item["_id"], item) for item in items)
+        else:
+            items = dict()
+
+        for _entity in entities:
+            item = items.get(_entity.model["_id"], {})
+            for name in names:
+                if name in _entity.model:
+                    continue
+                self._set(_entity, name, item)
+
+        return all(name in entity.model for name in names)
+
+    def _set(self, entity, name, item):
+        # in case the field is present in the stored item its value is
+        # casted and registered as stored (snapshot), otherwise the field
+        # is filled with its default value (if any) as in the retrieval
+        snapshot = entity._snapshot
+        if name in item:
+            model = {name: item[name]}
+            self.cls._hydrate(model, fill=False)
+            entity.model[name] = model[name]
+            if snapshot:
+                snapshot[0][name] = _snapshot_v(item[name])
+            return
+
+        descriptor = self.cls.schema().get(name, None)
+        if not descriptor or descriptor.fill_d == None:
+            return
+        value = descriptor.fill_d()
+        entity.model[name] = value
+        if snapshot:
+            is_mutable = isinstance(value, (dict, list))
+            snapshot[1][name] = (value, copy.deepcopy(value) if is_mutable else None)
+
+
 class Field(dict):
     """
     Top level field class that should be used for the
@@ -3003,6 +6409,57 @@ class View(Action):
     pass
 
 
+class IdentityMap(dict):
+    """
+    Map that associates the keys (model, name and value) of
+    the entities with their loaded instances, ensuring that
+    each entity is loaded at most once for the scope of the
+    map (eg: request, explicit block).
+
+    Notice that the instances stored in the map are shared
+    meaning that any change to them is visible to every
+    retrieval of the same entity within the scope.
+    """
+
+    def get_e(self, cls, name, value):
+        try:
+            return self.get((cls, name, value), None)
+        except TypeError:
+            return None
+
+    def add(self, instance, force=False):
+        cls = instance.__class__
+        for name in cls.identities():
+            if not name in instance.model:
+                continue
+            value = instance.model[name]
+            if value == None:
+                continue
+            key = (cls, name, value)
+            try:
+                if not force and key in self:
+                    continue
+                self[key] = instance
+            except TypeError:
+                continue
+
+    def remove(self, instance):
+        cls = instance.__class__
+        _id = instance.model.get("_id", None)
+        for key, value in legacy.items(self):
+            if not key[0] == cls:
+                continue
+            if not value is instance and not value.model.get("_id", None) == _id:
+                continue
+            del self[key]
+
+    def clear_m(self, cls):
+        for key in legacy.keys(self):
+            if not key[0] == cls:
+                continue
+            del self[key]
+
+
 def link(name=None, description=None, parameters=(), context=False, devel=False):
     """
     Decorator function to be used to "annotate" the provided
@@ -3150,6 +6607,134 @@ def view(name=None, description=None, parameters=(), devel=False):
     return decorator
 
 
+def index(*keys, **kwargs):
+    """
+    Declares a model level index for the provided keys, to be used
+    in the `model_indexes` sequence of the model, allowing compound,
+    partial, unique and TTL (time to live) indexes.
+
+    Each of the keys may be either the name of the field (ascending
+    direction) or a tuple with the name and the direction.
+
+    :type keys: Tuple
+    :param keys: The sequence of keys (names or name and direction
+    tuples) that compose the index.
+    :type unique: bool
+    :param unique: If the index should enforce unique values.
+    :type sparse: bool
+    :param sparse: If only the documents with the fields are indexed.
+    :type partial: Dictionary
+    :param partial: The filter expression of the documents that are
+    going to be indexed (partial index).
+    :type ttl: int
+    :param ttl: The number of seconds after the (date) value of the
+    field after which the documents expire (TTL index).
+    :type name: String
+    :param name: The name of the index, defaulting to the name built
+    from the keys and directions (eg: name_1_age_-1).
+    :rtype: Dictionary
+    :return: The specification of the index (keys and options).
+    """
+
+    unique = kwargs.get("unique", False)
+    sparse = kwargs.get("sparse", False)
+    partial = kwargs.get("partial", None)
+    ttl = kwargs.get("ttl", None)
+    name = kwargs.get("name", None)
+
+    keys = [tuple(key) if isinstance(key, (list, tuple)) else (key, 1) for key in keys]
+
+    options = dict(name=name or data.index_name(keys))
+    if unique:
+        options["unique"] = True
+    if sparse:
+        options["sparse"] = True
+    if partial:
+        options["partialFilterExpression"] = partial
+    if not ttl == None:
+        options["expireAfterSeconds"] = ttl
+
+    return dict(keys=keys, options=options)
+
+
+@contextlib.contextmanager
+def identity_map(identity=None):
+    """
+    Context manager that enables an identity map for the block
+    of code it wraps, so that the entities retrieved inside of
+    the block by key (eg: `get()`, reference resolution) are
+    loaded at most once from the data source.
+
+    The previous identity map (if any) is restored once the
+    block is exited, allowing nested usage.
+
+    :type identity: IdentityMap
+    :param identity: The identity map to be used in the block,
+    in case none is provided a new (empty) one is created.
+    :rtype: IdentityMap
+    :return: The identity map that is being used in the block.
+    """
+
+    identity = IdentityMap() if identity == None else identity
+    previous = getattr(IDENTITY, "map", None)
+    IDENTITY.map = identity
+    try:
+        yield identity
+    finally:
+        IDENTITY.map = previous
+
+
+@contextlib.contextmanager
+def deferred_indexes():
+    """
+    Context manager that defers the building of the indexes of the
+    models set up inside of the block, so that they may be built in
+    batch (eg: concurrently or in background) after the block.
+
+    :rtype: List
+    :return: The sequence that is going to be populated with the
+    models whose index building has been deferred.
+    """
+
+    pending = []
+    previous = getattr(INDEXES, "pending", None)
+    INDEXES.pending = pending
+    try:
+        yield pending
+    finally:
+        INDEXES.pending = previous
+
+
+def reset_blocks():
+    """
+    Resets the complete set of blocks of increment values reserved
+    by the current process, the values remaining in the blocks are
+    discarded (creating gaps in the sequences).
+    """
+
+    with BLOCKS_LOCK:
+        BLOCKS.clear()
+
+
+def get_identity():
+    """
+    Retrieves the identity map currently in use, giving priority
+    to the explicit (block based) one and falling back to the one
+    associated with the current request (if enabled).
+
+    :rtype: IdentityMap
+    :return: The identity map currently in use or an invalid value
+    in case there's no identity map enabled.
+    """
+
+    identity = getattr(IDENTITY, "map", None)
+    if not identity == None:
+        return identity
+    if not flask.has_request_context():
+        return None
+    return getattr(flask.g, "identity_map", None)
+
+
 def type_d(type, default=None):
     """
     Retrieves the default (initial) value for the a certain
@@ -3182,6 +6767,47 @@ def type_d(type, default=None):
     return default()
 
 
+_getattribute = object.__getattribute__
+""" Fast (local) reference to the base attribute retrieval
+method, used in the hot path of attribute lookup of models """
+
+
+def _default_f(type):
+    """
+    Builds the factory function that creates the default value
+    for the provided type, the factory may be called multiple
+    times to obtain a new default value on each call.
+
+    :type type: Class
+    :param type: The data type to build the default factory.
+    :rtype: Function
+    :return: The function that returns a new default value for
+    the provided data type on each call.
+    """
+
+    if hasattr(type, "_default"):
+        return type._default
+    return lambda: type_d(type, None)
+
+
+def _hashable(value):
+    # converts the provided (raw) value into an hashable one, so
+    # that it may be used as a key, the maps are converted into
+    # tuples of items (preserving their order) and the sequences
+    # into tuples of (recursively converted) values
+    if isinstance(value, dict):
+        return tuple((key, _hashable(_value)) for key, _value in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def _snapshot_v(value):
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
 def is_unset(value):
     """
     Verifies if the provided value is unset trying the multiple
@@ -0,0 +1,417 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Flask Quorum
+# Copyright (c) 2008-2025 Hive Solutions Lda.
+#
+# This file is part of Hive Flask Quorum.
+#
+# Hive Flask Quorum is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Flask Quorum is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Flask Quorum. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2025 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+import asyncio
+
+from . import common
+from . import legacy
+from . import exceptions
+
+
+class ModelAsync(object):
+    """
+    Mixin class that provides the async (awaitable) version of the
+    main data source operations of the model, built on top of the
+    async (motor) connection of the data adapter.
+
+    In case the data adapter has no async support the operations
+    fallback to their sync counterparts (run inline).
+    """
+
+    @classmethod
+    async def get_a(cls, *args, **kwargs):
+        if not cls._adapter().is_async():
+            return cls.get(*args, **kwargs)
+
+        (
+            fields,
+            eager,
+            eager_l,
+            map,
+            rules,
+            meta,
+            build,
+            fill,
+            resolve_a,
+            skip,
+            limit,
+            sort,
+            raise_e,
+            identity,
+            cache,
+            lazy,
+            view,
+        ) = cls._get_attrs(
+            kwargs,
+            (
+                ("fields", None),
+                ("eager", None),
+                ("eager_l", None),
+                ("map", False),
+                ("rules", True),
+                ("meta", False),
+                ("build", True),
+                ("fill", True),
+                ("resolve_a", None),
+                ("skip", 0),
+                ("limit", 0),
+                ("sort", None),
+                ("raise_e", True),
+                ("identity", True),
+                ("cache", True),
+                ("lazy", True),
+                ("view", None),
+            ),
+        )
+
+        # determines if the identity map (if any) may be used for the
+        # current retrieval and in case it may tries to retrieve the
+        # entity from it (by its key) avoiding the data source access
+        identity = identity and cls._identity_safe(
+            fields=fields, map=map, rules=rules, meta=meta, build=build, fill=fill
+        )
+        identity_m = common.model().get_identity() if identity else None
+        if not identity_m == None:
+            key = cls._identity_key(kwargs)
+            instance = identity_m.get_e(cls, *key) if key else None
+            if instance:
+                if eager_l:
+                    eager = cls._eager_b(eager)
+                if eager:
+                    await cls._eager_a(instance, eager, map=map)
+                return instance
+
+        # in case there's a sort field and a skip or limit value the
+        # sorting by the `_id` field is added (deterministic results)
+        if sort and (skip or limit) and not cls._has_id(sort):
+            if not isinstance(sort, list):
+                sort = list(sort)
+            sort.append(["_id", 1])
+
+        if eager_l == None:
+            eager_l = map
+        if resolve_a == None:
+            resolve_a = map
+        if eager_l:
+            eager = cls._eager_b(eager)
+        fields, lazy = cls._projection(
+            fields, rules=rules, map=map, lazy=lazy, view=view, eager=eager
+        )
+        collection = cls._collection_a()
+        model = await cls._cached_a(
+            "get",
+            (kwargs, fields, skip, limit, sort),
+            lambda: collection.find_one(
+                kwargs, fields, skip=skip, limit=limit, sort=sort
+            ),
+            cache=cache,
+        )
+        if not model and raise_e:
+            is_devel = common.is_devel()
+            if is_devel:
+                message = "%s not found for %s" % (cls.__name__, str(kwargs))
+            else:
+                message = "%s not found" % cls.__name__
+            raise exceptions.NotFoundError(message)
+        if not model and not raise_e:
+            return model
+        stored = None if map else cls._snapshot_b(model)
+        cls._hydrate(model, fill=fill, safe=rules, lazy=lazy)
+        if build:
+            cls.build(model, map=map, rules=rules, meta=meta)
+        if eager:
+            model = await cls._eager_a(model, eager, map=map)
+        if resolve_a:
+            model = cls._resolve_all(model, resolve=False)
+        if map:
+            return model
+        instance = cls._instance(model, cast=resolve_a, stored=stored, lazy=lazy)
+        if lazy:
+            common.model().LazyLoader.attach(cls, [instance], lazy)
+        if not identity_m == None:
+            identity_m.add(instance)
+        return instance
+
+    @classmethod
+    async def find_a(cls, *args, **kwargs):
+        if not cls._adapter().is_async():
+            return cls.find(*args, **kwargs)
+
+        (
+            fields,
+            eager,
+            eager_l,
+            map,
+            rules,
+            meta,
+            build,
+            fill,
+            resolve_a,
+            skip,
+            limit,
+            sort,
+            raise_e,
+            identity,
+            cache,
+            after,
+            lazy,
+            view,
+        ) = cls._get_attrs(
+            kwargs,
+            (
+                ("fields", None),
+                ("eager", None),
+                ("eager_l", False),
+                ("map", False),
+                ("rules", True),
+                ("meta", False),
+                ("build", True),
+                ("fill", True),
+                ("resolve_a", None),
+                ("skip", 0),
+                ("limit", 0),
+                ("sort", None),
+                ("raise_e", False),
+                ("identity", True),
+                ("cache", True),
+                ("after", None),
+                ("lazy", True),
+                ("view", cls.default_view),
+            ),
+        )
+
+        # determines if the resulting entities should be registered in
+        # the identity map (if any) so that they may be re-used by any
+        # further retrieval of the same entities (by key)
+        identity = identity and cls._identity_safe(
+            fields=fields, map=map, rules=rules, meta=meta, build=build, fill=fill
+        )
+        identity_m = common.model().get_identity() if identity else None
+
+        # normalizes the sort for the keyset pagination (if requested) and
+        # makes sure the sort is deterministic (same as the sync version)
+        if after:
+            sort = cls._keyset_s(sort)
+        if sort and (skip or limit) and not cls._has_id(sort):
+            if not isinstance(sort, list):
+                sort = list(sort)
+            sort.append(["_id", 1])
+
+        if resolve_a == None:
+            resolve_a = map
+        if eager_l:
+            eager = cls._eager_b(eager)
+
+        cls._find_s(kwargs)
+        cls._find_d(kwargs)
+
+        if after:
+            cls._keyset_f(kwargs, sort, after)
+
+        fields, lazy = cls._projection(
+            fields, rules=rules, map=map, lazy=lazy, view=view, eager=eager
+        )
+        collection = cls._collection_a()
+        models = await cls._cached_a(
+            "find",
+            (kwargs, fields, skip, limit, sort),
+            lambda: collection.find(
+                kwargs, fields, skip=skip, limit=limit, sort=sort
+            ).to_list(None),
+            cache=cache,
+        )
+        if not models and raise_e:
+            is_devel = common.is_devel()
+            if is_devel:
+                message = "%s not found for %s" % (cls.__name__, str(kwargs))
+            else:
+                message = "%s not found" % cls.__name__
+            raise exceptions.NotFoundError(message)
+        models, stored = cls._hydrate_p(
+            models, map=map, rules=rules, meta=meta, build=build, fill=fill, lazy=lazy
+        )
+        if eager:
+            models = await cls._eager_a(models, eager, map=map)
+        return cls._hydrate_f(
+            models,
+            stored,
+            map=map,
+            resolve_a=resolve_a,
+            identity_m=identity_m,
+            lazy=lazy,
+        )
+
+    @classmethod
+    async def count_a(cls, *args, **kwargs):
+        if not cls._adapter().is_async():
+            return cls.count(*args, **kwargs)
+
+        cache = kwargs.pop("cache", True)
+        ttl = kwargs.pop("ttl", None)
+        estimate = kwargs.pop("estimate", False)
+        cls._clean_attrs(kwargs)
+
+        cls._find_s(kwargs)
+        cls._find_d(kwargs)
+
+        collection = cls._collection_a()
+        if not kwargs and estimate:
+            return await collection.estimated_count()
+        return await cls._cached_a(
+            "count",
+            kwargs,
+            lambda: collection.count_documents(kwargs),
+            cache=cache,
+            ttl=ttl,
+        )
+
+    async def save_a(self, *args, **kwargs):
+        cls = self.__class__
+        if not cls._adapter().is_async():
+            return self.save(*args, **kwargs)
+
+        # separates the post save related options from the ones used in
+        # the preparation of the save (validation, pre event handlers, etc.)
+        post_save = kwargs.pop("post_save", True)
+        post_create = kwargs.pop("post_create", True)
+        post_update = kwargs.pop("post_update", True)
+        after_callbacks = kwargs.pop("after_callbacks", [])
+
+        # prepares the instance for the save (same as the sync version)
+        # and then stores the resulting model using the async collection
+        model, is_new, update = self._save_p(*args, **kwargs)
+        store = cls._collection_a()
+        if is_new:
+            await store.insert(model)
+        elif update:
+            await store.update({"_id": model["_id"]}, update)
+            for model_c, filter, _update in self._embed_o(update):
+                await model_c._collection_a().update_many(filter, _update)
+                model_c._bump()
+                model_c._entity_bump()
+
+        return self._save_f(
+            model,
+            is_new,
+            update,
+            post_save=post_save,
+            post_create=post_create,
+            post_update=post_update,
+            after_callbacks=after_callbacks,
+        )
+
+    async def delete_a(self, *args, **kwargs):
+        cls = self.__class__
+        if not cls._adapter().is_async():
+            return self.delete(*args, **kwargs)
+
+        post_delete = kwargs.pop("post_delete", True)
+        after_callbacks = kwargs.pop("after_callbacks", [])
+
+        self._delete_p(*args, **kwargs)
+        store = cls._collection_a()
+        await store.remove({"_id": self._id})
+        self._delete_f(post_delete=post_delete, after_callbacks=after_callbacks)
+
+    @classmethod
+    def _collection_a(cls, name=None):
+        name = name or cls._name()
+        adapter = cls._adapter()
+        collection = adapter.collection_a(name)
+        return collection
+
+    @classmethod
+    async def _cached_a(cls, operation, query, method, cache=True, ttl=None):
+        # async version of the query cache wrapper, where the provided
+        # method returns an awaitable for the (uncached) query results
+        query_cache = cls._query_cache(force=ttl) if cache else None
+        if query_cache == None:
+            return await method()
+        if ttl == None:
+            ttl = cls.query_cache
+            ttl = None if ttl is True else ttl
+        key = query_cache.key(cls._name(), operation, query)
+        result = query_cache.get(key)
+        if not result == None:
+            return result
+        result = await method()
+        if not result == None:
+            query_cache.set(key, result, ttl=ttl)
+        return result
+
+    @classmethod
+    async def _eager_a(cls, model, names, *args, **kwargs):
+        """
+        Async version of the eager loading of relations, for each
+        level of each name path the references are retrieved with one
+        query per target model, running these queries concurrently.
+
+        :type model: Dictionary
+        :param model: The model map to be used as reference for the eager
+        loading of relations, may also be a sequence of model maps.
+        :type names: List
+        :param names: The list of dot separated name paths to "guide" the
+        loading of relations (references).
+        :rtype: Dictionary
+        :return: The resulting model with the required relations loaded.
+        """
+
+        is_list = isinstance(model, (list, tuple))
+        models = model if is_list else [model]
+
+        # iterates over the name paths level by level, retrieving the
+        # pending references of the level concurrently and then building
+        # the resolved values, as every reference has been resolved (or
+        # marked as missing) no data source access is performed by it
+        for name in names:
+            _models = models
+            for part in name.split("."):
+                _values, references = cls._res_gather(_models, part)
+                await asyncio.gather(
+                    *[
+                        cls._resolve_many_a(reference_c, _references, **kwargs)
+                        for reference_c, _references in legacy.items(references)
+                    ]
+                )
+                _models = cls._res_values(_values, part, *args, **kwargs)
+                if not _models:
+                    break
+
+        return model
+
+    @classmethod
+    async def _resolve_many_a(cls, reference_c, references, **kwargs):
+        kwargs["eager_l"] = True
+        pending, kwargs = reference_c._pending(references, **kwargs)
+        if not pending:
+            return
+        objects = await reference_c._target().find_a(**kwargs)
+        reference_c._resolved(pending, objects)
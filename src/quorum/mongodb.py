@@ -227,6 +227,25 @@ def _count_documents(store, *args, **kwargs):
     return result.count()
 
 
+def _estimated_count(store, *args, **kwargs):
+    if is_new(3, 7):
+        return store.estimated_document_count(*args, **kwargs)
+    return store.count(*args, **kwargs)
+
+
+def _store_aggregate(store, pipeline, *args, **kwargs):
+    result = store.aggregate(pipeline, *args, **kwargs)
+    if isinstance(result, dict):
+        return result.get("result", [])
+    return list(result)
+
+
+def _store_distinct(store, key, filter=None, *args, **kwargs):
+    if is_new():
+        return store.distinct(key, filter, *args, **kwargs)
+    return store.find(filter).distinct(key)
+
+
 def _store_find_and_modify(store, *args, **kwargs):
     if is_new():
         return store.find_one_and_update(*args, **kwargs)
@@ -236,23 +255,63 @@ def _store_find_and_modify(store, *args, **kwargs):
 
 def _store_insert(store, *args, **kwargs):
     if is_new():
-        store.insert_one(*args, **kwargs)
+        return store.insert_one(*args, **kwargs)
     else:
-        store.insert(*args, **kwargs)
+        return store.insert(*args, **kwargs)
+
+
+def _store_insert_many(store, documents, ordered=True):
+    try:
+        if is_new():
+            store.insert_many(documents, ordered=ordered)
+        else:
+            store.insert(documents, continue_on_error=not ordered)
+    except _pymongo().errors.BulkWriteError as exception:
+        raise _bulk_error(exception)
+
+
+def _store_bulk_write(store, operations, ordered=True):
+    if not is_new():
+        for operation in operations:
+            if operation[0] == "insert_one":
+                store.insert(operation[1])
+            else:
+                store.update(*operation[1:])
+        return
+    requests = []
+    for operation in operations:
+        if operation[0] == "insert_one":
+            requests.append(_pymongo().InsertOne(operation[1]))
+        else:
+            requests.append(_pymongo().UpdateOne(*operation[1:]))
+    try:
+        store.bulk_write(requests, ordered=ordered)
+    except _pymongo().errors.BulkWriteError as exception:
+        raise _bulk_error(exception)
 
 
 def _store_update(store, *args, **kwargs):
     if is_new():
-        store.update_one(*args, **kwargs)
+        return store.update_one(*args, **kwargs)
+    else:
+        return store.update(*args, **kwargs)
+
+
+def _store_update_many(store, *args, **kwargs):
+    if is_new():
+        result = store.update_many(*args, **kwargs)
+        return result.matched_count
     else:
-        store.update(*args, **kwargs)
+        kwargs["multi"] = True
+        result = store.update(*args, **kwargs)
+        return result.get("n", 0) if result else 0
 
 
 def _store_remove(store, *args, **kwargs):
     if is_new():
-        store.delete_many(*args, **kwargs)
+        return store.delete_many(*args, **kwargs)
     else:
-        store.remove(*args, **kwargs)
+        return store.remove(*args, **kwargs)
 
 
 def _store_ensure_index(store, *args, **kwargs):
@@ -263,6 +322,14 @@ def _store_ensure_index(store, *args, **kwargs):
         store.ensure_index(*args, **kwargs)
 
 
+def _store_create_index(store, *args, **kwargs):
+    kwargs["background"] = kwargs.get("background", True)
+    if is_new():
+        return store.create_index(*args, **kwargs)
+    else:
+        return store.ensure_index(*args, **kwargs)
+
+
 def _store_ensure_index_many(store, *args, **kwargs):
     directions_l = kwargs.pop("directions", None)
     if directions_l == "all":
@@ -275,6 +342,13 @@ def _store_ensure_index_many(store, *args, **kwargs):
         _store_ensure_index(store, *_args, **kwargs)
 
 
+def _bulk_error(exception):
+    details = exception.details or dict()
+    errors = details.get("writeErrors", [])
+    errors = [(error["index"], error.get("errmsg", None)) for error in errors]
+    return exceptions.BulkError(errors)
+
+
 def _get_connection(url, connect=False):
     global connection
     if pymongo == None:
@@ -0,0 +1,430 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Flask Quorum
+# Copyright (c) 2008-2025 Hive Solutions Lda.
+#
+# This file is part of Hive Flask Quorum.
+#
+# Hive Flask Quorum is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Flask Quorum is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Flask Quorum. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2025 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+import json
+import time
+import random
+import functools
+import threading
+import collections
+
+from . import legacy
+
+BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+""" The upper bounds (in milliseconds) of the buckets of the
+latency histograms, values above the last bound are placed
+in an extra (overflow) bucket """
+
+SLOW_SIZE = 100
+""" The maximum number of slow queries that are kept per
+collection, older entries are discarded first """
+
+FILTER_OPERATIONS = (
+    "find",
+    "find_iter",
+    "find_one",
+    "find_and_modify",
+    "update",
+    "update_many",
+    "remove",
+    "count",
+    "count_documents",
+)
+""" The sequence containing the names of the operations that
+receive the filter as their first positional argument """
+
+
+class Profiler(object):
+    """
+    Profiler for the operations performed on the data adapter
+    collections, keeping per collection latency histograms and
+    samples of the slow (or randomly selected) queries.
+
+    The shape (filter and sort fields) of each query is recorded
+    so that it may be checked against the declared indexes, making
+    it possible to report missing and unused indexes.
+    """
+
+    def __init__(self, enabled=False, slow=100, sample=0.0):
+        self.enabled = enabled
+        self.slow = slow
+        self.sample = sample
+        self.lock = threading.RLock()
+        self.reset()
+
+    def configure(self, enabled=None, slow=None, sample=None):
+        if not enabled == None:
+            self.enabled = enabled
+        if not slow == None:
+            self.slow = slow
+        if not sample == None:
+            self.sample = sample
+
+    def reset(self):
+        with self.lock:
+            self.collections = dict()
+
+    def declare(self, name, field):
+        """
+        Registers an index declared (ensured) for the collection with
+        the provided name, these are the indexes that the recorded
+        query shapes are going to be checked against.
+
+        :type name: String
+        :param name: The name of the collection of the index.
+        :type field: String
+        :param field: The name of the field that is indexed.
+        """
+
+        with self.lock:
+            collection = self._collection(name)
+            collection["indexes"].add(field)
+
+    def record(self, collection, operation, args, kwargs, duration):
+        """
+        Records the execution of an operation on the provided collection
+        updating the latency histogram and the query shapes, in case the
+        operation is slow (or sampled) the query plan is explained.
+
+        :type collection: Collection
+        :param collection: The data adapter collection where the operation
+        has been performed.
+        :type operation: String
+        :param operation: The name of the operation (eg: find, update).
+        :type args: Tuple
+        :param args: The positional arguments of the operation.
+        :type kwargs: Dictionary
+        :param kwargs: The keyword arguments of the operation.
+        :type duration: float
+        :param duration: The duration of the operation in seconds.
+        """
+
+        duration_ms = duration * 1000.0
+        filter = self._filter(operation, args)
+        sort = kwargs.get("sort", None) or []
+        fields = self._fields(filter)
+        sort_fields = [item[0] for item in sort if isinstance(item, (list, tuple))]
+
+        is_slow = duration_ms >= self.slow
+        is_sampled = self.sample and random.random() < self.sample
+        should_explain = not filter == None and (is_slow or is_sampled)
+        plan = collection.explain(filter, sort=sort) if should_explain else None
+        stages, indexes = self._stages(plan)
+
+        with self.lock:
+            _collection = self._collection(collection.name)
+            stats = _collection["operations"].get(operation, None)
+            if stats == None:
+                stats = dict(
+                    count=0,
+                    total=0.0,
+                    max=0.0,
+                    histogram=[0] * (len(BUCKETS) + 1),
+                )
+                _collection["operations"][operation] = stats
+            stats["count"] += 1
+            stats["total"] += duration_ms
+            stats["max"] = max(stats["max"], duration_ms)
+            stats["histogram"][self._bucket(duration_ms)] += 1
+
+            if fields or sort_fields:
+                shape = (tuple(sorted(fields)), tuple(sort_fields))
+                shape_s = _collection["shapes"].get(shape, None)
+                if shape_s == None:
+                    shape_s = dict(count=0, collscan=False)
+                    _collection["shapes"][shape] = shape_s
+                shape_s["count"] += 1
+                shape_s["collscan"] |= "COLLSCAN" in stages
+
+            if "COLLSCAN" in stages:
+                _collection["collscans"] += 1
+            _collection["used"].update(indexes)
+
+            if is_slow:
+                _collection["slow"].append(
+                    dict(
+                        operation=operation,
+                        filter=filter,
+                        sort=sort,
+                        duration=duration_ms,
+                        stages=stages,
+                        timestamp=time.time(),
+                    )
+                )
+
+    def report(self):
+        """
+        Builds the report for the current profiling state, including
+        for each collection the per operation latency statistics and
+        histograms, the slow queries and the index advice (missing
+        and unused indexes).
+
+        :rtype: Dictionary
+        :return: The JSON serializable map with the report.
+        """
+
+        report = dict()
+        with self.lock:
+            for name, collection in legacy.iteritems(self.collections):
+                report[name] = self._report(collection)
+        return report
+
+    def dumps(self, indent=4):
+        return json.dumps(self.report(), indent=indent, sort_keys=True, default=str)
+
+    def dump(self, path, indent=4):
+        data = self.dumps(indent=indent)
+        file = open(path, "w")
+        try:
+            file.write(data)
+        finally:
+            file.close()
+
+    def _report(self, collection):
+        operations = dict()
+        for operation, stats in legacy.iteritems(collection["operations"]):
+            histogram = dict()
+            for index, value in enumerate(stats["histogram"]):
+                bound = BUCKETS[index] if index < len(BUCKETS) else None
+                label = "<=%d" % bound if bound else ">%d" % BUCKETS[-1]
+                histogram[label] = value
+            operations[operation] = dict(
+                count=stats["count"],
+                total=stats["total"],
+                average=stats["total"] / float(stats["count"]),
+                max=stats["max"],
+                histogram=histogram,
+            )
+
+        indexes = collection["indexes"]
+        used = set(collection["used"])
+        missing = []
+
+        for shape, shape_s in legacy.iteritems(collection["shapes"]):
+            fields, sort = shape
+            used.update(field for field in fields + sort if field in indexes)
+            covered = any(field in indexes or field == "_id" for field in fields)
+            covered |= not fields and any(field in indexes for field in sort)
+            if covered and not shape_s["collscan"]:
+                continue
+            missing.append(
+                dict(
+                    fields=list(fields),
+                    sort=list(sort),
+                    count=shape_s["count"],
+                    collscan=shape_s["collscan"],
+                )
+            )
+
+        missing.sort(key=lambda item: item["count"], reverse=True)
+        unused = sorted(index for index in indexes if not index in used)
+
+        return dict(
+            operations=operations,
+            slow=list(collection["slow"]),
+            collscans=collection["collscans"],
+            indexes=sorted(indexes),
+            missing=missing,
+            unused=unused,
+        )
+
+    def _collection(self, name):
+        collection = self.collections.get(name, None)
+        if collection:
+            return collection
+        collection = dict(
+            operations=dict(),
+            shapes=dict(),
+            slow=collections.deque(maxlen=SLOW_SIZE),
+            collscans=0,
+            indexes=set(),
+            used=set(),
+        )
+        self.collections[name] = collection
+        return collection
+
+    def _bucket(self, duration_ms):
+        for index, bound in enumerate(BUCKETS):
+            if duration_ms <= bound:
+                return index
+        return len(BUCKETS)
+
+    def _filter(self, operation, args):
+        if operation == "distinct":
+            return args[1] if len(args) > 1 else dict()
+        if operation == "aggregate":
+            pipeline = args[0] if args else []
+            first = pipeline[0] if pipeline else dict()
+            return first.get("$match", None)
+        if not operation in FILTER_OPERATIONS:
+            return None
+        filter = args[0] if args else dict()
+        return filter if isinstance(filter, dict) else None
+
+    def _fields(self, filter):
+        fields = set()
+        if not filter:
+            return fields
+        for name, value in legacy.iteritems(filter):
+            if name in ("$or", "$and", "$nor"):
+                for item in value:
+                    fields.update(self._fields(item))
+                continue
+            if name.startswith("$"):
+                continue
+            fields.add(name)
+        return fields
+
+    def _stages(self, plan):
+        stages = []
+        indexes = set()
+        if not plan:
+            return stages, indexes
+        planner = plan.get("queryPlanner", plan)
+        pending = [planner.get("winningPlan", dict())]
+        while pending:
+            stage = pending.pop()
+            name = stage.get("stage", None)
+            if name:
+                stages.append(name)
+            for key, _direction in legacy.iteritems(stage.get("keyPattern", {})):
+                indexes.add(key)
+            if "inputStage" in stage:
+                pending.append(stage["inputStage"])
+            pending.extend(stage.get("inputStages", []))
+        return stages, indexes
+
+
+PROFILER = Profiler()
+""" The global profiler instance that is used by the data
+adapter collections, disabled by default (no overhead) """
+
+
+class ProfiledCursor(object):
+    """
+    Wrapper around a (lazy) data source cursor that accumulates the
+    time spent retrieving its items, so that the materialization of
+    the results is timed and not only the creation of the cursor.
+
+    The operation is recorded once the cursor is exhausted or closed,
+    the remaining attributes are delegated to the wrapped cursor.
+    """
+
+    def __init__(self, cursor, record, duration=0.0):
+        self._cursor = cursor
+        self._record = record
+        self._duration = duration
+        self._recorded = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        # retrieves the next item from the cursor accounting the time
+        # spent, the operation is recorded once the cursor is exhausted
+        # (stop iteration) or in case of any error
+        start = time.time()
+        try:
+            item = next(self._cursor)
+        except Exception:
+            self._duration += time.time() - start
+            self._flush()
+            raise
+        self._duration += time.time() - start
+        return item
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def next(self):
+        return self.__next__()
+
+    def close(self):
+        self._flush()
+        close = getattr(self._cursor, "close", None)
+        if close:
+            close()
+
+    def _flush(self):
+        if self._recorded:
+            return
+        self._recorded = True
+        self._record(self._duration)
+
+
+def profiled(method):
+    """
+    Decorator that times the execution of the decorated collection
+    method recording it in the global profiler (if enabled).
+
+    In case the method returns a (lazy) cursor the time spent in the
+    iteration of it is also accounted, see `ProfiledCursor`.
+
+    :type method: Function
+    :param method: The collection method that is going to be timed.
+    :rtype: Function
+    :return: The decorated method.
+    """
+
+    operation = method.__name__
+
+    @functools.wraps(method)
+    def decorator(self, *args, **kwargs):
+        if not PROFILER.enabled:
+            return method(self, *args, **kwargs)
+        start = time.time()
+        result = None
+        try:
+            result = method(self, *args, **kwargs)
+        finally:
+            duration = time.time() - start
+            if not _is_cursor(result):
+                PROFILER.record(self, operation, args, kwargs, duration)
+        if not _is_cursor(result):
+            return result
+        return ProfiledCursor(
+            result,
+            lambda duration: PROFILER.record(self, operation, args, kwargs, duration),
+            duration=duration,
+        )
+
+    return decorator
+
+
+def _is_cursor(value):
+    # a cursor is a lazy (sync) iterator, meaning that materialized
+    # results (eg: lists, maps) and the async cursors (that are not
+    # sync iterable) are not considered cursors
+    if value == None or isinstance(value, (list, tuple, dict)):
+        return False
+    if hasattr(value, "to_list"):
+        return False
+    return hasattr(value, "__next__") or hasattr(value, "next")
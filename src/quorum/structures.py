@@ -29,6 +29,7 @@ __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
 import os
+import threading
 import collections
 
 
@@ -309,5 +310,81 @@ class LimitedSizeDict(dict):
         self._order.append(key)
 
 
+class LRUDict(dict):
+    """
+    Size limited dictionary that removes the least recently
+    used item once the maximum size is reached.
+
+    Both the retrieval and the setting of an item mark it as
+    the most recently used one, the operations are thread safe
+    so that the dictionary may be used as a shared cache.
+    """
+
+    def __init__(self, max_size=128):
+        dict.__init__(self)
+        self.max_size = max_size
+        self._order = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = dict.__getitem__(self, key)
+            self._order.pop(key, None)
+            self._order[key] = True
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            if key in self:
+                self._order.pop(key, None)
+            elif len(self) >= self.max_size:
+                oldest_key, _value = self._order.popitem(last=False)
+                dict.__delitem__(self, oldest_key)
+            dict.__setitem__(self, key, value)
+            self._order[key] = True
+
+    def __delitem__(self, key):
+        with self._lock:
+            dict.__delitem__(self, key)
+            self._order.pop(key, None)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if not key in self:
+                return default
+            return self[key]
+
+    def pop(self, key, *args):
+        with self._lock:
+            self._order.pop(key, None)
+            return dict.pop(self, key, *args)
+
+    def popitem(self):
+        # removes and returns the least recently used item, raising
+        # a key error in case the dictionary is empty (as in dict)
+        with self._lock:
+            if not self._order:
+                raise KeyError("popitem(): dictionary is empty")
+            key, _value = self._order.popitem(last=False)
+            return key, dict.pop(self, key)
+
+    def setdefault(self, key, default=None):
+        with self._lock:
+            if key in self:
+                return self[key]
+            self[key] = default
+            return default
+
+    def update(self, *args, **kwargs):
+        with self._lock:
+            for key, value in dict(*args, **kwargs).items():
+                self[key] = value
+
+    def clear(self):
+        with self._lock:
+            dict.clear(self)
+            self._order.clear()
+
+
 lazy_dict = LazyDict
 lazy = LazyValue
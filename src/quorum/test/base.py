@@ -132,3 +132,23 @@ class BaseTest(quorum.TestCase):
         test = ContextTest()
         result = test.with_context()
         self.assertEqual(result, True)
+
+    @quorum.secured
+    def test_cache(self):
+        cache = quorum.base._cache("memory", "Cache", quorum.QueryCache)
+        self.assertEqual(isinstance(cache, quorum.MemoryCache), True)
+
+        cache = quorum.base._cache("none", "Cache", quorum.QueryCache)
+        self.assertEqual(cache, None)
+
+        cache = quorum.base._cache("", "EntityCache", quorum.EntityCache)
+        self.assertEqual(cache, None)
+
+        self.assertRaises(
+            quorum.OperationalError,
+            lambda: quorum.base._cache("invalid", "Cache", quorum.QueryCache),
+        )
+        self.assertRaises(
+            quorum.OperationalError,
+            lambda: quorum.base._cache("query", "Cache", quorum.QueryCache),
+        )
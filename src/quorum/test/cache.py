@@ -0,0 +1,216 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Flask Quorum
+# Copyright (c) 2008-2025 Hive Solutions Lda.
+#
+# This file is part of Hive Flask Quorum.
+#
+# Hive Flask Quorum is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Flask Quorum is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Flask Quorum. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2025 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+
+import datetime
+
+import quorum
+
+
+class MemoryCacheTest(quorum.TestCase):
+
+    @quorum.secured
+    def test_basic(self):
+        cache = quorum.MemoryCache(ttl=60, size=2)
+        key = cache.key("person", "find", dict(name="Name"))
+
+        self.assertEqual(cache.get(key), None)
+
+        cache.set(key, [dict(name="Name")])
+
+        self.assertEqual(cache.get(key), [dict(name="Name")])
+        cache.get(key)[0]["name"] = "Other"
+
+        self.assertEqual(cache.get(key), [dict(name="Name")])
+
+        cache.bump("person")
+
+        self.assertNotEqual(cache.key("person", "find", dict(name="Name")), key)
+        self.assertEqual(cache.version("person"), 1)
+        self.assertEqual(cache.version("car"), 0)
+
+    @quorum.secured
+    def test_key(self):
+        cache = quorum.MemoryCache(ttl=60, size=2)
+        date = datetime.datetime(2020, 1, 1)
+
+        self.assertNotEqual(
+            cache.key("person", "find", dict(age=1)),
+            cache.key("person", "find", dict(age="1")),
+        )
+        self.assertNotEqual(
+            cache.key("person", "find", dict(date=date)),
+            cache.key("person", "find", dict(date=str(date))),
+        )
+        self.assertEqual(
+            cache.key("person", "find", dict(date=date)),
+            cache.key("person", "find", dict(date=datetime.datetime(2020, 1, 1))),
+        )
+
+    @quorum.secured
+    def test_eviction(self):
+        cache = quorum.MemoryCache(ttl=60, size=2)
+
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.get("first")
+        cache.set("third", 3)
+
+        self.assertEqual(cache.get("first"), 1)
+        self.assertEqual(cache.get("second"), None)
+        self.assertEqual(cache.get("third"), 3)
+
+        cache.set("fourth", 4, ttl=-1)
+
+        self.assertEqual(cache.get("fourth"), None)
+
+
+class RedisCacheTest(quorum.TestCase):
+
+    @quorum.secured
+    def test_memory(self):
+        get_connection = quorum.redisdb.get_connection
+        connection = quorum.redisdb.RedisMemory()
+        quorum.redisdb.get_connection = lambda: connection
+        try:
+            cache = quorum.RedisCache(ttl=60)
+            cache.set("first", 1)
+            cache.set("second", 2, ttl=-1)
+
+            self.assertEqual(cache.get("first"), 1)
+            self.assertEqual(cache.get("second"), None)
+
+            cache.bump("person")
+            connection.set("other", 1)
+            cache.clear()
+
+            self.assertEqual(cache.version("person"), 0)
+            self.assertEqual(cache.get("first"), None)
+            self.assertEqual(list(connection.values.keys()), ["other"])
+        finally:
+            quorum.redisdb.get_connection = get_connection
+
+
+class MemoryEntityCacheTest(quorum.TestCase):
+
+    @quorum.secured
+    def test_basic(self):
+        cache = quorum.MemoryEntityCache(ttl=60, size=4)
+        keys = cache.keys("person", "id", [1, 2])
+
+        self.assertEqual(keys, ["person:0:id:int:1", "person:0:id:int:2"])
+        self.assertEqual(cache.get_many(keys), [None, None])
+
+        cache.set_many([(keys[0], dict(id=1, name="Name"))])
+
+        self.assertEqual(cache.get_many(keys), [dict(id=1, name="Name"), None])
+
+        cache.delete_many(keys)
+
+        self.assertEqual(cache.get_many(keys), [None, None])
+
+        cache.set_many([(keys[0], dict(id=1, name="Stale"))], force=False)
+
+        self.assertEqual(cache.get_many(keys), [None, None])
+
+        cache.set_many([(keys[0], dict(id=1, name="Name"))])
+
+        self.assertEqual(cache.get_many(keys), [dict(id=1, name="Name"), None])
+
+        cache.set_many([(keys[0], dict(id=1, name="Stale"))], force=False)
+
+        self.assertEqual(cache.get_many(keys), [dict(id=1, name="Name"), None])
+
+        cache.delete_many(keys)
+
+        cache.bump("person")
+
+        self.assertEqual(cache.keys("person", "id", [1]), ["person:1:id:int:1"])
+        self.assertNotEqual(
+            cache.keys("person", "id", [1]), cache.keys("person", "id", ["1"])
+        )
+
+    @quorum.secured
+    def test_dumps(self):
+        cache = quorum.MemoryEntityCache(compress=64)
+        value = dict(name="Name", values=list(range(10)))
+
+        self.assertEqual(cache.loads(cache.dumps(value)), value)
+        self.assertEqual(cache.dumps(dict(name="Name"))[:1].islower(), True)
+
+        value = dict(name="Name" * 64)
+
+        self.assertEqual(cache.dumps(value)[:1].isupper(), True)
+        self.assertEqual(cache.loads(cache.dumps(value)), value)
+        self.assertEqual(cache.dumps(dict(value=set([1]))), None)
+
+        pickled = quorum.MemoryEntityCache(pickled=True)
+        data = pickled.dumps(dict(value=set([1])))
+
+        self.assertEqual(pickled.loads(data), dict(value=set([1])))
+        self.assertEqual(cache.loads(data), None)
+
+
+class RedisEntityCacheTest(quorum.TestCase):
+
+    @quorum.secured
+    def test_memory(self):
+        get_connection = quorum.redisdb.get_connection
+        connection = quorum.redisdb.RedisMemory()
+        quorum.redisdb.get_connection = lambda: connection
+        try:
+            cache = quorum.RedisEntityCache(ttl=60)
+            keys = cache.keys("person", "id", [1, 2])
+            cache.set_many([(keys[0], dict(id=1, name="Name"))])
+
+            self.assertEqual(cache.get_many(keys), [dict(id=1, name="Name"), None])
+
+            cache.set_many([(keys[1], dict(id=2, name="Other"))], ttl=-1)
+
+            self.assertEqual(cache.get_many(keys), [dict(id=1, name="Name"), None])
+
+            cache.delete_many(keys[:1])
+            cache.set_many([(keys[0], dict(id=1, name="Stale"))], force=False)
+
+            self.assertEqual(cache.get_many(keys), [None, None])
+
+            cache.set_many([(keys[0], dict(id=1, name="Name"))])
+
+            self.assertEqual(cache.get_many(keys), [dict(id=1, name="Name"), None])
+
+            cache.bump("person")
+            connection.set("other", 1)
+            cache.clear()
+
+            self.assertEqual(cache.version("person"), 0)
+            self.assertEqual(cache.get_many(keys), [None, None])
+            self.assertEqual(list(connection.values.keys()), ["other"])
+        finally:
+            quorum.redisdb.get_connection = get_connection
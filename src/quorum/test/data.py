@@ -53,3 +53,62 @@ class DataTest(quorum.TestCase):
         adapter.close()
         os.remove(file_path)
         adapter.drop_db()
+
+    @quorum.secured
+    def test_aggregate_tiny(self):
+        fd, file_path = tempfile.mkstemp()
+        os.close(fd)
+        adapter = quorum.TinyAdapter(file_path=file_path)
+        try:
+            collection = adapter.collection("person")
+            collection.insert(dict(name="A", age=1, tags=["x", "y"]))
+            collection.insert(dict(name="B", age=2, tags=["y"]))
+            collection.insert(dict(name="C", age=2))
+
+            results = collection.aggregate(
+                [
+                    {"$match": {"age": {"$gte": 1}}},
+                    {"$group": {"_id": "$age", "count": {"$sum": 1}}},
+                    {"$sort": {"_id": -1}},
+                ]
+            )
+
+            self.assertEqual(results, [dict(_id=2, count=2), dict(_id=1, count=1)])
+
+            results = collection.aggregate(
+                [
+                    {"$unwind": "$tags"},
+                    {"$group": {"_id": "$tags", "names": {"$push": "$name"}}},
+                    {"$sort": {"_id": 1}},
+                    {"$project": {"_id": 0, "tag": "$_id", "names": 1}},
+                ]
+            )
+
+            self.assertEqual(
+                results, [dict(tag="x", names=["A"]), dict(tag="y", names=["A", "B"])]
+            )
+
+            results = collection.aggregate(
+                [{"$group": {"_id": None, "age": {"$avg": "$age"}}}, {"$limit": 1}]
+            )
+
+            self.assertAlmostEqual(results[0]["age"], 5 / 3.0)
+
+            results = collection.aggregate([{"$skip": 1}, {"$count": "total"}])
+
+            self.assertEqual(results, [dict(total=2)])
+
+            self.assertEqual(collection.distinct("age"), [1, 2])
+            self.assertEqual(collection.distinct("tags", {"age": 2}), ["y"])
+            self.assertEqual(collection.count({"age": {"$eq": 2}}), 2)
+            self.assertRaises(
+                quorum.OperationalError,
+                lambda: collection.count({"age": {"$invalid": 2}}),
+            )
+            self.assertRaises(
+                quorum.OperationalError,
+                lambda: collection.aggregate([{"$invalid": {}}]),
+            )
+        finally:
+            adapter.close()
+            os.remove(file_path)
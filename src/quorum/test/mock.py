@@ -1,112 +1,225 @@
-#!/usr/bin/python
-# -*- coding: utf-8 -*-
-
-# Hive Flask Quorum
-# Copyright (c) 2008-2025 Hive Solutions Lda.
-#
-# This file is part of Hive Flask Quorum.
-#
-# Hive Flask Quorum is free software: you can redistribute it and/or modify
-# it under the terms of the Apache License as published by the Apache
-# Foundation, either version 2.0 of the License, or (at your option) any
-# later version.
-#
-# Hive Flask Quorum is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
-# Apache License for more details.
-#
-# You should have received a copy of the Apache License along with
-# Hive Flask Quorum. If not, see <http://www.apache.org/licenses/>.
-
-__author__ = "João Magalhães <joamag@hive.pt>"
-""" The author(s) of the module """
-
-__copyright__ = "Copyright (c) 2008-2025 Hive Solutions Lda."
-""" The copyright for the module """
-
-__license__ = "Apache License, Version 2.0"
-""" The license for the module """
-
-import quorum
-
-
-class Person(quorum.Model):
-
-    identifier = quorum.field(type=int, index=True, increment=True, default=True)
-
-    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
-
-    name = quorum.field()
-
-    age = quorum.field(type=int)
-
-    info = quorum.field(type=dict)
-
-    father = quorum.field(
-        type=quorum.reference("Person", name="identifier", dumpall=True)
-    )
-
-    brother = quorum.field(type=quorum.reference("Person", name="identifier"))
-
-    car = quorum.field(type=quorum.reference("Car", name="identifier"), eager=True)
-
-    cats = quorum.field(type=quorum.references("Cat", name="identifier"))
-
-    @classmethod
-    def validate(cls):
-        return super(Person, cls).validate() + [
-            quorum.not_null("name"),
-            quorum.not_empty("name"),
-            quorum.not_duplicate("name", cls._name()),
-        ]
-
-
-class Cat(quorum.Model):
-
-    identifier = quorum.field(type=int, index=True, increment=True, default=True)
-
-    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
-
-    name = quorum.field()
-
-    friend = quorum.field(type=quorum.reference("Cat", name="identifier"))
-
-
-class Car(quorum.Model):
-
-    identifier = quorum.field(type=int, index=True, increment=True, default=True)
-
-    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
-
-    name = quorum.field()
-
-    brand = quorum.field()
-
-    variant = quorum.field()
-
-    garage = quorum.field(
-        type=quorum.reference("Garage", name="identifier"), eager=True
-    )
-
-
-class Garage(quorum.Model):
-
-    identifier = quorum.field(type=int, index=True, increment=True, default=True)
-
-    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
-
-    name = quorum.field()
-
-    address = quorum.field(
-        type=quorum.reference("Address", name="identifier"), eager=True
-    )
-
-
-class Address(quorum.Model):
-
-    identifier = quorum.field(type=int, index=True, increment=True, default=True)
-
-    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
-
-    street = quorum.field()
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# Hive Flask Quorum
+# Copyright (c) 2008-2025 Hive Solutions Lda.
+#
+# This file is part of Hive Flask Quorum.
+#
+# Hive Flask Quorum is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by the Apache
+# Foundation, either version 2.0 of the License, or (at your option) any
+# later version.
+#
+# Hive Flask Quorum is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License along with
+# Hive Flask Quorum. If not, see <http://www.apache.org/licenses/>.
+
+__author__ = "João Magalhães <joamag@hive.pt>"
+""" The author(s) of the module """
+
+__copyright__ = "Copyright (c) 2008-2025 Hive Solutions Lda."
+""" The copyright for the module """
+
+__license__ = "Apache License, Version 2.0"
+""" The license for the module """
+
+import contextlib
+
+import quorum
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
+
+class Person(quorum.Model):
+
+    identifier = quorum.field(type=int, index=True, increment=True, default=True)
+
+    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
+
+    name = quorum.field()
+
+    age = quorum.field(type=int)
+
+    info = quorum.field(type=dict)
+
+    father = quorum.field(
+        type=quorum.reference("Person", name="identifier", dumpall=True)
+    )
+
+    brother = quorum.field(type=quorum.reference("Person", name="identifier"))
+
+    car = quorum.field(type=quorum.reference("Car", name="identifier"), eager=True)
+
+    cats = quorum.field(type=quorum.references("Cat", name="identifier"))
+
+    @classmethod
+    def validate(cls):
+        return super(Person, cls).validate() + [
+            quorum.not_null("name"),
+            quorum.not_empty("name"),
+            quorum.not_duplicate("name", cls._name()),
+        ]
+
+
+class TrackedPerson(Person):
+
+    track_changes = True
+
+
+class Cat(quorum.Model):
+
+    identifier = quorum.field(type=int, index=True, increment=True, default=True)
+
+    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
+
+    name = quorum.field()
+
+    friend = quorum.field(type=quorum.reference("Cat", name="identifier"))
+
+
+class LazyCat(Cat):
+
+    track_changes = True
+
+    notes = quorum.field(type=list, lazy=True)
+
+
+class OwnedCat(Cat):
+
+    owner = quorum.field(
+        type=quorum.reference("Person", name="identifier", embed=("name", "age"))
+    )
+
+
+class Car(quorum.Model):
+
+    identifier = quorum.field(type=int, index=True, increment=True, default=True)
+
+    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
+
+    name = quorum.field()
+
+    brand = quorum.field()
+
+    variant = quorum.field()
+
+    garage = quorum.field(
+        type=quorum.reference("Garage", name="identifier"), eager=True
+    )
+
+
+class Garage(quorum.Model):
+
+    identifier = quorum.field(type=int, index=True, increment=True, default=True)
+
+    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
+
+    name = quorum.field()
+
+    address = quorum.field(
+        type=quorum.reference("Address", name="identifier"), eager=True
+    )
+
+
+class Address(quorum.Model):
+
+    identifier = quorum.field(type=int, index=True, increment=True, default=True)
+
+    identifier_safe = quorum.field(type=int, index=True, increment=True, safe=True)
+
+    street = quorum.field()
+
+
+class MotorCursor(object):
+
+    def __init__(self, items):
+        self.items = items
+
+    def to_list(self, length):
+        return _done(list(self.items) if length == None else self.items[:length])
+
+
+class MotorResult(object):
+
+    def __init__(self, matched_count=0):
+        self.matched_count = matched_count
+
+
+class MotorCollection(object):
+    """
+    Fake (in memory) motor collection that runs the operations
+    over the provided (sync) collection returning awaitables, so
+    that the async (motor) path of the models may be tested.
+    """
+
+    def __init__(self, base):
+        self.base = base
+
+    def find(self, *args, **kwargs):
+        return MotorCursor(self.base.find(*args, **kwargs))
+
+    def find_one(self, *args, **kwargs):
+        return _done(self.base.find_one(*args, **kwargs))
+
+    def insert_one(self, *args, **kwargs):
+        return _done(self.base.insert(*args, **kwargs))
+
+    def update_one(self, *args, **kwargs):
+        return _done(self.base.update(*args, **kwargs))
+
+    def update_many(self, *args, **kwargs):
+        return _done(MotorResult(matched_count=self.base.update_many(*args, **kwargs)))
+
+    def delete_many(self, *args, **kwargs):
+        return _done(self.base.remove(*args, **kwargs))
+
+    def count_documents(self, *args, **kwargs):
+        return _done(self.base.count(*args, **kwargs))
+
+    def estimated_document_count(self, *args, **kwargs):
+        return _done(self.base.count(*args, **kwargs))
+
+
+@contextlib.contextmanager
+def motor(adapter):
+    """
+    Makes the provided (sync) adapter behave as an async (motor)
+    one, with its async collections backed by fake motor collections
+    over the sync ones, the names of the collections accessed through
+    the sync path in the meantime are gathered in the yielded list.
+    """
+
+    collection = adapter.collection
+    sync = []
+
+    def collection_s(name, *args, **kwargs):
+        sync.append(name)
+        return collection(name, *args, **kwargs)
+
+    def collection_a(name, *args, **kwargs):
+        base = MotorCollection(collection(name))
+        return quorum.data.MongoCollection(adapter, name, base, is_async=True)
+
+    adapter.is_async = lambda: True
+    adapter.collection = collection_s
+    adapter.collection_a = collection_a
+    try:
+        yield sync
+    finally:
+        del adapter.is_async
+        del adapter.collection
+        del adapter.collection_a
+
+
+def _done(value):
+    future = asyncio.Future()
+    future.set_result(value)
+    return future
@@ -28,6 +28,10 @@ __copyright__ = "Copyright (c) 2008-2025 Hive Solutions Lda."
 __license__ = "Apache License, Version 2.0"
 """ The license for the module """
 
+import json
+import time
+import flask
+import datetime
 import quorum
 
 from . import mock
@@ -594,6 +598,1684 @@ class ModelTest(quorum.TestCase):
         self.assertEqual(person.father.car.is_resolved(), True)
         self.assertEqual(person.father.car.name, "CarFather")
 
+    @quorum.secured
+    def test_eager_many(self):
+        for index in range(3):
+            address = mock.Address()
+            address.street = "Address%d" % index
+            address.save()
+
+            garage = mock.Garage()
+            garage.name = "Garage%d" % index
+            garage.address = address
+            garage.save()
+
+            car = mock.Car()
+            car.name = "Car%d" % index
+            car.garage = garage
+            car.save()
+
+            person = mock.Person()
+            person.name = "Name%d" % index
+            person.car = car
+            person.save()
+
+        people = mock.Person.find(eager=("car.garage.address",), sort=[("name", 1)])
+
+        self.assertEqual(len(people), 3)
+        for index, person in enumerate(people):
+            self.assertEqual(isinstance(person.car, quorum.Reference), True)
+            self.assertEqual(person.car.is_resolved(), True)
+            self.assertEqual(person.car.name, "Car%d" % index)
+            self.assertEqual(person.car.garage.is_resolved(), True)
+            self.assertEqual(person.car.garage.name, "Garage%d" % index)
+            self.assertEqual(person.car.garage.address.is_resolved(), True)
+            self.assertEqual(person.car.garage.address.street, "Address%d" % index)
+
+        people = mock.Person.find(
+            map=True, eager=("car.garage.address",), sort=[("name", 1)]
+        )
+
+        self.assertEqual(len(people), 3)
+        for index, person in enumerate(people):
+            self.assertEqual(isinstance(person["car"], dict), True)
+            self.assertEqual(person["car"]["name"], "Car%d" % index)
+            self.assertEqual(person["car"]["garage"]["name"], "Garage%d" % index)
+            self.assertEqual(
+                person["car"]["garage"]["address"]["street"], "Address%d" % index
+            )
+
+    @quorum.secured
+    def test_eager_missing(self):
+        for index in range(2):
+            person = mock.Person()
+            person.name = "Name%d" % index
+            person.car = 100 + index
+            person.save()
+
+        people = mock.Person.find(eager=("car",), sort=[("name", 1)])
+
+        get = mock.Car.get
+        mock.Car.get = classmethod(lambda cls, *args, **kwargs: self.fail())
+        try:
+            for person in people:
+                self.assertEqual(person.car.resolve(), None)
+                self.assertEqual(person.car.is_resolvable(), False)
+        finally:
+            mock.Car.get = get
+
+    @quorum.secured
+    def test_pre_apply(self):
+        person = mock.Person()
+        person.name = "Name"
+        person.age = 20
+        person.save()
+
+        models = []
+
+        def pre_apply(self):
+            models.append(dict(self.model))
+            self.model["age"] = 0
+            self.model["extra"] = "Extra"
+
+        mock.Person.pre_apply = pre_apply
+        try:
+            person = mock.Person.get(identifier=1)
+            people = mock.Person.find()
+        finally:
+            del mock.Person.pre_apply
+
+        self.assertEqual(models, [dict(), dict()])
+        self.assertEqual(person.age, 20)
+        self.assertEqual(person.extra, "Extra")
+        self.assertEqual(people[0].age, 20)
+
+        person = mock.TrackedPerson()
+        person.name = "Name"
+        person.age = 20
+        person.save()
+
+        mock.TrackedPerson.pre_apply = pre_apply
+        try:
+            person = mock.TrackedPerson.get(identifier=1)
+        finally:
+            del mock.TrackedPerson.pre_apply
+
+        self.assertEqual(person.extra, "Extra")
+        self.assertEqual(person.is_dirty(), False)
+
+    @quorum.secured
+    def test_save_many_unique(self):
+        mock.Person._collection().create_index([("age", 1)], unique=True)
+
+        first = mock.Person()
+        first.name = "First"
+        first.age = 1
+        second = mock.Person()
+        second.name = "Second"
+        second.age = 1
+        third = mock.Person()
+        third.name = "Third"
+        third.age = 3
+
+        result = mock.Person.save_many([first, second, third], ordered=False)
+
+        self.assertEqual(result["saved"], [first, third])
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertEqual(result["errors"][0]["entity"], second)
+        self.assertEqual(mock.Person.count(), 2)
+
+        third.age = 1
+
+        self.assertRaises(quorum.OperationalError, third.save)
+
+    @quorum.secured
+    def test_identity_map(self):
+        person = mock.Person()
+        person.name = "Name"
+        person.save()
+
+        car = mock.Car()
+        car.name = "Car"
+        car.save()
+
+        person.car = car
+        person.save()
+
+        first = mock.Person.get(identifier=1)
+        second = mock.Person.get(identifier=1)
+
+        self.assertNotEqual(id(first), id(second))
+
+        with quorum.identity_map() as identity:
+            first = mock.Person.get(identifier=1)
+            second = mock.Person.get(identifier=1)
+            third = mock.Person.get(_id=first._id)
+
+            self.assertEqual(id(first), id(second))
+            self.assertEqual(id(first), id(third))
+
+            people = mock.Person.find()
+            car = mock.Car.get(identifier=1)
+
+            self.assertEqual(len(people), 1)
+            self.assertEqual(id(first.car.resolve()), id(car))
+            self.assertEqual(id(people[0].car.resolve()), id(car))
+
+            map = mock.Person.get(identifier=1, map=True)
+
+            self.assertEqual(isinstance(map, dict), True)
+
+            first.delete()
+
+            self.assertEqual(mock.Person.get(identifier=1, raise_e=False), None)
+            self.assertEqual(len([key for key in identity if key[0] == mock.Person]), 0)
+
+        self.assertEqual(quorum.get_identity(), None)
+
+    @quorum.secured
+    def test_atomic(self):
+        person = mock.Person()
+        person.name = "Name"
+        person.age = 1
+        person.save()
+
+        result = person.inc("age", 2)
+
+        self.assertEqual(result, 3)
+        self.assertEqual(person.age, 3)
+
+        person.push("cats", 1)
+        person.push("cats", 2)
+        person.add_to_set("cats", 2)
+        person.add_to_set("cats", 3)
+
+        self.assertEqual(person.cats.ref_v(), [1, 2, 3])
+
+        person.pull("cats", 2)
+
+        self.assertEqual(person.cats.ref_v(), [1, 3])
+
+        person.set_value("name", "Other")
+
+        self.assertEqual(person.name, "Other")
+
+        person = person.reload()
+
+        self.assertEqual(person.age, 3)
+        self.assertEqual(person.name, "Other")
+        self.assertEqual(person.cats.ref_v(), [1, 3])
+
+        person = mock.Person()
+        person.name = "Name 2"
+        person.age = 1
+        person.save()
+
+        result = mock.Person.update_c(dict(age=1), {"$inc": {"age": 10}})
+
+        self.assertEqual(result, 1)
+        self.assertEqual(mock.Person.get(identifier=2).age, 11)
+
+        result = mock.Person.update_c(changes=dict(info=dict(a=1)))
+
+        self.assertEqual(result, 2)
+        self.assertEqual(mock.Person.get(identifier=1).info, dict(a=1))
+        self.assertEqual(mock.Person.get(identifier=2).info, dict(a=1))
+
+        person = mock.TrackedPerson()
+        person.name = "Name"
+        person.age = 1
+        person.save()
+
+        self.assertEqual(person.inc("age", 2), 3)
+        self.assertEqual(person.is_dirty(), False)
+
+    @quorum.secured
+    def test_query_cache(self):
+        person = mock.Person()
+        person.name = "Name"
+        person.save()
+
+        mock.Person.query_cache = True
+        try:
+            self.assertEqual(mock.Person.count(), 1)
+            self.assertEqual(len(mock.Person.find()), 1)
+            self.assertEqual(mock.Person.get(identifier=1).name, "Name")
+
+            collection = mock.Person._collection()
+            collection.update({"identifier": 1}, {"$set": {"name": "Other"}})
+
+            self.assertEqual(mock.Person.get(identifier=1).name, "Name")
+            self.assertEqual(mock.Person.get(identifier=1, cache=False).name, "Other")
+
+            person = mock.Person()
+            person.name = "Name 2"
+            person.save()
+
+            self.assertEqual(mock.Person.count(), 2)
+            self.assertEqual(len(mock.Person.find()), 2)
+            self.assertEqual(mock.Person.get(identifier=1).name, "Other")
+
+            person.delete()
+
+            self.assertEqual(mock.Person.count(), 1)
+            self.assertEqual(len(mock.Person.find()), 1)
+        finally:
+            mock.Person.query_cache = False
+
+    @quorum.secured
+    def test_paginate_keyset(self):
+        for index in range(5):
+            person = mock.Person()
+            person.name = "Name %d" % index
+            person.age = index % 2
+            person.save()
+
+        app = quorum.get_app()
+        with app.test_request_context(base_url="http://localhost"):
+            flask.request.args_s = dict()
+
+            page = mock.Person.paginate(limit=2, keyset=True, sort=[("age", 1)])
+
+            self.assertEqual(page["total"], 5)
+            self.assertEqual(page["count"], 3)
+            self.assertEqual([item.age for item in page["items"]], [0, 0])
+            self.assertNotEqual(page["after"], None)
+
+            names = [item.name for item in page["items"]]
+            while page["after"]:
+                page = mock.Person.paginate(
+                    limit=2, after=page["after"], sort=[("age", 1)]
+                )
+                names.extend(item.name for item in page["items"])
+
+            self.assertEqual(len(names), 5)
+            self.assertEqual(len(set(names)), 5)
+            self.assertEqual(
+                [mock.Person.get(name=name).age for name in names], [0, 0, 0, 1, 1]
+            )
+
+            page = mock.Person.paginate(limit=2, keyset=True, age=1)
+
+            self.assertEqual(page["total"], 2)
+            self.assertEqual(len(page["items"]), 2)
+            self.assertEqual(page["after"], None)
+
+            self.assertRaises(
+                quorum.AssertionError,
+                lambda: mock.Person.paginate(limit=2, after="invalid"),
+            )
+
+            page = mock.Person.paginate(limit=2, keyset=True, age=2)
+
+            self.assertEqual(page["total"], 0)
+
+            person = mock.Person()
+            person.name = "Name 5"
+            person.age = 2
+            person.save()
+
+            page = mock.Person.paginate(limit=2, keyset=True, age=2)
+
+            self.assertEqual(page["total"], 1)
+
+            collection = mock.Person._collection()
+            collection.update_many({"age": 2}, {"$set": {"age": 3}})
+
+            page = mock.Person.paginate(limit=2, keyset=True, age=2)
+
+            self.assertEqual(page["total"], 0)
+
+            join = mock.Person._concurrent(flask.has_app_context)
+
+            self.assertNotEqual(join, flask.has_app_context)
+            self.assertEqual(join(), True)
+
+        join = mock.Person._concurrent(flask.has_app_context)
+
+        self.assertEqual(join, flask.has_app_context)
+
+        date = datetime.datetime(2020, 1, 1, 12, 30, 15, 500)
+        sort = [("date", -1), ("age", 1), ("_id", 1)]
+        item = dict(date=date, age=None, _id="5f1a0b2c3d4e5f6a7b8c9d0e")
+        after = mock.Person._cursor_b(item, sort)
+        kwargs = dict()
+        mock.Person._keyset_f(kwargs, sort, after)
+        object_id = mock.Person._adapter().object_id("5f1a0b2c3d4e5f6a7b8c9d0e")
+
+        self.assertEqual(
+            kwargs["$or"],
+            [
+                dict(date={"$lt": date}),
+                dict(date=None),
+                dict(date=date, age={"$ne": None}),
+                dict(date=date, age=None, _id={"$gt": object_id}),
+            ],
+        )
+
+    @quorum.secured
+    def test_async(self):
+        if not quorum.legacy.PYTHON_ASYNC:
+            self.skip()
+
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            car = mock.Car()
+            car.name = "Car"
+            car.save()
+
+            person = mock.Person()
+            person.name = "Name"
+            person.car = car
+            loop.run_until_complete(person.save_a())
+
+            self.assertEqual(person.identifier, 1)
+            self.assertEqual(loop.run_until_complete(mock.Person.count_a()), 1)
+
+            person = loop.run_until_complete(mock.Person.get_a(identifier=1))
+
+            self.assertEqual(person.name, "Name")
+            self.assertEqual(person.car.name, "Car")
+
+            people = loop.run_until_complete(mock.Person.find_a(eager=("car",)))
+
+            self.assertEqual(len(people), 1)
+            self.assertEqual(people[0].car.name, "Car")
+
+            people = mock.Person.find(eager_l=False)
+
+            self.assertEqual(people[0].car.is_resolved(), False)
+
+            loop.run_until_complete(mock.Person._eager_a(people, ("car",)))
+
+            self.assertEqual(people[0].car.is_resolved(), True)
+            self.assertEqual(people[0].car.name, "Car")
+
+            loop.run_until_complete(person.delete_a())
+
+            self.assertEqual(loop.run_until_complete(mock.Person.count_a()), 0)
+        finally:
+            loop.close()
+
+    @quorum.secured
+    def test_async_motor(self):
+        if not quorum.legacy.PYTHON_ASYNC:
+            self.skip()
+        if quorum.mongodb.pymongo == None:
+            self.skip()
+
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            address = mock.Address()
+            address.street = "Street"
+            address.save()
+
+            garage = mock.Garage()
+            garage.name = "Garage"
+            garage.address = address
+            garage.save()
+
+            car = mock.Car()
+            car.name = "Car"
+            car.garage = garage
+            car.save()
+
+            person = mock.Person()
+            person.name = "Name"
+            person.car = car
+            person.save()
+
+            person = mock.Person()
+            person.name = "Other"
+            person.save()
+
+            with mock.motor(quorum.get_adapter()) as sync:
+                people = loop.run_until_complete(
+                    mock.Person.find_a(
+                        eager=("car.garage.address",), sort=[("name", 1)]
+                    )
+                )
+
+                self.assertEqual(sync, [])
+                self.assertEqual(len(people), 2)
+                self.assertEqual(people[0].car.name, "Car")
+                self.assertEqual(people[0].car.garage.name, "Garage")
+                self.assertEqual(people[0].car.garage.address.street, "Street")
+                self.assertEqual(people[1].car, None)
+
+                person = loop.run_until_complete(mock.Person.get_a(name="Name"))
+
+                self.assertEqual(sync, [])
+                self.assertEqual(person.car.name, "Car")
+                self.assertEqual(
+                    loop.run_until_complete(mock.Person.count_a(name="Other")), 1
+                )
+        finally:
+            loop.close()
+
+    @quorum.secured
+    def test_async_embed(self):
+        if not quorum.legacy.PYTHON_ASYNC:
+            self.skip()
+        if quorum.mongodb.pymongo == None:
+            self.skip()
+
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+
+        try:
+            person = mock.Person()
+            person.name = "Name"
+            person.age = 20
+            person.save()
+
+            cat = mock.OwnedCat()
+            cat.name = "Cat"
+            cat.owner = person
+            cat.save()
+
+            with mock.motor(quorum.get_adapter()):
+                person = loop.run_until_complete(mock.Person.get_a(name="Name"))
+                person.name = "Other"
+                loop.run_until_complete(person.save_a())
+
+            cat = mock.OwnedCat.get(name="Cat")
+
+            self.assertEqual(cat.owner.name, "Other")
+            self.assertEqual(cat.owner.age, 20)
+            self.assertEqual(cat.owner.is_resolved(), False)
+        finally:
+            loop.close()
+
+    @quorum.secured
+    def test_aggregate(self):
+        for name, age in (("A", 1), ("B", 2), ("C", 2)):
+            person = mock.Person()
+            person.name = name
+            person.age = age
+            person.save()
+
+        self.assertEqual(mock.Person.group_count("age"), {1: 1, 2: 2})
+        self.assertEqual(mock.Person.group_count("age", age={"$gt": 1}), {2: 2})
+        self.assertEqual(
+            mock.Person.group_count("age", find_d=["name:in:A;B"]), {1: 1, 2: 1}
+        )
+        self.assertEqual(sorted(mock.Person.distinct("age")), [1, 2])
+        self.assertEqual(mock.Person.distinct("name", find_d=["age:equals:1"]), ["A"])
+
+        results = mock.Person.aggregate(
+            [{"$group": {"_id": None, "total": {"$sum": "$age"}}}]
+        )
+
+        self.assertEqual(results, [dict(_id=None, total=5)])
+
+        for name, info in (("A", dict(codes=[1])), ("B", dict(codes=[1, 2]))):
+            person = mock.Person.get(name=name)
+            person.info = info
+            person.save()
+
+        self.assertEqual(
+            mock.Person.group_count("info"),
+            {(("codes", (1,)),): 1, (("codes", (1, 2)),): 1, (): 1},
+        )
+
+    @quorum.secured
+    def test_values(self):
+        for name, age in (("A", 1), ("B", 2), ("C", 2)):
+            person = mock.Person()
+            person.name = name
+            person.age = age
+            person.info = dict(code=name.lower())
+            person.save()
+
+        self.assertEqual(
+            mock.Person.values("name", sort=[("name", 1)]), ["A", "B", "C"]
+        )
+        self.assertEqual(
+            mock.Person.values("name", "age", age=2, sort=[("name", -1)]),
+            [("C", 2), ("B", 2)],
+        )
+        self.assertEqual(
+            mock.Person.values("info.code", find_d=["name:equals:A"]), ["a"]
+        )
+        self.assertEqual(mock.Person.values("name", sort=[("name", 1)], limit=1), ["A"])
+
+        ids = mock.Person.ids(age=2)
+
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(
+            sorted(mock.Person.get(_id=_id).name for _id in ids), ["B", "C"]
+        )
+
+        self.assertEqual(mock.Person.exists_c(name="A"), True)
+        self.assertEqual(mock.Person.exists_c(name="D"), False)
+        self.assertEqual(mock.Person.exists_c(find_d=["age:gt:1"]), True)
+
+    @quorum.secured
+    def test_map_many(self):
+        car = mock.Car()
+        car.name = "Car"
+        car.save()
+
+        cat = mock.Cat()
+        cat.name = "Cat"
+        cat.save()
+
+        person = mock.Person()
+        person.name = "Name"
+        person.age = 20
+        person.info = dict(a=1)
+        person.car = car
+        person.cats = [cat]
+        person.save()
+
+        person = mock.Person()
+        person.name = "Other"
+        person.save()
+
+        people = mock.Person.find(sort=[("identifier", 1)])
+        maps = mock.Person.map_many(people)
+
+        self.assertEqual(maps, [person.map() for person in people])
+        self.assertEqual(maps[0]["name"], "Name")
+        self.assertEqual(maps[0]["info"], dict(a=1))
+        self.assertEqual(maps[0]["car"], 1)
+        self.assertEqual(maps[0]["cats"], [1])
+        self.assertEqual(maps[1]["name"], "Other")
+
+        maps = mock.Person.map_many(people, evaluator="json_v")
+
+        self.assertEqual(maps, [person.map(evaluator="json_v") for person in people])
+        self.assertEqual(mock.Person.map_many([]), [])
+
+        serializers = mock.Person._serializer("map_v")
+
+        self.assertEqual(id(serializers), id(mock.Person._serializer("map_v")))
+        self.assertEqual("name" in serializers, True)
+
+    @quorum.secured
+    def test_find_cache(self):
+        for name, age in (("Name A", 1), ("Name B", 2)):
+            person = mock.Person()
+            person.name = name
+            person.age = age
+            person.save()
+
+        quorum.model.FIND_CACHE.clear()
+
+        for _index in range(2):
+            self.assertEqual(len(mock.Person.find(find_d=["age:gt:1"])), 1)
+            self.assertEqual(len(mock.Person.find(find_d=["age:gt:0"])), 2)
+            self.assertEqual(len(mock.Person.find(find_d=["name:likei:name"])), 2)
+            self.assertEqual(len(mock.Person.find(find_s="2")), 1)
+
+        self.assertEqual(
+            (mock.Person, "d", "age", "gt") in quorum.model.FIND_CACHE, True
+        )
+        self.assertEqual(len(quorum.model.FIND_CACHE), 3)
+
+        kwargs = dict(find_d=["name:likei:name"])
+        mock.Person._find_d(kwargs)
+
+        self.assertEqual(kwargs, dict(name={"$regex": "^.*name.*$", "$options": "i"}))
+
+    @quorum.secured
+    def test_profiler(self):
+        profiler = quorum.get_profiler()
+        profiler.reset()
+        profiler.configure(enabled=True, slow=0.0)
+
+        try:
+            mock.Person._build_indexes()
+
+            person = mock.Person()
+            person.name = "Name"
+            person.age = 20
+            person.save()
+
+            mock.Person.get(identifier=1)
+            mock.Person.find(name="Name")
+            mock.Person.find(name="Name", age=20)
+            mock.Person.count(name="Name")
+        finally:
+            profiler.configure(enabled=False, slow=100)
+
+        report = profiler.report()
+        people = report[mock.Person._name()]
+
+        self.assertEqual(people["operations"]["find"]["count"] >= 2, True)
+        self.assertEqual(
+            sum(people["operations"]["find"]["histogram"].values()) >= 2, True
+        )
+        self.assertEqual(people["indexes"], ["identifier", "identifier_safe"])
+        self.assertEqual(people["unused"], ["identifier_safe"])
+        self.assertEqual(len(people["slow"]) > 0, True)
+
+        missing = [item["fields"] for item in people["missing"]]
+        self.assertEqual(["name"] in missing, True)
+        self.assertEqual(["age", "name"] in missing, True)
+        self.assertEqual(["identifier"] in missing, False)
+
+        self.assertEqual(
+            json.loads(profiler.dumps()), json.loads(json.dumps(report, default=str))
+        )
+
+        profiler.reset()
+
+        class Collection(object):
+
+            name = "cursor"
+
+            @quorum.profiler.profiled
+            def find(self, *args, **kwargs):
+                for index in range(2):
+                    time.sleep(0.01)
+                    yield index
+
+            def explain(self, filter, sort=None):
+                return None
+
+        profiler.configure(enabled=True, slow=10000)
+
+        try:
+            cursor = Collection().find(dict(name="Name"))
+
+            self.assertEqual(profiler.report(), dict())
+            self.assertEqual(list(cursor), [0, 1])
+        finally:
+            profiler.configure(enabled=False, slow=100)
+
+        stats = profiler.report()["cursor"]["operations"]["find"]
+
+        self.assertEqual(stats["count"], 1)
+        self.assertEqual(stats["max"] >= 20.0, True)
+
+        profiler.reset()
+
+    @quorum.secured
+    def test_indexes(self):
+        specs = mock.Person.index_specs()
+        names = sorted(spec["options"]["name"] for spec in specs)
+
+        self.assertEqual(names, ["identifier_1", "identifier_safe_1"])
+        self.assertEqual(
+            mock.Person.sync_indexes(), dict(created=[], dropped=[], stale=[])
+        )
+
+        try:
+            mock.Person.model_indexes = (
+                quorum.index("name", ("age", -1), unique=True),
+                quorum.index("age", ttl=0, partial=dict(age={"$gt": 10})),
+            )
+            del mock.Person._index_specs
+
+            result = mock.Person.sync_indexes()
+            self.assertEqual(
+                result, dict(created=["name_1_age_-1", "age_1"], dropped=[], stale=[])
+            )
+
+            collection = mock.Person._collection()
+            collection.create_index([("name", 1)])
+            information = collection.index_information()
+
+            self.assertEqual(information["name_1_age_-1"]["unique"], True)
+            self.assertEqual(information["age_1"]["expireAfterSeconds"], 0)
+            self.assertEqual(
+                mock.Person.redundant_indexes(),
+                [dict(name="name_1", keys=[("name", 1)], covered_by="name_1_age_-1")],
+            )
+
+            mock.Person.model_indexes = (quorum.index("name", ("age", -1)),)
+            del mock.Person._index_specs
+
+            result = mock.Person.sync_indexes()
+            self.assertEqual(
+                result,
+                dict(
+                    created=["name_1_age_-1"],
+                    dropped=["name_1_age_-1"],
+                    stale=["age_1", "name_1"],
+                ),
+            )
+
+            result = mock.Person.sync_indexes(drop=True)
+            self.assertEqual(
+                result, dict(created=[], dropped=["age_1", "name_1"], stale=[])
+            )
+            self.assertEqual(mock.Person.redundant_indexes(), [])
+
+            self.assertEqual(
+                mock.Person._index_run(collection.drop_index, "name_1"), None
+            )
+            self.assertRaises(
+                ZeroDivisionError, lambda: mock.Person._index_run(lambda: 1 / 0)
+            )
+        finally:
+            mock.Person.model_indexes = ()
+            del mock.Person._index_specs
+
+        redundant = mock.Person.redundant_indexes(
+            information={
+                "_id_": dict(key=[("_id", 1)]),
+                "age_1": dict(key=[("age", 1)]),
+                "age_-1": dict(key=[("age", -1)]),
+                "age_1_name_1": dict(key=[("age", 1), ("name", 1)]),
+                "name_1": dict(key=[("name", 1)], unique=True),
+            }
+        )
+
+        self.assertEqual(
+            [(item["name"], item["covered_by"]) for item in redundant],
+            [("age_-1", "age_1_name_1"), ("age_1", "age_1_name_1")],
+        )
+
+    @quorum.secured
+    def test_build_indexes(self):
+        self.assertEqual(quorum.build_indexes([mock.Person, mock.Cat]), [])
+        self.assertEqual(quorum.build_indexes([mock.Person], mode="skip"), [])
+        self.assertEqual(
+            quorum.build_indexes([mock.Person, mock.Cat], fingerprint=False),
+            ["person", "cat"],
+        )
+
+        try:
+            mock.Person.model_indexes = (quorum.index("name", ("age", -1)),)
+            del mock.Person._index_specs
+
+            self.assertEqual(quorum.build_indexes([mock.Person, mock.Cat]), ["person"])
+            self.assertEqual(quorum.build_indexes([mock.Person, mock.Cat]), [])
+            self.assertEqual(
+                "name_1_age_-1" in mock.Person._collection().index_information(), True
+            )
+        finally:
+            mock.Person.model_indexes = ()
+            del mock.Person._index_specs
+
+        with quorum.model.deferred_indexes() as pending:
+            mock.Person.setup()
+
+        self.assertEqual(pending, [mock.Person])
+        self.assertEqual(quorum.build_indexes(pending), ["person"])
+
+        mock.Person._collection().drop_index("identifier_1")
+
+        self.assertEqual(quorum.build_indexes([mock.Person, mock.Cat]), ["person"])
+        self.assertEqual(
+            "identifier_1" in mock.Person._collection().index_information(), True
+        )
+
+        profiler = quorum.get_profiler()
+        profiler.reset()
+        profiler.configure(enabled=True)
+
+        try:
+            self.assertEqual(quorum.build_indexes([mock.Person], mode="skip"), [])
+            self.assertEqual(quorum.build_indexes([mock.Cat]), [])
+            mock.Person.count(identifier=1)
+            mock.Cat.count(identifier=1)
+        finally:
+            profiler.configure(enabled=False)
+
+        report = profiler.report()
+
+        self.assertEqual(
+            report[mock.Person._name()]["indexes"], ["identifier", "identifier_safe"]
+        )
+        self.assertEqual(
+            report[mock.Cat._name()]["indexes"], ["identifier", "identifier_safe"]
+        )
+
+        profiler.reset()
+
+    @quorum.secured
+    def test_search(self):
+        try:
+            mock.Person.search_name = "name"
+            mock.Person.search_mode = "ngram"
+
+            for name in ("John Doe", "Jane Smith"):
+                person = mock.Person()
+                person.name = name
+                person.save()
+
+            kwargs = dict(find_s="Jo")
+            mock.Person._find_s(kwargs)
+
+            self.assertEqual(kwargs, {"_search": {"$all": ["jo"]}})
+            self.assertEqual(mock.Person._search_index()["keys"], [("_search", 1)])
+            self.assertEqual(len(mock.Person.find(find_s="jo")), 1)
+            self.assertEqual(len(mock.Person.find(find_s="doe JO")), 1)
+            self.assertEqual(len(mock.Person.find(find_s="j")), 2)
+            self.assertEqual(len(mock.Person.find(find_d=["name:likei:smi"])), 1)
+            self.assertEqual(len(mock.Person.find(find_s="bravo")), 0)
+
+            person = mock.Person.get(name="John Doe")
+            person.name = "Johnny Bravo"
+            person.save()
+
+            self.assertEqual(len(mock.Person.find(find_s="bravo")), 1)
+            self.assertEqual(len(mock.Person.find(find_s="doe")), 0)
+            self.assertEqual(len(mock.Person.find(find_d=["name:like:smi"])), 0)
+            self.assertEqual(len(mock.Person.find(find_d=["name:like:Smi"])), 1)
+
+            person.set_value("name", "John Doe")
+
+            self.assertEqual(len(mock.Person.find(find_s="doe")), 1)
+            self.assertEqual(len(mock.Person.find(find_s="bravo")), 0)
+
+            mock.Person.update_c(dict(name="John Doe"), dict(name="Johnny Bravo"))
+
+            self.assertEqual(len(mock.Person.find(find_s="bravo")), 1)
+            self.assertEqual(len(mock.Person.find(find_s="doe")), 0)
+
+            collection = mock.Person._collection()
+            collection.update_many({}, {"$unset": {"_search": ""}})
+
+            self.assertEqual(len(mock.Person.find(find_s="j")), 0)
+            self.assertEqual(mock.Person.rebuild_search(missing=True), 2)
+            self.assertEqual(len(mock.Person.find(find_s="j")), 2)
+            self.assertEqual(mock.Person.rebuild_search(missing=True), 0)
+
+            mock.Person.search_mode = "prefix"
+
+            kwargs = dict(find_s="Jo")
+            mock.Person._find_s(kwargs)
+
+            self.assertEqual(kwargs, dict(name={"$regex": "^Jo", "$options": ""}))
+            self.assertEqual(mock.Person._search_index()["keys"], [("name", 1)])
+            self.assertEqual(len(mock.Person.find(find_s="Jo")), 1)
+            self.assertEqual(len(mock.Person.find(find_s="Bravo")), 0)
+
+            mock.Person.search_mode = "text"
+
+            kwargs = dict(find_s="bravo")
+            mock.Person._find_s(kwargs)
+
+            self.assertEqual(kwargs, {"$text": {"$search": "bravo"}})
+            self.assertEqual(mock.Person._search_index()["keys"], [("name", "text")])
+            self.assertEqual(len(mock.Person.find(find_s="bravo")), 1)
+            self.assertEqual(len(mock.Person.find(find_s="smith bravo")), 2)
+        finally:
+            del mock.Person.search_name
+            del mock.Person.search_mode
+
+        kwargs = dict(find_s="Jo")
+        mock.Person._find_s(kwargs)
+
+        self.assertEqual(kwargs, dict())
+
+    @quorum.secured
+    def test_lazy(self):
+        for name, notes in (("A", ["a"]), ("B", ["b", "c"]), ("C", None)):
+            cat = mock.LazyCat()
+            cat.name = name
+            if notes:
+                cat.notes = notes
+            cat.save()
+
+        self.assertEqual(mock.LazyCat.lazies(), ["notes"])
+
+        cats = mock.LazyCat.find(sort=[("name", 1)])
+
+        self.assertEqual(["notes" in cat.model for cat in cats], [False] * 3)
+        self.assertEqual(cats[0].is_dirty(), False)
+        self.assertEqual(cats[1].notes, ["b", "c"])
+        self.assertEqual(["notes" in cat.model for cat in cats], [True] * 3)
+        self.assertEqual(cats[0].notes, ["a"])
+        self.assertEqual(cats[2].notes, [])
+        self.assertEqual(cats[0].is_dirty(), False)
+
+        cats = mock.LazyCat.find(sort=[("name", 1)])
+
+        self.assertEqual("notes" in cats[1].map(lazy=False), False)
+        self.assertEqual(cats[1].map()["notes"], ["b", "c"])
+        self.assertEqual(["notes" in cat.model for cat in cats], [True] * 3)
+
+        cats = mock.LazyCat.find(sort=[("name", 1)])
+        maps = mock.LazyCat.map_many(cats)
+
+        self.assertEqual([_map["notes"] for _map in maps], [["a"], ["b", "c"], []])
+
+        cat = mock.LazyCat.get(name="A")
+
+        self.assertEqual(cat.json_v()["notes"], ["a"])
+
+        cats = mock.LazyCat.find(sort=[("name", 1)], lazy=False)
+
+        self.assertEqual(cats[1].model["notes"], ["b", "c"])
+
+        cats = mock.LazyCat.find(sort=[("name", 1)], map=True)
+
+        self.assertEqual(cats[1]["notes"], ["b", "c"])
+
+        cat = mock.LazyCat.get(name="B")
+
+        self.assertEqual("notes" in cat.model, False)
+        self.assertEqual(cat.is_dirty(), False)
+
+        cat.name = "BB"
+        cat.save()
+
+        self.assertEqual("notes" in cat.model, True)
+
+        cat = mock.LazyCat.get(name="BB")
+        cat.save(validate=False)
+
+        cat = mock.LazyCat.get(name="BB", lazy=False)
+
+        self.assertEqual(cat.notes, ["b", "c"])
+
+        cat.notes.append("d")
+        cat.save()
+
+        self.assertEqual(mock.LazyCat.get(name="BB").notes, ["b", "c", "d"])
+
+        cats = mock.LazyCat.find(sort=[("name", 1)])
+        for cat in cats:
+            cat.name += "X"
+        result = mock.LazyCat.save_many(cats)
+
+        self.assertEqual(len(result["saved"]), 3)
+        self.assertEqual(["notes" in cat.model for cat in cats], [True] * 3)
+
+        cats = mock.LazyCat.find(sort=[("name", 1)])
+
+        self.assertEqual([cat.name for cat in cats], ["AX", "BBX", "CX"])
+        self.assertEqual([cat.notes for cat in cats], [["a"], ["b", "c", "d"], []])
+
+    @quorum.secured
+    def test_view(self):
+        person = mock.Person()
+        person.name = "Name"
+        person.age = 20
+        person.info = dict(a=1)
+        person.save()
+
+        mock.Person.list_names = classmethod(lambda cls: ["name"])
+        try:
+            self.assertEqual(
+                mock.Person.view_names("list"), ["_id", "name", "identifier", "car"]
+            )
+            self.assertEqual(
+                mock.Person.view_names("list", eager=("father.car",)),
+                ["_id", "name", "identifier", "father", "car"],
+            )
+            self.assertRaises(
+                quorum.AssertionError, lambda: mock.Person.view_names("other")
+            )
+
+            people = mock.Person.find(view="list", map=True)
+
+            self.assertEqual(people[0]["name"], "Name")
+            self.assertEqual("age" in people[0], False)
+            self.assertEqual("info" in people[0], False)
+
+            people = mock.Person.find(view="list")
+
+            self.assertEqual("age" in people[0].model, False)
+            self.assertEqual(people[0].age, 20)
+            self.assertEqual(people[0].info, dict(a=1))
+
+            person = mock.TrackedPerson()
+            person.name = "Name"
+            person.age = 20
+            person.save()
+
+            people = mock.TrackedPerson.find(view="list")
+
+            self.assertEqual(people[0].is_dirty(), False)
+            self.assertEqual(people[0].age, 20)
+            self.assertEqual(people[0].is_dirty(), False)
+
+            people = mock.Person.find(view="list")
+            person = people[0].map()
+
+            self.assertEqual(person["age"], 20)
+            self.assertEqual(person["info"], dict(a=1))
+            self.assertEqual(person, mock.Person.get(identifier=1).map())
+
+            people = mock.Person.find(map=True)
+
+            self.assertEqual(people[0]["age"], 20)
+
+            mock.Person.default_view = "list"
+            try:
+                people = mock.Person.find(map=True)
+
+                self.assertEqual("age" in people[0], False)
+
+                people = mock.Person.find(view=None, map=True)
+
+                self.assertEqual(people[0]["age"], 20)
+            finally:
+                del mock.Person.default_view
+
+            person = mock.Person.get(identifier=1, view="list")
+
+            self.assertEqual("age" in person.model, False)
+            self.assertEqual(person.age, 20)
+
+            person = mock.Person.get(identifier=1, view="show", map=True)
+
+            self.assertEqual(person["age"], 20)
+            self.assertEqual(person["info"], dict(a=1))
+
+            people = mock.Person.find(view="list", fields=("name", "age"), map=True)
+
+            self.assertEqual(people[0]["age"], 20)
+        finally:
+            del mock.Person.list_names
+
+    @quorum.secured
+    def test_view_eager(self):
+        car = mock.Car()
+        car.name = "Car"
+        car.brand = "Brand"
+        car.save()
+
+        person = mock.Person()
+        person.name = "Name"
+        person.car = car
+        person.save()
+
+        mock.Car.list_names = classmethod(lambda cls: ["name"])
+        mock.Car.default_view = "list"
+        try:
+            self.assertEqual("brand" in mock.Car.find(map=True)[0], False)
+
+            person = mock.Person.get(name="Name", eager=("car",), map=True)
+
+            self.assertEqual(person["car"]["name"], "Car")
+            self.assertEqual(person["car"]["brand"], "Brand")
+
+            people = mock.Person.find(eager=("car",), map=True)
+
+            self.assertEqual(people[0]["car"]["brand"], "Brand")
+
+            person = mock.Person.get(name="Name", eager=("car",))
+
+            self.assertEqual("brand" in person.car.model, True)
+        finally:
+            del mock.Car.list_names
+            del mock.Car.default_view
+
+    @quorum.secured
+    def test_embed(self):
+        person = mock.Person()
+        person.name = "Name"
+        person.age = 20
+        person.save()
+
+        cat = mock.OwnedCat()
+        cat.name = "Cat"
+        cat.owner = person
+        cat.save()
+
+        self.assertEqual(mock.OwnedCat.embeds(), ["owner"])
+        self.assertEqual(cat.model["_embed"], dict(owner=dict(name="Name", age=20)))
+
+        cat = mock.OwnedCat.get(name="Cat")
+
+        self.assertEqual(cat.owner.name, "Name")
+        self.assertEqual(cat.owner.age, 20)
+        self.assertEqual(cat.owner.is_resolved(), False)
+
+        cat = mock.OwnedCat.get(name="Cat", map=True)
+
+        self.assertEqual(cat["_embed"]["owner"]["name"], "Name")
+
+        person.name = "Other"
+        person.save()
+
+        cat = mock.OwnedCat.get(name="Cat")
+
+        self.assertEqual(cat.owner.name, "Other")
+        self.assertEqual(cat.owner.age, 20)
+        self.assertEqual(cat.owner.is_resolved(), False)
+
+        person.info = dict(a=1)
+        person.save()
+
+        cats = mock.OwnedCat.find(view="list")
+
+        self.assertEqual(cats[0].owner.name, "Other")
+        self.assertEqual(cats[0].owner.is_resolved(), False)
+        self.assertEqual(cats[0].owner.info, dict(a=1))
+        self.assertEqual(cats[0].owner.is_resolved(), True)
+
+        other = mock.Person()
+        other.name = "Another"
+        other.age = 30
+        other.save()
+
+        cat = mock.OwnedCat.get(name="Cat")
+        cat.owner = other
+        cat.save()
+
+        cat = mock.OwnedCat.get(name="Cat")
+
+        self.assertEqual(cat.owner.name, "Another")
+        self.assertEqual(cat.owner.is_resolved(), False)
+
+        person.name = "Last"
+        person.save()
+
+        cat = mock.OwnedCat.get(name="Cat")
+
+        self.assertEqual(cat.owner.name, "Another")
+
+        cat.owner = None
+        cat.save()
+
+        cat = mock.OwnedCat.get(name="Cat")
+
+        self.assertEqual(cat.owner, None)
+        self.assertEqual(cat.model["_embed"], dict(owner=None))
+
+    @quorum.secured
+    def test_entity_cache(self):
+        app = quorum.get_app()
+        entity_cache = app.entity_cache
+        app.entity_cache = quorum.MemoryEntityCache()
+
+        mock.TrackedPerson.entity_cache = True
+        mock.Cat.entity_cache = True
+        try:
+            person = mock.TrackedPerson()
+            person.name = "Name"
+            person.age = 20
+            person.save()
+
+            collection = mock.TrackedPerson._collection()
+            collection.update({"identifier": 1}, {"$set": {"name": "Other"}})
+
+            self.assertEqual(mock.TrackedPerson.get(identifier=1).name, "Name")
+            self.assertEqual(mock.TrackedPerson.get(_id=person._id).name, "Name")
+            self.assertEqual(
+                mock.TrackedPerson.get(identifier=1, cache=False).name, "Other"
+            )
+            self.assertEqual(
+                mock.TrackedPerson.get(
+                    identifier=1, fields=("name",), map=True, fill=False
+                ),
+                dict(_id=person._id, name="Name"),
+            )
+
+            person.age = 21
+            person.save()
+
+            self.assertEqual(mock.TrackedPerson.get(identifier=1).name, "Other")
+            self.assertEqual(mock.TrackedPerson.get(identifier=1).age, 21)
+
+            cats = []
+            for name in ("A", "B", "C"):
+                cat = mock.Cat()
+                cat.name = name
+                cat.save()
+                cats.append(cat)
+
+            person.cats = cats
+            person.save()
+
+            mock.Cat._collection().update_many({}, {"$set": {"name": "X"}})
+
+            person = mock.TrackedPerson.get(identifier=1)
+
+            self.assertEqual(
+                [cat.name for cat in person.cats.resolve()], ["A", "B", "C"]
+            )
+            self.assertEqual(
+                [cat.name for cat in mock.Cat.find(identifier={"$in": [3, 1]})],
+                ["C", "A"],
+            )
+
+            cats[0].delete()
+
+            self.assertEqual(mock.Cat.get(identifier=1, raise_e=False), None)
+            self.assertEqual(mock.Cat.get(identifier=2).name, "B")
+
+            mock.Cat.update_c({}, {"name": "Y"})
+
+            self.assertEqual(mock.Cat.get(identifier=2).name, "Y")
+
+            person = mock.TrackedPerson.get(identifier=1)
+            person.identifier = 5
+            person.save()
+
+            self.assertEqual(mock.TrackedPerson.get(identifier=1, raise_e=False), None)
+            self.assertEqual(mock.TrackedPerson.get(identifier=5).name, "Other")
+
+            person.set_value("identifier", 7)
+
+            self.assertEqual(mock.TrackedPerson.get(identifier=5, raise_e=False), None)
+            self.assertEqual(mock.TrackedPerson.get(identifier=7).name, "Other")
+
+            cat = mock.Cat.get(identifier=2)
+            cat.identifier = 9
+            cat.save()
+
+            self.assertEqual(mock.Cat.get(identifier=2, raise_e=False), None)
+            self.assertEqual(mock.Cat.get(identifier=9).name, "Y")
+
+            # simulates a concurrent write (save) of the entity between the
+            # read from the data source and the store of the read through
+            writer = mock.TrackedPerson.get(identifier=7, cache=False)
+            writer.name = "Concurrent"
+            writes = [writer.save]
+            _collection = mock.TrackedPerson._collection
+
+            def collection_c(cls, name=None):
+                collection = _collection(name)
+                find = collection.find
+
+                def find_c(*args, **kwargs):
+                    result = list(find(*args, **kwargs))
+                    if writes:
+                        writes.pop()()
+                    return result
+
+                collection.find = find_c
+                return collection
+
+            app.entity_cache.clear()
+            mock.TrackedPerson._collection = classmethod(collection_c)
+            try:
+                person = mock.TrackedPerson.get(identifier=7)
+            finally:
+                del mock.TrackedPerson._collection
+
+            self.assertEqual(person.name, "Other")
+            self.assertEqual(writes, [])
+            self.assertEqual(mock.TrackedPerson.get(identifier=7).name, "Concurrent")
+        finally:
+            mock.TrackedPerson.entity_cache = False
+            mock.Cat.entity_cache = False
+            app.entity_cache = entity_cache
+
+    @quorum.secured
+    def test_track_changes(self):
+        car = mock.Car()
+        car.name = "Car"
+        car.save()
+
+        self.assertEqual(car.is_tracked(), False)
+        self.assertEqual(car.is_dirty(), True)
+
+        car = mock.Car.get(identifier=1)
+
+        self.assertEqual(car.is_tracked(), False)
+
+        car.brand = "Brand"
+        car.save()
+
+        car = mock.Car.get(identifier=1)
+
+        self.assertEqual(car.name, "Car")
+        self.assertEqual(car.brand, "Brand")
+
+        person = mock.TrackedPerson()
+        person.name = "Name"
+        person.save()
+
+        person = mock.TrackedPerson.get(identifier=1)
+
+        calls = []
+        _filter = person._filter
+
+        def counter(*args, **kwargs):
+            calls.append(True)
+            return _filter(*args, **kwargs)
+
+        person._filter = counter
+        person.save()
+
+        self.assertEqual(len(calls), 1)
+
+        calls[:] = []
+        person.age = 20
+        person.save()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(person.is_dirty(), False)
+
+    @quorum.secured
+    def test_dirty(self):
+        person = mock.TrackedPerson()
+        person.name = "Name"
+        person.age = 20
+        person.info = dict(a=1)
+        person.save()
+
+        self.assertEqual(person.is_tracked(), True)
+        self.assertEqual(person.is_dirty(), False)
+
+        first = mock.TrackedPerson.get(identifier=1)
+        second = mock.TrackedPerson.get(identifier=1)
+
+        self.assertEqual(first.is_tracked(), True)
+        self.assertEqual(first.is_dirty(), False)
+
+        first.age = 21
+        second.name = "Other"
+
+        self.assertEqual(first.is_dirty(), True)
+
+        first.save()
+        second.save()
+
+        person = mock.TrackedPerson.get(identifier=1)
+
+        self.assertEqual(person.name, "Other")
+        self.assertEqual(person.age, 21)
+        self.assertEqual(first.is_dirty(), False)
+
+        person.info["b"] = 2
+
+        self.assertEqual(person.is_dirty(), True)
+
+        person.save()
+        del person.age
+        person.save()
+
+        person = mock.TrackedPerson.get(identifier=1)
+
+        self.assertEqual(person.info, dict(a=1, b=2))
+        self.assertEqual(person.age, None)
+        self.assertEqual(person.is_dirty(), False)
+
+        person = mock.TrackedPerson.old(model=dict(_id=person._id, name="Other"))
+
+        self.assertEqual(person.is_tracked(), False)
+        self.assertEqual(person.is_dirty(), True)
+
+    @quorum.secured
+    def test_increment_block(self):
+        app = quorum.get_app()
+        app.increment_block = 10
+
+        try:
+            people = []
+            for index in range(12):
+                person = mock.Person()
+                person.name = "Name %d" % index
+                person.save()
+                people.append(person)
+
+            self.assertEqual(
+                [person.identifier for person in people], list(range(1, 13))
+            )
+
+            counter = mock.Person._collection(name="counters").find_one(
+                {"_id": "person:identifier"}
+            )
+
+            self.assertEqual(counter["seq"], 20)
+
+            quorum.reset_blocks()
+
+            person = mock.Person()
+            person.name = "Name 12"
+            person.save()
+
+            self.assertEqual(person.identifier, 21)
+
+            person = mock.Person()
+            person.name = "Name 13"
+            person.identifier = 100
+            person.save()
+
+            person = mock.Person()
+            person.name = "Name 14"
+            person.save()
+
+            self.assertEqual(person.identifier, 101)
+        finally:
+            app.increment_block = 0
+
+    @quorum.secured
+    def test_save_many(self):
+        people = []
+        for index in range(4):
+            person = mock.Person()
+            person.name = "Name %d" % index
+            person.age = index
+            people.append(person)
+
+        result = mock.Person.save_many(people)
+
+        self.assertEqual(len(result["saved"]), 4)
+        self.assertEqual(len(result["errors"]), 0)
+        self.assertEqual([person.identifier for person in people], [1, 2, 3, 4])
+        self.assertEqual(mock.Person.count(), 4)
+        self.assertEqual(people[0].is_new(), False)
+
+        people[0].age = 10
+        person = mock.Person()
+        person.name = "Name 4"
+        person.age = 4
+        people.append(person)
+
+        result = mock.Person.save_many(people)
+
+        self.assertEqual(len(result["saved"]), 5)
+        self.assertEqual(person.identifier, 5)
+        self.assertEqual(mock.Person.get(identifier=1).age, 10)
+        self.assertEqual(mock.Person.count(), 5)
+
+        invalid = mock.Person()
+        invalid.name = "Name 0"
+        first = mock.Person()
+        first.name = "Name 5"
+        second = mock.Person()
+        second.name = "Name 6"
+
+        result = mock.Person.save_many([first, invalid, second])
+
+        self.assertEqual(result["saved"], [first])
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertEqual(result["errors"][0]["index"], 1)
+        self.assertEqual(result["skipped"], [second])
+        self.assertEqual(mock.Person.count(), 6)
+
+        invalid = mock.Person()
+        invalid.name = "Name 0"
+        third = mock.Person()
+        third.name = "Name 7"
+
+        result = mock.Person.save_many([invalid, third], ordered=False)
+
+        self.assertEqual(result["saved"], [third])
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertEqual(result["skipped"], [])
+        self.assertEqual(mock.Person.count(), 7)
+
+        invalid = mock.Person()
+        invalid.name = "Name 0"
+
+        self.assertRaises(
+            quorum.BulkError,
+            lambda: mock.Person.save_many([invalid], raise_e=True),
+        )
+
+    @quorum.secured
+    def test_iter(self):
+        for index in range(5):
+            car = mock.Car()
+            car.name = "Car %d" % index
+            car.save()
+
+            person = mock.Person()
+            person.name = "Name %d" % index
+            person.age = index
+            person.car = car
+            person.save()
+
+        people = mock.Person.iter(batch_size=2, sort=[("identifier", 1)])
+
+        self.assertEqual(isinstance(people, list), False)
+
+        people = list(people)
+
+        self.assertEqual(len(people), 5)
+        self.assertEqual([person.age for person in people], [0, 1, 2, 3, 4])
+        self.assertEqual(people[0].car.name, "Car 0")
+        self.assertEqual(people[4].car.name, "Car 4")
+
+        people = list(mock.Person.iter(batch_size=2, age={"$gte": 3}, map=True))
+
+        self.assertEqual(len(people), 2)
+        self.assertEqual(isinstance(people[0], dict), True)
+
+        people = list(mock.Person.iter(skip=1, limit=3, sort=[("identifier", 1)]))
+
+        self.assertEqual([person.age for person in people], [1, 2, 3])
+
+        with quorum.identity_map() as identity:
+            count = 0
+            for person in mock.Person.iter(batch_size=2):
+                count += 1
+                people = [key for key in identity if key[0] == mock.Person]
+                self.assertEqual(people, [])
+
+            self.assertEqual(count, 5)
+
+            people = list(mock.Person.iter(batch_size=2, identity=True))
+            people = [key for key in identity if key[0] == mock.Person]
+
+            self.assertNotEqual(people, [])
+
+        mock.Person.list_names = classmethod(lambda cls: ["name"])
+        mock.Person.default_view = "list"
+        try:
+            people = list(mock.Person.iter(map=True))
+
+            self.assertEqual("age" in people[0], False)
+            self.assertEqual(people, mock.Person.find(map=True))
+        finally:
+            del mock.Person.list_names
+            del mock.Person.default_view
+
+    @quorum.secured
+    def test_schema(self):
+        self.assertEqual("_schema" in mock.Person.__dict__, True)
+        self.assertEqual("_hydrator_c" in mock.Person.__dict__, True)
+
+        schema = mock.Person.schema()
+
+        self.assertEqual(schema["age"].type, int)
+        self.assertEqual(schema["age"].fill_d(), None)
+        self.assertEqual(schema["info"].fill_d(), dict())
+        self.assertEqual(schema["identifier"].increment, True)
+        self.assertEqual(schema["identifier"].fill_d, None)
+        self.assertEqual(schema["car"].eager, True)
+        self.assertEqual(schema["name"].index < schema["age"].index, True)
+        self.assertEqual(schema["_id"].fill_d, None)
+        self.assertRaises(AttributeError, lambda: setattr(schema["age"], "type", str))
+
+        self.assertEqual(mock.Person.cast("age", "12"), 12)
+        self.assertEqual(mock.Person.cast("age", "invalid"), None)
+        self.assertRaises(
+            ValueError, lambda: mock.Person.cast("age", "invalid", safe=False)
+        )
+        self.assertEqual(mock.Person.cast("other", "12"), "12")
+
+        class Extra(mock.Person):
+            @classmethod
+            def extra_definition(cls):
+                return dict(name=dict(type=str, private=True, immutable=True))
+
+        schema = Extra.schema()
+
+        self.assertEqual(schema["name"].private, True)
+        self.assertEqual(schema["name"].immutable, True)
+        self.assertEqual(schema["age"].private, False)
+
+        extra = Extra(model=dict(name="Name", age=20), fill=False)
+
+        self.assertEqual(
+            extra._filter(increment_a=False, immutables_a=True), dict(age=20)
+        )
+
+    @quorum.secured
+    def test_compact(self):
+        person = mock.Person()
+        person.name = "Name"
+        person.save()
+
+        person = mock.Person.get(identifier=1)
+
+        self.assertEqual(sorted(person.__dict__.keys()), ["model"])
+        self.assertEqual(person.ref, None)
+        self.assertEqual(person._events, dict())
+        self.assertEqual(len(person._extras), 0)
+
+        calls = []
+        person.bind("custom", lambda: calls.append(True))
+        person.trigger("custom")
+
+        self.assertEqual(calls, [True])
+        self.assertEqual("_events" in person.__dict__, True)
+        self.assertEqual(mock.Person._events, dict())
+
+        other = mock.Person()
+        other.trigger("custom")
+
+        self.assertEqual(calls, [True])
+
+        person.validate_extra("new")
+
+        self.assertEqual(len(person._extras), 1)
+        self.assertEqual(len(mock.Person._extras), 0)
+
+        mock.Person._extra_methods = [("greet", lambda self: "Hello " + self.name)]
+        try:
+            person = mock.Person()
+            person.name = "Name"
+
+            self.assertEqual(person.greet(), "Hello Name")
+            self.assertEqual("greet" in person.model, False)
+        finally:
+            del mock.Person._extra_methods
+            del mock.Person.greet
+            del mock.Person._extras_n
+
+    @quorum.secured
+    def test_hydrate(self):
+        model = dict(name=1, age="12", info=dict(a=1), cats=[1, 2])
+        result = mock.Person._hydrate(model)
+
+        self.assertEqual(id(result), id(model))
+        self.assertEqual(model["name"], "1")
+        self.assertEqual(model["age"], 12)
+        self.assertEqual(model["info"], dict(a=1))
+        self.assertEqual(isinstance(model["cats"], quorum.References), True)
+        self.assertEqual(isinstance(model["father"], quorum.Reference), True)
+        self.assertEqual("identifier" in model, False)
+
+        model = dict(age="invalid")
+        mock.Person._hydrate(model, fill=False)
+
+        self.assertEqual(model, dict(age=None))
+
+        person = mock.Person()
+        person.name = "Name"
+        person.age = 20
+        person.save()
+
+        person = mock.Person.get(identifier=1)
+
+        self.assertEqual(person.name, "Name")
+        self.assertEqual(person.age, 20)
+        self.assertEqual(person.identifier, 1)
+        self.assertEqual(person.info, dict())
+
     @quorum.secured
     def test_unresolvable(self):
         person = mock.Person()
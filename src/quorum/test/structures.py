@@ -273,3 +273,53 @@ class LimitedSizeDictTest(quorum.TestCase):
         repr_str = repr(self.limited_dict)
         self.assertIn("'first': 'first_value'", repr_str)
         self.assertIn("'second': 'second_value'", repr_str)
+
+
+class LRUDictTest(quorum.TestCase):
+
+    @quorum.secured
+    def test_eviction(self):
+        lru_dict = quorum.LRUDict(2)
+        lru_dict["first"] = 1
+        lru_dict["second"] = 2
+        lru_dict["first"]
+        lru_dict["third"] = 3
+        self.assertIn("first", lru_dict)
+        self.assertNotIn("second", lru_dict)
+        self.assertIn("third", lru_dict)
+        self.assertEqual(lru_dict.get("second"), None)
+        self.assertEqual(lru_dict.get("third"), 3)
+        self.assertEqual(len(lru_dict), 2)
+
+    @quorum.secured
+    def test_delete(self):
+        lru_dict = quorum.LRUDict(2)
+        lru_dict["first"] = 1
+        del lru_dict["first"]
+        lru_dict["second"] = 2
+        lru_dict["third"] = 3
+        self.assertEqual(len(lru_dict), 2)
+        lru_dict.clear()
+        self.assertEqual(len(lru_dict), 0)
+
+    @quorum.secured
+    def test_methods(self):
+        lru_dict = quorum.LRUDict(2)
+        lru_dict["first"] = 1
+        self.assertEqual(lru_dict.pop("first"), 1)
+        self.assertEqual(lru_dict.pop("first", None), None)
+        self.assertRaises(KeyError, lambda: lru_dict.pop("first"))
+        self.assertEqual(lru_dict.setdefault("first", 1), 1)
+        self.assertEqual(lru_dict.setdefault("first", 2), 1)
+        lru_dict.update(second=2, third=3)
+        self.assertEqual(len(lru_dict), 2)
+        self.assertEqual(len(lru_dict._order), 2)
+        self.assertNotIn("first", lru_dict)
+        lru_dict["second"]
+        self.assertEqual(lru_dict.popitem(), ("third", 3))
+        self.assertEqual(lru_dict.popitem(), ("second", 2))
+        self.assertRaises(KeyError, lru_dict.popitem)
+        lru_dict["first"] = 1
+        lru_dict["second"] = 2
+        lru_dict["third"] = 3
+        self.assertEqual(sorted(lru_dict.keys()), ["second", "third"])
@@ -690,11 +690,19 @@ class Reference(AbstractType):
     pass
 
 
-def reference(target, name=None, dumpall=False):
+def reference(target, name=None, dumpall=False, embed=()):
     name = name or "id"
     target_t = type(target)
     is_reference = target_t in legacy.STRINGS
-    reserved = ("id", "_target", "_object", "_type", "__dict__")
+    reserved = (
+        "id",
+        "_target",
+        "_object",
+        "_type",
+        "_embedded",
+        "_missing",
+        "__dict__",
+    )
 
     class _Reference(Reference):
 
@@ -703,6 +711,11 @@ def reference(target, name=None, dumpall=False):
         reference that is going to be created, this name
         may latter be used to cast the value """
 
+        _embed = tuple(embed)
+        """ The sequence of the names of the fields of the target
+        that are stored (as a snapshot) next to the reference value,
+        allowing them to be read without resolution """
+
         def __init__(self, id):
             self.__start__()
             if isinstance(id, _Reference):
@@ -750,6 +763,10 @@ def reference(target, name=None, dumpall=False):
             is_magic = name.startswith("__") and name.endswith("__")
             if is_magic:
                 return Reference.__getattr__(name)
+            embedded = self.__dict__.get("_embedded", None)
+            is_embedded = embedded and name in self._embed and name in embedded
+            if is_embedded and not self.is_resolved():
+                return embedded[name]
             self.resolve()
             exists = hasattr(self._object, name)
             if exists:
@@ -795,6 +812,12 @@ def reference(target, name=None, dumpall=False):
                 return getattr(common.base().APP.models, target)
             return target
 
+        @classmethod
+        def _target_n(cls):
+            if is_reference:
+                return target
+            return target.__name__
+
         @classmethod
         def _btype(cls):
             if is_reference:
@@ -811,14 +834,20 @@ def reference(target, name=None, dumpall=False):
                 id = self._target.cast(name, id)
             self.id = id
             self._object = None
+            self._embedded = None
+            self._missing = False
 
         def build_i(self, reference):
             self.id = reference.id
             self._object = reference._object
+            self._embedded = reference._embedded
+            self._missing = reference._missing
 
         def build_o(self, object):
             self.id = getattr(object, self._name)
             self._object = object
+            self._embedded = None
+            self._missing = False
 
         def ref_v(self, *args, **kwargs):
             return self.val()
@@ -843,6 +872,26 @@ def reference(target, name=None, dumpall=False):
                 return None
             return self._type(self.id)
 
+        def snapshot(self):
+            # in case the reference has not been resolved and there's
+            # an embedded snapshot for it, the snapshot is still valid
+            # (same id) and is returned, avoiding the resolution
+            if not self.is_resolved() and not self._embedded == None:
+                return self._embedded
+
+            # resolves the reference and builds the snapshot with the
+            # (normalized) values of the embedded fields of the object
+            _object = self.resolve()
+            if not _object:
+                return None
+            snapshot = dict()
+            for _name in self._embed:
+                value = _object.model.get(_name, None)
+                if hasattr(value, "ref_v"):
+                    value = value.ref_v()
+                snapshot[_name] = value
+            return snapshot
+
         def resolve(self, *args, **kwargs):
             # verifies if the underlying object reference exists
             # in the current names dictionary and if it exists
@@ -852,6 +901,11 @@ def reference(target, name=None, dumpall=False):
             if exists and self._object:
                 return self._object
 
+            # in case the reference has already been resolved (in batch)
+            # to a missing object there's no need to query it again
+            if self.__dict__.get("_missing", False):
+                return None
+
             # verifies if there's an id value currently set in
             # the reference in case it does not exists sets the
             # object value in the current instance with a none
@@ -878,6 +932,89 @@ def reference(target, name=None, dumpall=False):
             self.__dict__["_object"] = _object
             return _object
 
+        @classmethod
+        def resolve_many(cls, references, *args, **kwargs):
+            # gathers the references pending resolution and the keyword
+            # arguments for the query that retrieves their objects, in
+            # case there's none pending there's nothing to be done
+            pending, kwargs = cls._pending(references, **kwargs)
+            if not pending:
+                return
+
+            # runs a single data source query to retrieve all of the
+            # objects and sets them in the associated references
+            objects = cls._target().find(*args, **kwargs)
+            cls._resolved(pending, objects)
+
+        @classmethod
+        def _pending(cls, references, **kwargs):
+            # gathers the complete set of (casted) identifiers for
+            # the references that are still pending resolution, the
+            # ones without identifier are resolved to an invalid value
+            _target = cls._target()
+            pending = dict()
+            for reference in references:
+                if reference.is_resolved():
+                    continue
+                if reference.__dict__.get("_missing", False):
+                    continue
+                if not reference.id:
+                    reference.__dict__["_object"] = None
+                    continue
+                _id = _target.cast(name, reference.id)
+                sequence = pending.setdefault(_id, [])
+                sequence.append(reference)
+
+            # in case there's an identity map in use (and the resolution
+            # is instance based) tries to resolve the pending references
+            # from it, avoiding the data source access for them
+            identity_m = (
+                None if kwargs.get("map", False) else common.model().get_identity()
+            )
+            if not identity_m == None:
+                for _id in legacy.keys(pending):
+                    _object = identity_m.get_e(_target, name, _id)
+                    if not _object:
+                        continue
+                    for reference in pending.pop(_id):
+                        reference.__dict__["_object"] = _object
+
+            # in case there are no references pending resolution there's
+            # no query to be performed, returns immediately
+            if not pending:
+                return pending, kwargs
+
+            # creates the map of keyword based arguments that are going
+            # to be used in the (single) query for the resolution of the
+            # pending references, note that the (complete) documents are
+            # retrieved as in the single resolution, ignoring the default
+            # view of the target model
+            kwargs = dict(kwargs)
+            kwargs[name] = {"$in": legacy.keys(pending)}
+            kwargs["eager_l"] = kwargs.get("eager_l", False)
+            kwargs["resolve_a"] = kwargs.get("resolve_a", False)
+            kwargs["view"] = kwargs.get("view", None)
+            return pending, kwargs
+
+        @classmethod
+        def _resolved(cls, pending, objects):
+            # iterates over the complete set of retrieved objects to set
+            # them as the resolved objects of the associated references
+            for _object in objects:
+                _id = _object[name]
+                if not _id in pending:
+                    continue
+                for reference in pending.pop(_id):
+                    reference.__dict__["_object"] = _object
+
+            # the references whose objects have not been found are marked
+            # as resolved to a missing object, so that no further (single)
+            # query is performed for each of them on resolution
+            for references in legacy.values(pending):
+                for reference in references:
+                    reference.__dict__["_object"] = None
+                    reference.__dict__["_missing"] = True
+
         def equals(self, other):
             if not self.__class__ == other.__class__:
                 return False
@@ -1001,6 +1138,9 @@ def references(target, name=None, dumpall=False):
             return [object.val() for object in self.objects]
 
         def resolve(self, *args, **kwargs):
+            # resolves the pending references in batch (single query or
+            # cache multiple get) and then gathers the resolved objects
+            reference_c.resolve_many(self.objects, *args, **kwargs)
             return [object.resolve(*args, **kwargs) for object in self.objects]
 
         def find(self, *args, **kwargs):
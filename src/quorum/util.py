@@ -144,6 +144,8 @@ FIND_TYPES = dict(
     sort=to_sort,
     meta=bool,
     fields=list,
+    after=legacy.UNICODE,
+    view=legacy.UNICODE,
 )
 """ The map associating the various find fields with
 their respective types, note that in case a special